@@ -1,17 +1,44 @@
 from datetime import datetime, timedelta
+import asyncio
+import atexit
+import os
+import threading
 import time
 import requests
 import logging
 from functools import lru_cache
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, Union
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
 from config import ALL_LEAGUES, PERF_DIFF_THRESHOLD
+from shared_cache import SharedCache
+from modules.rate_limiter import TokenBucket, RateLimitManager, RetryQueue, RETRY_ATTEMPTS
+from modules.api_metrics import ApiMetrics, ERROR_STATUS, get_endpoint
+from modules.config import ODDS_BOOKMAKER
 from league_names import LEAGUE_NAMES
 from sport_analyzers.form_analyzer import FormAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Seconds a process uses its own copy of a shared cache entry before looking for a newer one
+LOCAL_CACHE_SECONDS = 60
+
+# API rate limit of this process, shared by the sync and the async client
+REQUESTS_PER_SECOND = int(os.getenv('CALLS_PER_MINUTE') or 300) / 60
+
+# Async client: open connections, requests in flight and request timeout in seconds
+ASYNC_MAX_CONNECTIONS = 20
+ASYNC_MAX_CONCURRENCY = 10
+ASYNC_TIMEOUT = 30
+
+# Maximum number of fixture ids the API accepts in one request
+FIXTURE_IDS_PER_REQUEST = 20
+
 class FootballAPI:
     def __init__(self, api_key, base_url):
         self.api_key = api_key
@@ -20,6 +47,21 @@ class FootballAPI:
         self.logger = logging.getLogger(__name__)
         self._initialize_cache()
         
+        # Shared by all threads and coroutines that use this client
+        self.rate_limiter = TokenBucket(REQUESTS_PER_SECOND, max(1, REQUESTS_PER_SECOND))
+        
+        # Request budget reported by the API, logged when it runs low
+        self.rate_limits = RateLimitManager(self.rate_limiter)
+        
+        # Request counts, latencies and cache hits, see stats() and the /metrics route.
+        # Snapshots go to the shared cache, so /metrics reports every process
+        self.metrics = ApiMetrics(store=self.shared_cache, get_budget=self.rate_limits.get_budget)
+        
+        # Event loop thread of the sync wrappers, see run_sync()
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._sessions = {}
+        
     def _initialize_cache(self):
         """Initialize different cache stores with different durations"""
         self.cache = {
@@ -28,52 +70,271 @@ class FootballAPI:
             'long': {'data': {}, 'duration': timedelta(hours=24)},     # 24 hours for stable data
         }
         
+        # Cache shared by all gunicorn workers, the stores above keep a copy per process
+        longest = max(store['duration'] for store in self.cache.values())
+        self.shared_cache = SharedCache.from_env(longest.total_seconds())
+        self._shared_checked = {}
+        
+    def _get_local_cache(self, key: str, cache_type: str) -> Tuple[Optional[Any], bool]:
+        """Get data from the cache of this process, and whether to look for a newer entry in the shared cache"""
+        cache_store = self.cache[cache_type]['data']
+        local = cache_store.get(key)
+        if local is not None and datetime.now() - local[1] >= self.cache[cache_type]['duration']:
+            cache_store.pop(key, None)
+            local = None
+            
+        # Another worker may have fetched it already, or the cache warmer refreshed it
+        check_shared = self.shared_cache is not None and (
+            local is None or time.time() - self._shared_checked.get(key, 0) >= LOCAL_CACHE_SECONDS)
+        return (local[0] if local is not None else None), check_shared
+        
+    def _get_shared_cache(self, key: str, cache_type: str) -> Optional[Any]:
+        """Get data from the shared cache and keep a copy in this process, reads the disk"""
+        entry = self.shared_cache.get(key, cache_type, self.cache[cache_type]['duration'].total_seconds())
+        self._shared_checked[key] = time.time()
+        if entry is None:
+            return None
+            
+        data, stored_at = entry
+        # Keep the time it was stored, so it expires in every worker at once
+        self.cache[cache_type]['data'][key] = (data, datetime.fromtimestamp(stored_at))
+        return data
+        
     def _get_from_cache(self, key: str, cache_type: str = 'short') -> Optional[Any]:
         """Get data from cache with specified duration type"""
-        cache_store = self.cache[cache_type]['data']
-        if key in cache_store:
-            data, timestamp = cache_store[key]
-            if datetime.now() - timestamp < self.cache[cache_type]['duration']:
-                return data
-            del cache_store[key]
-        return None
+        data, check_shared = self._get_local_cache(key, cache_type)
+        if check_shared:
+            shared = self._get_shared_cache(key, cache_type)
+            if shared is not None:
+                data = shared
+            
+        self.metrics.record_cache(cache_type, data is not None)
+        return data
+        
+    async def _get_from_cache_async(self, key: str, cache_type: str = 'short') -> Optional[Any]:
+        """Get data from cache like _get_from_cache, the shared cache is read in a thread so the event loop keeps running"""
+        data, check_shared = self._get_local_cache(key, cache_type)
+        if check_shared:
+            shared = await asyncio.to_thread(self._get_shared_cache, key, cache_type)
+            if shared is not None:
+                data = shared
+            
+        self.metrics.record_cache(cache_type, data is not None)
+        return data
 
     def _set_cache(self, key: str, data: Any, cache_type: str = 'short'):
         """Set data in cache with specified duration type"""
         self.cache[cache_type]['data'][key] = (data, datetime.now())
+        
+        if self.shared_cache is not None:
+            self._set_shared_cache(key, data, cache_type)
+            
+    async def _set_cache_async(self, key: str, data: Any, cache_type: str = 'short'):
+        """Set data in cache like _set_cache, the shared cache is written in a thread"""
+        self.cache[cache_type]['data'][key] = (data, datetime.now())
+        
+        if self.shared_cache is not None:
+            await asyncio.to_thread(self._set_shared_cache, key, data, cache_type)
+            
+    def _set_shared_cache(self, key: str, data: Any, cache_type: str):
+        """Store data in the shared cache, writes the disk"""
+        self.shared_cache.set(key, cache_type, data)
+        self._shared_checked[key] = time.time()
+        
+    def get_cache_age(self, key: str, cache_type: str = 'short') -> Optional[float]:
+        """Get the seconds since an entry was cached by any process, None if it is missing or expired"""
+        local = self.cache[cache_type]['data'].get(key)
+        stored_at = local[1].timestamp() if local is not None else None
+        
+        if self.shared_cache is not None:
+            shared_stored_at = self.shared_cache.get_stored_at(key, cache_type)
+            if shared_stored_at is not None and (stored_at is None or shared_stored_at > stored_at):
+                stored_at = shared_stored_at
+                
+        if stored_at is None:
+            return None
+        age = time.time() - stored_at
+        return age if age < self.cache[cache_type]['duration'].total_seconds() else None
 
-    def _batch_request(self, url: str, params_list: list) -> Dict:
-        """Make batch requests and handle rate limiting"""
+    def _batch_request(self, url: str, params_list: list, refresh: bool = False) -> Dict:
+        """Make batch requests and handle rate limiting, refresh skips cached responses"""
         results = {}
-        for params in params_list:
+        
+        # Requests answered with 429 are retried after a backoff, the others go ahead meanwhile
+        queue = RetryQueue(params_list)
+        while queue:
+            params, attempt = queue.pop()
             cache_key = f"{url}_{json.dumps(params, sort_keys=True)}"
-            cached_data = self._get_from_cache(cache_key)
+            cached_data = None if refresh else self._get_from_cache(cache_key)
             
             if cached_data:
                 results[json.dumps(params)] = cached_data
                 continue
+                
+            if not self.rate_limits.can_request():
+                self.logger.warning(f"Daily request budget used up, skipping {len(queue) + 1} requests to {url}")
+                return results
 
+            self.rate_limiter.acquire()
+            start, response = time.perf_counter(), None
             try:
                 response = requests.get(url, headers=self.headers, params=params)
+                self.metrics.record_request(get_endpoint(url), response.status_code, time.perf_counter() - start,
+                                            len(response.content), params.get('league'))
+                self.rate_limits.update(response.headers)
                 if response.status_code == 200:
                     data = response.json()
                     self._set_cache(cache_key, data)
                     results[json.dumps(params)] = data
                 elif response.status_code == 429:  # Rate limit
-                    time.sleep(60)  # Wait a minute before retrying
-                    response = requests.get(url, headers=self.headers, params=params)
-                    if response.status_code == 200:
-                        data = response.json()
-                        self._set_cache(cache_key, data)
-                        results[json.dumps(params)] = data
-                time.sleep(0.2)  # Small delay between requests
+                    if attempt < RETRY_ATTEMPTS:
+                        delay = self.rate_limits.retry_delay(attempt, response.headers)
+                        self.logger.warning(f"Rate limit hit for {url} with params {params}, retrying in {delay:.1f} s")
+                        self.metrics.record_retry(get_endpoint(url))
+                        queue.retry(params, attempt, delay)
+                    else:
+                        self.logger.warning(f"Rate limit hit for {url} with params {params}, giving up")
             except Exception as e:
                 self.logger.error(f"Error in batch request: {str(e)}")
+                if response is None:
+                    self.metrics.record_request(get_endpoint(url), ERROR_STATUS, time.perf_counter() - start,
+                                                league=params.get('league'))
                 continue
                 
         return results
     
     
+    async def _get_session(self) -> Tuple["aiohttp.ClientSession", asyncio.Semaphore]:
+        """Get the connection pool and concurrency limit of the running event loop"""
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for the async client, install it with 'pip install aiohttp'")
+            
+        # Sessions cannot be shared between event loops
+        loop = asyncio.get_running_loop()
+        session, semaphore = self._sessions.get(loop, (None, None))
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=ASYNC_MAX_CONNECTIONS, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=ASYNC_TIMEOUT)
+            )
+            semaphore = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+            self._sessions[loop] = (session, semaphore)
+        return session, semaphore
+        
+    async def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Make an API request without blocking the event loop
+        
+        Responses share the cache of _batch_request and requests share its rate limiter.
+        The shared cache is read and written in a thread, the other coroutines keep running.
+        
+        Args:
+            endpoint: API path, e.g. '/fixtures'
+            params: Query parameters
+            
+        Returns:
+            dict: The JSON response, {} if the request failed
+        """
+        params = params or {}
+        url = f"{self.base_url}{endpoint}"
+        cache_key = f"{url}_{json.dumps(params, sort_keys=True)}"
+        cached_data = await self._get_from_cache_async(cache_key)
+        if cached_data:
+            return cached_data
+            
+        session, semaphore = await self._get_session()
+        
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            if not self.rate_limits.can_request():
+                self.logger.warning(f"Daily request budget used up, skipping request to {endpoint}")
+                return {}
+                
+            async with semaphore:
+                # Sleep for the rate limiter without blocking other coroutines
+                await asyncio.sleep(self.rate_limiter.reserve())
+                start = time.perf_counter()
+                try:
+                    async with session.get(url, params=params) as response:
+                        body = await response.read()
+                        self.metrics.record_request(get_endpoint(url), response.status, time.perf_counter() - start,
+                                                    len(body), params.get('league'))
+                        self.rate_limits.update(response.headers)
+                        if response.status == 200:
+                            data = json.loads(body)
+                            await self._set_cache_async(cache_key, data)
+                            return data
+                        if response.status != 429:
+                            self.logger.error(f"Request to {endpoint} failed with status {response.status}")
+                            return {}
+                        delay = self.rate_limits.retry_delay(attempt, response.headers)
+                        
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    self.logger.error(f"Error in async request to {endpoint}: {str(e)}")
+                    self.metrics.record_request(get_endpoint(url), ERROR_STATUS, time.perf_counter() - start,
+                                                league=params.get('league'))
+                    return {}
+                    
+            if attempt == RETRY_ATTEMPTS:
+                break
+                
+            self.metrics.record_retry(get_endpoint(url))
+            
+            # Only this request waits, the semaphore slot is free for the others
+            self.logger.warning(f"Rate limit hit for {endpoint} with params {params}, retrying in {delay:.1f} s")
+            await asyncio.sleep(delay)
+            
+        self.logger.warning(f"Rate limit hit for {endpoint} with params {params}, giving up")
+        return {}
+        
+    async def make_requests(self, requests_list: List[Tuple[str, Optional[Dict]]]) -> List[Dict]:
+        """Make many requests concurrently, results are in the order of requests_list"""
+        return await asyncio.gather(*(self._make_request(endpoint, params) for endpoint, params in requests_list))
+        
+    async def aclose(self):
+        """Close the connection pool of the running event loop"""
+        session, semaphore = self._sessions.pop(asyncio.get_running_loop(), (None, None))
+        if session is not None:
+            await session.close()
+            
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop thread of the sync wrappers, started on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="AsyncAPI", daemon=True).start()
+                atexit.register(self.close)
+            return self._loop
+            
+    def run_sync(self, coroutine, timeout: Optional[float] = None):
+        """
+        Run a coroutine of the async client from synchronous code, e.g. a Dash callback
+        
+        All sync calls share one event loop thread, so they share its connection pool.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop()).result(timeout)
+        
+    def close(self):
+        """Close the connection pool and stop the event loop thread of the sync wrappers"""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+            
+        try:
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result(5)
+        except Exception as e:
+            self.logger.error(f"Error closing async client: {str(e)}")
+        loop.call_soon_threadsafe(loop.stop)
+        
+    def stats(self) -> Dict[str, Any]:
+        """Get the request counters of this process and the request budget, see ApiMetrics.stats"""
+        return dict(self.metrics.stats(), budget=self.rate_limits.get_budget())
+        
+    def prometheus_metrics(self) -> str:
+        """Get the request counters of all processes and the request budget in the Prometheus text format"""
+        return self.metrics.to_prometheus()
+        
     async def get_countries(self):
         """Get list of available countries"""
         response = await self._make_request('/countries')
@@ -101,10 +362,44 @@ class FootballAPI:
         response = await self._make_request('/fixtures', params)
         return response.get('response', [])
 
-    async def get_fixtures_by_ids(self, ids):
-        """Get detailed fixtures data by IDs"""
-        response = await self._make_request(f'/fixtures', {'ids': ids})
-        return response.get('response', [])
+    async def get_fixtures_by_ids(self, ids: Union[str, List[int]]):
+        """Get detailed fixtures data by IDs, a "1-2-3" string or a list of any length"""
+        if isinstance(ids, str):
+            ids = [fixture_id for fixture_id in ids.split('-') if fixture_id]
+            
+        # The API accepts FIXTURE_IDS_PER_REQUEST ids per request, fetch the chunks concurrently
+        chunks = ['-'.join(str(fixture_id) for fixture_id in ids[i:i + FIXTURE_IDS_PER_REQUEST])
+                  for i in range(0, len(ids), FIXTURE_IDS_PER_REQUEST)]
+        responses = await self.make_requests([('/fixtures', {'ids': chunk}) for chunk in chunks])
+        
+        fixtures = []
+        for response in responses:
+            fixtures.extend(response.get('response', []))
+        return fixtures
+        
+    def get_countries_sync(self):
+        """Get list of available countries, see run_sync"""
+        return self.run_sync(self.get_countries())
+        
+    def get_leagues_sync(self, country=None):
+        """Get leagues for a country, see run_sync"""
+        return self.run_sync(self.get_leagues(country))
+        
+    def get_seasons_sync(self, league_id):
+        """Get available seasons for a league, see run_sync"""
+        return self.run_sync(self.get_seasons(league_id))
+        
+    def get_fixtures_sync(self, league_id, season, status=None):
+        """Get fixtures for a league and season, see run_sync"""
+        return self.run_sync(self.get_fixtures(league_id, season, status))
+        
+    def get_fixtures_by_ids_sync(self, ids):
+        """Get detailed fixtures data by IDs, see run_sync"""
+        return self.run_sync(self.get_fixtures_by_ids(ids))
+        
+    def make_requests_sync(self, requests_list: List[Tuple[str, Optional[Dict]]]) -> List[Dict]:
+        """Make many requests concurrently from synchronous code, see run_sync"""
+        return self.run_sync(self.make_requests(requests_list))
     
     def fetch_all_teams(self, league_names, matches_count=3):
         """
@@ -273,10 +568,15 @@ class FootballAPI:
         # Sort by absolute performance difference
         return sorted(all_teams, key=lambda x: abs(x.get('performance_diff', 0)), reverse=True)
 
-    def fetch_standings(self, league_id):
-        """Optimized standings fetch with better caching"""
+    def fetch_standings(self, league_id, refresh=False):
+        """
+        Optimized standings fetch with better caching
+        
+        refresh requests the standings again and replaces the cached ones. For
+        ALL_LEAGUES only the combined entry is rebuilt from the cached leagues.
+        """
         cache_key = f'standings_{league_id}'
-        cached_data = self._get_from_cache(cache_key, 'medium')  # Standings change less frequently
+        cached_data = None if refresh else self._get_from_cache(cache_key, 'medium')  # Standings change less frequently
         if cached_data:
             return cached_data
 
@@ -299,20 +599,25 @@ class FootballAPI:
             return all_standings
         else:
             params = {"league": league_id, "season": 2024}
-            results = self._batch_request(url, [params])
+            results = self._batch_request(url, [params], refresh)
             data = results.get(json.dumps(params))
             if data:
                 self._set_cache(cache_key, data, 'medium')
                 return data
         return None
 
-    def fetch_fixtures(self, league_id, season='2024', team_id=None, fixture_id=None):
-        """Optimized fixtures fetch with smarter caching"""
+    def fetch_fixtures(self, league_id, season='2024', team_id=None, fixture_id=None, refresh=False):
+        """
+        Optimized fixtures fetch with smarter caching
+        
+        refresh requests the fixtures again and replaces the cached ones. For
+        ALL_LEAGUES only the combined entry is rebuilt from the cached leagues.
+        """
         cache_key = f'fixtures_{league_id}_{team_id}_{fixture_id}'
         
         # Use longer cache duration for historical fixtures
         cache_type = 'long' if not fixture_id else 'short'
-        cached_data = self._get_from_cache(cache_key, cache_type)
+        cached_data = None if refresh else self._get_from_cache(cache_key, cache_type)
         if cached_data:
             return cached_data
 
@@ -320,7 +625,7 @@ class FootballAPI:
         
         if fixture_id:
             params = {'id': fixture_id}
-            results = self._batch_request(url, [params])
+            results = self._batch_request(url, [params], refresh)
             data = results.get(json.dumps(params), {}).get('response', [])
             self._set_cache(cache_key, data, cache_type)
             return data
@@ -346,7 +651,7 @@ class FootballAPI:
             'season': season,
             **({"team": team_id} if team_id else {})
         }
-        results = self._batch_request(url, [params])
+        results = self._batch_request(url, [params], refresh)
         data = results.get(json.dumps(params), {}).get('response', [])
         self._set_cache(cache_key, data, cache_type)
         return data
@@ -420,7 +725,7 @@ class FootballAPI:
         url = f"{self.base_url}/odds"
         params = {
             "fixture": fixture_id,
-            "bookmaker": "8",  # Bet365
+            "bookmaker": ODDS_BOOKMAKER
         }
         
         try:
@@ -3,6 +3,7 @@ import json
 import os
 import dash
 from dash import dcc, html
+from flask import Response
 import logging
 from api import FootballAPI
 from league_names import LEAGUE_NAMES
@@ -29,6 +30,7 @@ from sport_layouts import (
 from config import ALL_LEAGUES, API_KEY, BASE_URL, FootballDataFetcher, generate_league_names_dict
 from sport_layouts.fixtures_tab_firestore import create_data_collection_tab
 from firebase_config import initialize_firebase
+from cache_warmer import start_cache_warmer
 
 # Initialize Firebase at app startup
 db = initialize_firebase()
@@ -49,6 +51,7 @@ class DashboardApp:
         self.api = api
         self.setup_layout()
         self.setup_callbacks()
+        self.setup_routes()
 
     @staticmethod
     def get_league_display_name(league_id):
@@ -85,6 +88,12 @@ class DashboardApp:
         add_stats_callback(self.app, self.api)
         setup_data_collection_callbacks(self.app, self.api)
         setup_firebase_analysis_callbacks(self.app,db)
+        
+    def setup_routes(self):
+        # API request counters of all workers and the cache warmer in the Prometheus text format
+        @self.server.route('/metrics')
+        def metrics():
+            return Response(self.api.prometheus_metrics(), mimetype='text/plain; version=0.0.4')
     
     
     def run(self, debug=True):
@@ -112,7 +121,11 @@ class DashboardApp:
             flag = leagues[0]['flag']
             print(f"{flag} {country}:")
             for league in leagues:
-                print(f"  • {league['name']} ({league['type']}) - {league['fixture_count']} fixtures")
+                # Leagues decided by coverage data have no fixture count, their fixtures were not downloaded
+                if league['fixture_count'] is None:
+                    print(f"  • {league['name']} ({league['type']})")
+                else:
+                    print(f"  • {league['name']} ({league['type']}) - {league['fixture_count']} fixtures")
         
         # Generate the LEAGUE_NAMES dictionary
         league_names_content = generate_league_names_dict(active_leagues)
@@ -164,8 +177,12 @@ class DashboardApp:
 football_api = FootballAPI(API_KEY, BASE_URL)
 dashboard = DashboardApp(football_api)
 app = dashboard.server  # This is what gunicorn will use
+server = dashboard.server  # Entry point of the Docker image, gunicorn app:server
 
 if __name__ == '__main__':
+    # Without gunicorn no worker runs the warmer, warm up in the background of this process
+    start_cache_warmer(football_api, block=False)
+    
     if os.environ.get('RENDER'):
         dashboard.run(debug=False)
     else:
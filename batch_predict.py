@@ -0,0 +1,79 @@
+import argparse
+import logging
+import sys
+import time
+
+from modules.api_client import FootballAPI
+from modules.config import API_KEY, BASE_URL, ALL_LEAGUES, PREFETCH_WORKERS
+from modules.db_manager import DatabaseManager
+from modules.league_names import LEAGUE_NAMES
+from modules.prediction_pipeline import PredictionPipeline
+from modules.settings_manager import SettingsManager
+
+logger = logging.getLogger(__name__)
+
+def get_league_ids(args, settings_manager: SettingsManager) -> list:
+    """Get the leagues to run, from the command line, all known leagues or the settings"""
+    if args.all_leagues:
+        return [league_id for league_id in LEAGUE_NAMES
+                if isinstance(league_id, int) and league_id != ALL_LEAGUES]
+    if args.leagues:
+        return args.leagues
+    return settings_manager.get_leagues()
+
+def main():
+    """Create predictions for all configured leagues without the GUI, e.g. from cron"""
+    parser = argparse.ArgumentParser(description="Create and check predictions without the GUI")
+    parser.add_argument("--leagues", type=int, nargs="+", help="League ids, defaults to the leagues in the settings")
+    parser.add_argument("--all-leagues", action="store_true", help="Run every known league")
+    parser.add_argument("--db", default="football_stats.db", help="Database file")
+    parser.add_argument("--settings", default="settings.json", help="Settings file")
+    parser.add_argument("--form-length", type=int, help="Number of recent matches used for the form")
+    parser.add_argument("--threshold", type=float, help="Minimum performance difference for a prediction")
+    parser.add_argument("--workers", type=int, default=PREFETCH_WORKERS, help="Number of leagues processed at once")
+    parser.add_argument("--no-check", action="store_true", help="Do not check results of pending predictions")
+    parser.add_argument("--verbose", action="store_true", help="Log debug messages")
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    
+    settings_manager = SettingsManager(args.settings)
+    league_ids = get_league_ids(args, settings_manager)
+    
+    api = FootballAPI(API_KEY, BASE_URL)
+    db_manager = DatabaseManager(args.db)
+    api.attach_stats_store(db_manager)
+    
+    pipeline = PredictionPipeline(
+        api,
+        db_manager,
+        form_length=args.form_length or settings_manager.get_form_length(),
+        threshold=args.threshold if args.threshold is not None else settings_manager.get_threshold(),
+        max_workers=args.workers
+    )
+    
+    start = time.perf_counter()
+    summary = pipeline.run(league_ids, check_results=not args.no_check)
+    total = time.perf_counter() - start
+    
+    # Statistics saved by the API client go through the writer thread
+    db_manager.writer.flush()
+    
+    print(f"Leagues: {summary['leagues']} ({len(summary['failed_leagues'])} failed)")
+    print(f"Predictions: {summary['predictions']} created, {summary['saved']} new")
+    if not args.no_check:
+        print(f"Results: {summary['checked']} checked, {summary['correct']} correct")
+    for stage, seconds in summary["timings"].items():
+        print(f"{stage:>14}: {seconds:.2f} s")
+    print(f"{'total':>14}: {total:.2f} s")
+    
+    # Non-zero exit code for cron when nothing could be collected
+    if league_ids and len(summary['failed_leagues']) == len(league_ids):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
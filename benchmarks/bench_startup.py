@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run from the repository root so the app modules can be imported
+sys.path.insert(0, REPO_ROOT)
+
+def create_offline_api_class():
+    """Create a FootballAPI that finds no data instead of requesting the API, so runs are repeatable"""
+    from modules.api_client import FootballAPI
+    
+    class OfflineFootballAPI(FootballAPI):
+        def _batch_request(self, url, params_list):
+            return {}
+            
+    return OfflineFootballAPI
+
+def measure_startup(eager: bool = False) -> dict:
+    """
+    Measure the time from creating the app window until its first paint
+    
+    Runs in a fresh process, see run_measurement. The background runner, the
+    refresh scheduler and BaseTab keep application wide singletons bound to the
+    first Tk root, so a second app in the same process would reuse them.
+    
+    Args:
+        eager: Build all tabs up front like the app did before lazy construction
+        
+    Returns:
+        dict: Seconds spent in the constructor, until the first paint and building all tabs
+    """
+    import main
+    from main import FootballStatsApp, TABS
+    
+    main.FootballAPI = create_offline_api_class()
+    
+    start = time.perf_counter()
+    app = FootballStatsApp()
+    
+    if eager:
+        for title, attribute, module_name, class_name in TABS:
+            app._ensure_tab_content(attribute)
+            
+    constructed = time.perf_counter()
+    app.update_idletasks()
+    painted = time.perf_counter()
+    
+    built = sum(1 for title, attribute, module_name, class_name in TABS
+                if getattr(app, f"{attribute}_content") is not None)
+                
+    app.refresh_scheduler.stop()
+    app.destroy()
+    
+    return {
+        "constructor": constructed - start,
+        "first_paint": painted - start,
+        "tabs_built": built
+    }
+
+def run_measurement(eager: bool) -> dict:
+    """Measure the startup in a new process, with its own database and a copy of the settings"""
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as directory:
+        settings_path = os.path.join(REPO_ROOT, "settings.json")
+        if os.path.exists(settings_path):
+            shutil.copy(settings_path, directory)
+            
+        command = [sys.executable, os.path.abspath(__file__), "--measure", "eager" if eager else "lazy"]
+        output = subprocess.run(command, cwd=directory, check=True, capture_output=True, text=True).stdout
+        
+    # The result is the last line, the app may log to stdout before
+    return json.loads(output.strip().splitlines()[-1])
+
+def main_benchmark():
+    """Compare startup time with lazy and eager tab construction"""
+    parser = argparse.ArgumentParser(description="Benchmark FootballStatsApp startup time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per mode")
+    parser.add_argument("--measure", choices=("lazy", "eager"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.measure:
+        print(json.dumps(measure_startup(args.measure == "eager")))
+        return
+        
+    for mode, eager in (("lazy", False), ("eager", True)):
+        results = [run_measurement(eager) for _ in range(args.runs)]
+        first_paint = [result["first_paint"] for result in results]
+        
+        print(f"{mode:>5}: first paint median {statistics.median(first_paint) * 1000:.0f} ms, "
+              f"min {min(first_paint) * 1000:.0f} ms, max {max(first_paint) * 1000:.0f} ms, "
+              f"{results[-1]['tabs_built']} tabs built")
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,155 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable
+
+# Run from the repository root so the app modules can be imported
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A benchmark regressed when its median is this much slower than the baseline
+REGRESSION_THRESHOLD = 0.2
+
+class SkipBenchmark(Exception):
+    """Raised by a setup when the benchmark cannot run here, e.g. without a display"""
+
+class Benchmark:
+    """
+    A timed scenario
+    
+    setup runs once and returns the state of the benchmark, prepare runs before
+    every timed run and its return value is passed to func, so per run work
+    like creating an empty database is not measured. teardown gets the state
+    after the last run.
+    """
+    
+    def __init__(self, name: str, func: Callable, group: str, setup: Optional[Callable] = None,
+                 prepare: Optional[Callable] = None, teardown: Optional[Callable] = None, repeat: int = 5):
+        self.name = name
+        self.func = func
+        self.group = group
+        self.setup = setup
+        self.prepare = prepare
+        self.teardown = teardown
+        self.repeat = repeat
+
+# Benchmarks registered with @benchmark, in definition order
+REGISTRY = []
+
+def benchmark(name: str, group: str, setup: Optional[Callable] = None, prepare: Optional[Callable] = None,
+              teardown: Optional[Callable] = None, repeat: int = 5):
+    """
+    Register a function as benchmark
+    
+    The function is called with the state from setup and, if given, the result
+    of prepare: func(state) or func(state, prepared).
+    """
+    def decorator(func):
+        REGISTRY.append(Benchmark(name, func, group, setup, prepare, teardown, repeat))
+        return func
+    return decorator
+
+def run_benchmark(bench: Benchmark, repeat: Optional[int] = None, warmup: int = 1) -> Dict[str, Any]:
+    """
+    Time a benchmark
+    
+    Returns:
+        dict: Seconds per run (min, median, mean, stdev) and the number of runs,
+            or the reason it was skipped
+    """
+    try:
+        state = bench.setup() if bench.setup else None
+    except SkipBenchmark as e:
+        return {"name": bench.name, "group": bench.group, "skipped": str(e)}
+        
+    times = []
+    try:
+        for run in range(warmup + (repeat or bench.repeat)):
+            args = (state,) if bench.prepare is None else (state, bench.prepare(state))
+            start = time.perf_counter()
+            bench.func(*args)
+            elapsed = time.perf_counter() - start
+            if run >= warmup:
+                times.append(elapsed)
+    finally:
+        if bench.teardown:
+            bench.teardown(state)
+            
+    return {
+        "name": bench.name,
+        "group": bench.group,
+        "runs": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0
+    }
+
+def get_metadata(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe the machine, the commit and the parameters of a benchmark run"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+        
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "params": params
+    }
+
+def save_results(path: str, results: List[Dict[str, Any]], metadata: Dict[str, Any]):
+    """Save results as JSON, e.g. as the baseline of later runs"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"metadata": metadata, "results": results}, f, indent=2)
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Load saved results"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+            threshold: float = REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare results with a baseline
+    
+    Returns:
+        list: name, baseline and current median and their ratio of every
+            benchmark in both, with "regression" set when it got slower than threshold
+    """
+    baseline_by_name = {result["name"]: result for result in baseline.get("results", []) if "median" in result}
+    
+    comparison = []
+    for result in results:
+        previous = baseline_by_name.get(result["name"])
+        if previous is None or "median" not in result or not previous["median"]:
+            continue
+            
+        ratio = result["median"] / previous["median"]
+        comparison.append({
+            "name": result["name"],
+            "baseline": previous["median"],
+            "current": result["median"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold
+        })
+    return comparison
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration with a fitting unit"""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
@@ -0,0 +1,151 @@
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+from urllib.request import urlopen
+
+# Run from the repository root so gunicorn finds gunicorn.conf.py and the app
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds the demo app spends in its simulated upstream request
+DEMO_UPSTREAM_SECONDS = float(os.getenv('DEMO_UPSTREAM_SECONDS', '0.5'))
+
+def demo_app(environ, start_response):
+    """
+    WSGI app standing in for the dashboard without API key or Firebase
+    
+    /upstream blocks like a callback waiting for the football API, every other
+    path answers right away like a cache hit.
+    """
+    if environ.get('PATH_INFO') == '/upstream':
+        time.sleep(DEMO_UPSTREAM_SECONDS)
+        
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'ok']
+
+def run_load(url: str, concurrency: int, duration: float, timeout: float = 30) -> dict:
+    """
+    Send requests from concurrent clients for a fixed time
+    
+    Args:
+        url: URL requested by every client
+        concurrency: Number of clients, each sends its next request when the last one is answered
+        duration: Seconds to send requests
+        timeout: Seconds after which a request counts as failed
+        
+    Returns:
+        dict: Number of requests and errors, requests per second and latency percentiles in seconds
+    """
+    deadline = time.monotonic() + duration
+    
+    def client():
+        latencies, errors = [], 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                with urlopen(url, timeout=timeout) as response:
+                    response.read()
+                latencies.append(time.perf_counter() - start)
+            except (URLError, OSError):
+                errors += 1
+        return latencies, errors
+        
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: client(), range(concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    errors = sum(client_errors for _, client_errors in results)
+    
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] if latencies else 0
+        
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "median": statistics.median(latencies) if latencies else 0,
+        "p95": percentile(0.95)
+    }
+
+def wait_for_port(port: int, timeout: float = 60) -> bool:
+    """Wait until a server accepts connections on localhost"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+def start_server(app: str, port: int, worker_class: str, workers: int, threads: int) -> subprocess.Popen:
+    """Start gunicorn with gunicorn.conf.py and the worker settings given through the environment"""
+    env = dict(
+        os.environ,
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_WORKER_CLASS=worker_class,
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_THREADS=str(threads),
+        GUNICORN_WORKER_CONNECTIONS=str(threads),
+        # The warm-up would fetch every league from the API before each run
+        CACHE_WARM_UP=os.environ.get('CACHE_WARM_UP', '0')
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", app],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    if not wait_for_port(port):
+        process.terminate()
+        raise RuntimeError(f"gunicorn with {worker_class} workers did not start")
+    return process
+
+def print_result(name: str, result: dict, baseline: dict = None):
+    """Print one line of results, with the throughput relative to the baseline"""
+    line = (f"{name:>8}: {result['throughput']:7.1f} req/s, median {result['median'] * 1000:6.0f} ms, "
+            f"p95 {result['p95'] * 1000:6.0f} ms, {result['requests']} requests, {result['errors']} errors")
+    if baseline and baseline['throughput']:
+        line += f", {result['throughput'] / baseline['throughput']:.1f}x"
+    print(line)
+
+def main_load_test():
+    """Compare the throughput of gunicorn worker models, or load test a running server"""
+    parser = argparse.ArgumentParser(description="Load test the Dash server")
+    parser.add_argument("--url", help="Load test a running server instead of starting gunicorn")
+    parser.add_argument("--app", default="benchmarks.load_test:demo_app",
+                        help="WSGI app to start, e.g. app:server for the dashboard")
+    parser.add_argument("--path", default="/upstream", help="Path requested from the started server")
+    parser.add_argument("--worker-classes", nargs="+", default=["sync", "gthread"],
+                        help="Worker models to compare, the first one is the baseline")
+    parser.add_argument("--workers", type=int, default=2, help="Number of gunicorn workers")
+    parser.add_argument("--threads", type=int, default=8, help="Threads or greenlets per worker")
+    parser.add_argument("--concurrency", type=int, default=20, help="Number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load per worker model")
+    parser.add_argument("--port", type=int, default=18080, help="Port of the started server")
+    args = parser.parse_args()
+    
+    if args.url:
+        print_result("server", run_load(args.url, args.concurrency, args.duration))
+        return
+        
+    baseline = None
+    for worker_class in args.worker_classes:
+        process = start_server(args.app, args.port, worker_class, args.workers, args.threads)
+        try:
+            url = f"http://127.0.0.1:{args.port}{args.path}"
+            result = run_load(url, args.concurrency, args.duration)
+        finally:
+            process.terminate()
+            process.wait()
+            
+        print_result(worker_class, result, baseline)
+        baseline = baseline or result
+
+if __name__ == "__main__":
+    main_load_test()
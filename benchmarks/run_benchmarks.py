@@ -0,0 +1,347 @@
+import argparse
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from functools import lru_cache
+from typing import Dict, List, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import (REGISTRY, REGRESSION_THRESHOLD, SkipBenchmark, benchmark, run_benchmark,
+                                get_metadata, save_results, load_results, compare, format_seconds)
+from benchmarks.synthetic_data import SyntheticLeagues
+from modules.config import FINISHED_STATUSES
+from modules.db_manager import DatabaseManager
+from modules.form_analyzer import FormAnalyzer
+from modules.prediction_pipeline import generate_prediction, evaluate_prediction
+
+# Size of the synthetic data and of the rendered tables, set from the command line
+PARAMS = {"leagues": 8, "teams": 20, "seasons": 1, "seed": 0, "rows": 10000, "latency": 0.0}
+
+# Number of recent matches analyzed, as in the app
+FORM_LENGTH = 5
+
+# Share of rows changed between two refreshes of a table
+CHANGED_SHARE = 0.01
+
+# Default files of the results and of the baseline they are compared with
+RESULTS_PATH = "benchmarks/results/latest.json"
+BASELINE_PATH = "benchmarks/baseline.json"
+
+# Display started for the render benchmarks when there is none
+VIRTUAL_DISPLAY = ":99"
+
+@lru_cache(maxsize=1)
+def get_league_seasons(leagues: int, teams: int, seasons: int, seed: int) -> List[Dict[str, Any]]:
+    """Generate the synthetic league seasons once per size"""
+    return list(SyntheticLeagues(leagues, teams=teams, seasons=seasons, seed=seed).iter_league_seasons())
+
+def league_seasons() -> List[Dict[str, Any]]:
+    return get_league_seasons(PARAMS["leagues"], PARAMS["teams"], PARAMS["seasons"], PARAMS["seed"])
+
+def all_fixtures() -> List[Dict[str, Any]]:
+    return [fixture for league_season in league_seasons() for fixture in league_season["fixtures"]]
+
+def build_predictions(fixtures: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build one prediction per fixture, for the home team
+    
+    The performance difference is derived from the fixture id, so the predictions
+    are the same in every run and spread over all prediction levels.
+    """
+    predictions = []
+    for fixture in fixtures:
+        home, away = fixture["teams"]["home"], fixture["teams"]["away"]
+        performance_diff = round((fixture["fixture"]["id"] % 13 - 6) / 4, 2) or 0.25
+        prediction, prediction_level = generate_prediction(performance_diff)
+        predictions.append({
+            "team_id": home["id"],
+            "team_name": home["name"],
+            "league_id": fixture["league"]["id"],
+            "league_name": fixture["league"]["name"],
+            "fixture_id": fixture["fixture"]["id"],
+            "opponent_id": away["id"],
+            "opponent_name": away["name"],
+            "match_date": fixture["fixture"]["date"],
+            "venue": "home",
+            "performance_diff": performance_diff,
+            "prediction": prediction,
+            "prediction_level": prediction_level
+        })
+    return predictions
+
+def populate_database(db: DatabaseManager, fixtures: List[Dict[str, Any]], predictions: List[Dict[str, Any]]):
+    """Save fixtures and predictions and the results of the finished fixtures"""
+    db.save_fixtures(fixtures)
+    db.save_predictions(predictions)
+    
+    fixtures_by_id = {fixture["fixture"]["id"]: fixture for fixture in fixtures}
+    results = []
+    for prediction in db.get_predictions():
+        fixture = fixtures_by_id.get(prediction["fixture_id"])
+        if fixture and fixture["fixture"]["status"]["short"] in FINISHED_STATUSES:
+            result, correct = evaluate_prediction(prediction, fixture)
+            results.append((prediction["id"], result, correct))
+    db.update_prediction_results(results)
+
+# Form analysis
+
+@benchmark("form.analyze_team_form", "form", setup=league_seasons)
+def bench_analyze_team_form(seasons):
+    for league_season in seasons:
+        for row in league_season["standings"]:
+            FormAnalyzer.analyze_team_form(league_season["fixtures"], row["team"]["id"], FORM_LENGTH)
+
+# API client against the replay server
+
+def setup_replay_server() -> Dict[str, Any]:
+    """Serve the synthetic leagues from a local replay server"""
+    try:
+        from modules.api_client import FootballAPI
+        from modules.http_replay import ReplayServer
+        from modules.rate_limiter import TokenBucket
+    except ImportError as e:
+        raise SkipBenchmark(f"API client not available: {str(e)}")
+        
+    directory = tempfile.mkdtemp(prefix="football-bench-")
+    corpus_path = os.path.join(directory, "corpus.jsonl.gz")
+    synthetic = SyntheticLeagues(PARAMS["leagues"], teams=PARAMS["teams"], seasons=1, seed=PARAMS["seed"])
+    synthetic.write_corpus(corpus_path)
+    
+    server = ReplayServer(corpus_path, latency=PARAMS["latency"], seed=PARAMS["seed"]).start()
+    
+    def create_api():
+        # A fresh client per run, so nothing is served from its cache
+        api = FootballAPI("benchmark", server.url)
+        
+        # Rate limiting would only measure the configured request rate
+        api.rate_limiter = TokenBucket(1e6, 1e6)
+        api.rate_limits.bucket = api.rate_limiter
+        return api
+        
+    return {"server": server, "directory": directory, "league_ids": synthetic.league_ids, "create_api": create_api}
+
+def teardown_replay_server(state: Dict[str, Any]):
+    state["server"].stop()
+    shutil.rmtree(state["directory"], ignore_errors=True)
+
+@benchmark("api.fetch_all_teams", "api", setup=setup_replay_server, prepare=lambda state: state["create_api"](),
+           teardown=teardown_replay_server)
+def bench_fetch_all_teams(state, api):
+    league_names = {league_id: {"name": f"League {league_id}", "flag": ""} for league_id in state["league_ids"]}
+    api.fetch_all_teams(league_names, FORM_LENGTH)
+
+@benchmark("api.batch_request", "api", setup=setup_replay_server, prepare=lambda state: state["create_api"](),
+           teardown=teardown_replay_server)
+def bench_batch_request(state, api):
+    params_list = [{"league": league_id, "season": "2024"} for league_id in state["league_ids"]]
+    api._batch_request(f"{state['server'].url}/fixtures", params_list)
+
+# Database ingest and queries
+
+def setup_database_directory() -> Dict[str, Any]:
+    fixtures = all_fixtures()
+    return {"directory": tempfile.mkdtemp(prefix="football-bench-"), "fixtures": fixtures,
+            "predictions": build_predictions(fixtures), "runs": 0}
+
+def create_empty_database(state: Dict[str, Any]) -> DatabaseManager:
+    # A new file per run, creating the schema is not measured
+    state["runs"] += 1
+    return DatabaseManager(os.path.join(state["directory"], f"ingest_{state['runs']}.db"))
+
+def setup_populated_database() -> Dict[str, Any]:
+    state = setup_database_directory()
+    state["db"] = DatabaseManager(os.path.join(state["directory"], "queries.db"))
+    populate_database(state["db"], state["fixtures"], state["predictions"])
+    return state
+
+def teardown_database(state: Dict[str, Any]):
+    shutil.rmtree(state["directory"], ignore_errors=True)
+
+@benchmark("db.save_fixtures", "db", setup=setup_database_directory, prepare=create_empty_database,
+           teardown=teardown_database)
+def bench_save_fixtures(state, db):
+    db.save_fixtures(state["fixtures"])
+
+@benchmark("db.save_predictions", "db", setup=setup_database_directory, prepare=create_empty_database,
+           teardown=teardown_database)
+def bench_save_predictions(state, db):
+    db.save_predictions(state["predictions"])
+
+@benchmark("db.get_prediction_stats", "db", setup=setup_populated_database, teardown=teardown_database)
+def bench_get_prediction_stats(state):
+    state["db"].get_prediction_stats()
+
+@benchmark("db.get_predictions", "db", setup=setup_populated_database, teardown=teardown_database)
+def bench_get_predictions(state):
+    state["db"].get_predictions()
+
+@benchmark("db.get_fixtures", "db", setup=setup_populated_database, teardown=teardown_database)
+def bench_get_fixtures(state):
+    state["db"].get_fixtures()
+
+@benchmark("db.get_form_changes", "db", setup=setup_populated_database, teardown=teardown_database)
+def bench_get_form_changes(state):
+    state["db"].get_form_changes()
+
+@benchmark("db.get_predictions_page", "db", setup=setup_populated_database, teardown=teardown_database)
+def bench_get_predictions_page(state):
+    # Walk all pages like scrolling to the end of the predictions table
+    page = state["db"].get_predictions_page()
+    while page.get("next_cursor"):
+        page = state["db"].get_predictions_page(cursor=page["next_cursor"])
+
+# Treeview rendering
+
+def ensure_display():
+    """Start a virtual display with Xvfb when there is no display"""
+    if os.environ.get("DISPLAY"):
+        return
+    if not shutil.which("Xvfb"):
+        raise SkipBenchmark("no display, install Xvfb or run under xvfb-run")
+        
+    process = subprocess.Popen(["Xvfb", VIRTUAL_DISPLAY, "-screen", "0", "1280x1024x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    atexit.register(process.terminate)
+    os.environ["DISPLAY"] = VIRTUAL_DISPLAY
+    time.sleep(1)
+
+def setup_treeview() -> Dict[str, Any]:
+    """Create a window with a Treeview as the tabs do"""
+    ensure_display()
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        from tabs.base_tab import VirtualTable, sync_treeview
+    except ImportError as e:
+        raise SkipBenchmark(f"GUI not available: {str(e)}")
+        
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise SkipBenchmark(f"no display: {str(e)}")
+        
+    columns = ("team", "league", "opponent", "date", "prediction", "level", "result")
+    tree = ttk.Treeview(root, columns=columns, show="headings", height=30)
+    scrollbar = ttk.Scrollbar(root, orient="vertical")
+    tree.pack(side="left", fill="both", expand=True)
+    scrollbar.pack(side="right", fill="y")
+    root.update()
+    
+    rows = [(f"Team {i}", f"League {i % 40}", f"Opponent {i}", f"2024-08-{i % 28 + 1:02d}", "WIN", 1, "")
+            for i in range(PARAMS["rows"])]
+    changed = list(rows)
+    for i in range(0, len(rows), int(1 / CHANGED_SHARE)):
+        changed[i] = rows[i][:-1] + ("HOME_WIN",)
+        
+    return {"root": root, "tree": tree, "scrollbar": scrollbar, "rows": rows, "changed": changed,
+            "VirtualTable": VirtualTable, "sync_treeview": sync_treeview, "refreshes": 0}
+
+def teardown_treeview(state: Dict[str, Any]):
+    state["root"].destroy()
+
+@benchmark("render.virtual_table", "render", setup=setup_treeview, teardown=teardown_treeview)
+def bench_virtual_table(state):
+    table = state.get("table") or state["VirtualTable"](state["tree"], state["scrollbar"])
+    state["table"] = table
+    table.set_rows([(values, ()) for values in state["rows"]])
+    state["root"].update_idletasks()
+
+def clear_tree(state: Dict[str, Any]):
+    state.pop("table", None)
+    state["tree"].delete(*state["tree"].get_children())
+
+@benchmark("render.sync_treeview_fill", "render", setup=setup_treeview, prepare=clear_tree,
+           teardown=teardown_treeview)
+def bench_sync_treeview_fill(state, _):
+    state["sync_treeview"](state["tree"], [(str(i), values, ()) for i, values in enumerate(state["rows"])])
+    state["root"].update_idletasks()
+
+@benchmark("render.sync_treeview_refresh", "render", setup=setup_treeview, teardown=teardown_treeview)
+def bench_sync_treeview_refresh(state):
+    # Alternate between the rows and the rows with a few results filled in
+    state["refreshes"] += 1
+    rows = state["changed"] if state["refreshes"] % 2 else state["rows"]
+    state["sync_treeview"](state["tree"], [(str(i), values, ()) for i, values in enumerate(rows)])
+    state["root"].update_idletasks()
+
+def print_results(results: List[Dict[str, Any]], comparison: Dict[str, Dict[str, Any]]):
+    """Print one line per benchmark, with the change against the baseline"""
+    for result in results:
+        if "skipped" in result:
+            print(f"{result['name']:<32} skipped: {result['skipped']}")
+            continue
+            
+        line = (f"{result['name']:<32} median {format_seconds(result['median']):>10}, "
+                f"min {format_seconds(result['min']):>10}, stdev {format_seconds(result['stdev']):>10}")
+        change = comparison.get(result["name"])
+        if change:
+            line += f", {change['ratio']:.2f}x baseline"
+            if change["regression"]:
+                line += " REGRESSION"
+        print(line)
+
+def main_benchmarks():
+    """Run the benchmarks and compare them with a saved baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark form analysis, API client, database and rendering")
+    parser.add_argument("--filter", nargs="+", help="Only run benchmarks whose name starts with one of these")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    parser.add_argument("--leagues", type=int, default=PARAMS["leagues"], help="Number of synthetic leagues")
+    parser.add_argument("--teams", type=int, default=PARAMS["teams"], help="Teams per synthetic league")
+    parser.add_argument("--seasons", type=int, default=PARAMS["seasons"], help="Seasons per synthetic league")
+    parser.add_argument("--seed", type=int, default=PARAMS["seed"], help="Seed of the synthetic data")
+    parser.add_argument("--rows", type=int, default=PARAMS["rows"], help="Rows of the rendered tables")
+    parser.add_argument("--latency", type=float, default=PARAMS["latency"],
+                        help="Seconds the replay server adds to every response")
+    parser.add_argument("--repeat", type=int, help="Timed runs per benchmark, after one warm-up run")
+    parser.add_argument("--output", default=RESULTS_PATH, help="File to save the results to")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Results to compare with, if the file exists")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Slowdown against the baseline counted as regression, 0.2 is 20%%")
+    args = parser.parse_args()
+    
+    benchmarks = [bench for bench in REGISTRY if not args.filter or bench.name.startswith(tuple(args.filter))]
+    if args.list:
+        for bench in benchmarks:
+            print(bench.name)
+        return
+        
+    PARAMS.update(leagues=args.leagues, teams=args.teams, seasons=args.seasons, seed=args.seed,
+                  rows=args.rows, latency=args.latency)
+                  
+    results = []
+    for bench in benchmarks:
+        result = run_benchmark(bench, args.repeat)
+        results.append(result)
+        print_results([result], {})
+        
+    metadata = get_metadata(dict(PARAMS))
+    save_results(args.output, results, metadata)
+    print(f"Results saved to {args.output}")
+    
+    if args.save_baseline:
+        save_results(args.baseline, results, metadata)
+        print(f"Baseline saved to {args.baseline}")
+        return
+        
+    if not os.path.exists(args.baseline):
+        return
+        
+    baseline = load_results(args.baseline)
+    if baseline["metadata"].get("params") != metadata["params"]:
+        print(f"Warning: baseline was run with {baseline['metadata'].get('params')}")
+        
+    comparison = {change["name"]: change for change in compare(results, baseline, args.threshold)}
+    print(f"\nCompared with {args.baseline} (commit {baseline['metadata'].get('commit')}):")
+    print_results(results, comparison)
+    
+    if any(change["regression"] for change in comparison.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main_benchmarks()
@@ -0,0 +1,374 @@
+import argparse
+import gzip
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+# Run from the repository root so the app modules can be imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.league_names import LEAGUE_NAMES
+
+# Number of leagues the application shows today, --scale multiplies it
+TODAY_LEAGUES = sum(1 for league_id in LEAGUE_NAMES if isinstance(league_id, int) and league_id > 0)
+
+# Ids far above the real ones, so synthetic rows never collide with real data
+FIRST_LEAGUE_ID = 900000
+FIRST_TEAM_ID = 9000000
+FIRST_FIXTURE_ID = 90000000
+
+# Latest generated season, the one the API client requests
+CURRENT_SEASON = 2024
+
+# Average goals of the home and the away team between equally strong teams,
+# about 45% home wins and 25% draws like in the big European leagues
+HOME_GOALS = 1.4
+AWAY_GOALS = 1.1
+
+# Spread of team strengths and how much they change from one season to the next
+STRENGTH_SPREAD = 0.2
+STRENGTH_DRIFT = 0.1
+
+class SyntheticLeagues:
+    """
+    Deterministic API-shaped seasons for scale tests
+    
+    Every league season is generated from its own seed, so any league can be
+    generated alone and the same arguments always give the same data. Teams
+    have a strength that drifts between seasons, goals are Poisson distributed
+    around HOME_GOALS and AWAY_GOALS shifted by the strength difference.
+    Seasons are double round robins with one round a week from August, the
+    current season is played up to played_share of its rounds.
+    
+    Fixtures, standings rows and team statistics have the shape the API returns,
+    as used by FootballAPI, FormAnalyzer and the DatabaseManager.save_* methods.
+    """
+    
+    def __init__(self, leagues: int, teams: int = 20, seasons: int = 1, seed: int = 0, played_share: float = 0.6):
+        """
+        Args:
+            leagues: Number of leagues
+            teams: Teams per league, rounded up to an even number
+            seasons: Seasons per league, ending with CURRENT_SEASON
+            seed: Seed of all random numbers
+            played_share: Share of the rounds of the current season that are finished
+        """
+        self.leagues = leagues
+        self.teams = teams + teams % 2
+        self.seasons = seasons
+        self.seed = seed
+        self.played_share = played_share
+        
+        self.rounds = 2 * (self.teams - 1)
+        self.fixtures_per_season = self.teams * (self.teams - 1)
+        
+    @property
+    def league_ids(self) -> List[int]:
+        """Ids of the generated leagues"""
+        return [FIRST_LEAGUE_ID + index for index in range(self.leagues)]
+        
+    @property
+    def season_years(self) -> List[int]:
+        """Generated seasons, oldest first"""
+        return list(range(CURRENT_SEASON - self.seasons + 1, CURRENT_SEASON + 1))
+        
+    def team_ids(self, league_id: int) -> List[int]:
+        """Ids of the teams of a league"""
+        first = FIRST_TEAM_ID + (league_id - FIRST_LEAGUE_ID) * self.teams
+        return list(range(first, first + self.teams))
+        
+    def iter_league_seasons(self) -> Iterator[Dict[str, Any]]:
+        """
+        Generate all league seasons one at a time, only one is held in memory
+        
+        Yields:
+            dict: league_id, season, fixtures, standings (rows) and team_statistics by team id
+        """
+        for league_id in self.league_ids:
+            for season in self.season_years:
+                yield self.generate_league_season(league_id, season)
+                
+    def generate_league_season(self, league_id: int, season: int) -> Dict[str, Any]:
+        """Generate one season of a league, see iter_league_seasons"""
+        team_ids = self.team_ids(league_id)
+        strengths = self._get_strengths(league_id, season)
+        rng = random.Random(f"{self.seed}-{league_id}-{season}-scores")
+        
+        played_rounds = self.rounds if season < CURRENT_SEASON else int(self.rounds * self.played_share)
+        first_fixture_id = (FIRST_FIXTURE_ID + ((league_id - FIRST_LEAGUE_ID) * self.seasons
+                            + self.season_years.index(season)) * self.fixtures_per_season)
+        start = _first_saturday(season)
+        
+        fixtures = []
+        for round_index, pairs in enumerate(self._get_schedule()):
+            kickoff = start + timedelta(weeks=round_index)
+            for home, away in pairs:
+                played = round_index < played_rounds
+                goals = (_poisson(rng, HOME_GOALS * math.exp(strengths[home] - strengths[away])),
+                         _poisson(rng, AWAY_GOALS * math.exp(strengths[away] - strengths[home])))
+                fixtures.append(self._create_fixture(
+                    first_fixture_id + len(fixtures), league_id, season, round_index + 1, kickoff,
+                    team_ids[home], team_ids[away], goals if played else None
+                ))
+                
+        return {
+            "league_id": league_id,
+            "season": season,
+            "fixtures": fixtures,
+            "standings": build_standings(fixtures, team_ids),
+            "team_statistics": {team_id: build_team_statistics(fixtures, league_id, season, team_id)
+                                for team_id in team_ids}
+        }
+        
+    def iter_payloads(self) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Generate the API responses of all league seasons
+        
+        Yields:
+            tuple: (path, params, body) with the params the API clients send
+        """
+        for league_season in self.iter_league_seasons():
+            league_id, season = league_season["league_id"], league_season["season"]
+            
+            yield "/standings", {"league": league_id, "season": season}, _wrap("standings", {
+                "league": league_id, "season": season
+            }, [{"league": {
+                "id": league_id, "name": _league_name(league_id), "country": "Synthetic", "logo": None,
+                "flag": None, "season": season, "standings": [league_season["standings"]]
+            }}])
+            
+            yield "/fixtures", {"league": league_id, "season": season}, _wrap("fixtures", {
+                "league": league_id, "season": season
+            }, league_season["fixtures"])
+            
+            for team_id, stats in league_season["team_statistics"].items():
+                params = {"league": league_id, "team": team_id, "season": season}
+                yield "/teams/statistics", params, _wrap("teams/statistics", params, stats)
+                
+    def write_corpus(self, path: str) -> int:
+        """
+        Stream all responses to a corpus file that modules.http_replay can serve
+        
+        Returns:
+            int: Number of written responses
+        """
+        count = 0
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for endpoint, params, body in self.iter_payloads():
+                entry = {"path": endpoint, "params": sorted((name, str(value)) for name, value in params.items()),
+                         "status": 200, "body": body}
+                f.write(json.dumps(entry) + "\n")
+                count += 1
+        return count
+        
+    def _get_strengths(self, league_id: int, season: int) -> List[float]:
+        """Team strengths of a season, drifting from the first season on"""
+        rng = random.Random(f"{self.seed}-{league_id}-strength")
+        strengths = [rng.gauss(0, STRENGTH_SPREAD) for _ in range(self.teams)]
+        for year in self.season_years:
+            if year == season:
+                break
+            strengths = [strength + rng.gauss(0, STRENGTH_DRIFT) for strength in strengths]
+        return strengths
+        
+    def _get_schedule(self) -> List[List[Tuple[int, int]]]:
+        """Double round robin by the circle method, team indices as (home, away) per round"""
+        teams = list(range(self.teams))
+        first_half = []
+        for round_index in range(self.teams - 1):
+            pairs = []
+            for i in range(self.teams // 2):
+                home, away = teams[i], teams[-1 - i]
+                # Alternate home and away of the fixed team
+                pairs.append((home, away) if (round_index + i) % 2 == 0 else (away, home))
+            first_half.append(pairs)
+            teams = [teams[0]] + [teams[-1]] + teams[1:-1]
+            
+        return first_half + [[(away, home) for home, away in pairs] for pairs in first_half]
+        
+    def _create_fixture(self, fixture_id: int, league_id: int, season: int, round_number: int, kickoff: datetime,
+                        home_id: int, away_id: int, goals: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+        """Create a fixture as returned by the API, goals None for a fixture not played yet"""
+        home_goals, away_goals = goals if goals else (None, None)
+        finished = goals is not None
+        return {
+            "fixture": {
+                "id": fixture_id,
+                "referee": None,
+                "timezone": "UTC",
+                "date": kickoff.isoformat(),
+                "timestamp": int(kickoff.timestamp()),
+                "venue": {"id": home_id, "name": f"Stadium {home_id}", "city": "Synthetic"},
+                "status": {"long": "Match Finished", "short": "FT", "elapsed": 90} if finished else
+                          {"long": "Not Started", "short": "NS", "elapsed": None}
+            },
+            "league": {"id": league_id, "name": _league_name(league_id), "country": "Synthetic",
+                       "season": season, "round": f"Regular Season - {round_number}"},
+            "teams": {
+                "home": {"id": home_id, "name": _team_name(home_id), "logo": None,
+                         "winner": None if not finished or home_goals == away_goals else home_goals > away_goals},
+                "away": {"id": away_id, "name": _team_name(away_id), "logo": None,
+                         "winner": None if not finished or home_goals == away_goals else away_goals > home_goals}
+            },
+            "goals": {"home": home_goals, "away": away_goals},
+            "score": {"fulltime": {"home": home_goals, "away": away_goals}}
+        }
+
+def build_standings(fixtures: List[Dict[str, Any]], team_ids: List[int]) -> List[Dict[str, Any]]:
+    """Compute standings rows as returned by the API from finished fixtures"""
+    rows = {team_id: {"all": _empty_record(), "home": _empty_record(), "away": _empty_record(), "form": []}
+            for team_id in team_ids}
+            
+    for fixture in sorted(fixtures, key=lambda f: f["fixture"]["timestamp"]):
+        if fixture["fixture"]["status"]["short"] != "FT":
+            continue
+        for side, other in (("home", "away"), ("away", "home")):
+            team_id = fixture["teams"][side]["id"]
+            scored, conceded = fixture["goals"][side], fixture["goals"][other]
+            result = "W" if scored > conceded else "L" if scored < conceded else "D"
+            for record in (rows[team_id]["all"], rows[team_id][side]):
+                record["played"] += 1
+                record[{"W": "win", "D": "draw", "L": "lose"}[result]] += 1
+                record["goals"]["for"] += scored
+                record["goals"]["against"] += conceded
+            rows[team_id]["form"].append(result)
+            
+    standings = []
+    for team_id, row in rows.items():
+        record = row["all"]
+        standings.append({
+            "team": {"id": team_id, "name": _team_name(team_id), "logo": None},
+            "points": record["win"] * 3 + record["draw"],
+            "goalsDiff": record["goals"]["for"] - record["goals"]["against"],
+            "group": "Regular Season",
+            "form": "".join(row["form"][-5:]),
+            "status": "same",
+            "description": None,
+            "all": record,
+            "home": row["home"],
+            "away": row["away"]
+        })
+        
+    standings.sort(key=lambda row: (-row["points"], -row["goalsDiff"], -row["all"]["goals"]["for"], row["team"]["id"]))
+    for rank, row in enumerate(standings, start=1):
+        row["rank"] = rank
+    return standings
+
+def build_team_statistics(fixtures: List[Dict[str, Any]], league_id: int, season: int,
+                          team_id: int) -> Dict[str, Any]:
+    """Compute the /teams/statistics response of a team from finished fixtures"""
+    counts = {key: {"home": 0, "away": 0} for key in ("played", "wins", "draws", "loses", "for", "against",
+                                                      "clean_sheet", "failed_to_score")}
+    form = []
+    
+    for fixture in sorted(fixtures, key=lambda f: f["fixture"]["timestamp"]):
+        if fixture["fixture"]["status"]["short"] != "FT":
+            continue
+        if fixture["teams"]["home"]["id"] == team_id:
+            side, other = "home", "away"
+        elif fixture["teams"]["away"]["id"] == team_id:
+            side, other = "away", "home"
+        else:
+            continue
+            
+        scored, conceded = fixture["goals"][side], fixture["goals"][other]
+        result = "wins" if scored > conceded else "loses" if scored < conceded else "draws"
+        counts["played"][side] += 1
+        counts[result][side] += 1
+        counts["for"][side] += scored
+        counts["against"][side] += conceded
+        counts["clean_sheet"][side] += conceded == 0
+        counts["failed_to_score"][side] += scored == 0
+        form.append(result[0].upper())
+        
+    def totals(key):
+        return {**counts[key], "total": counts[key]["home"] + counts[key]["away"]}
+        
+    def averages(key):
+        # The API sends averages as strings
+        played, goals = totals("played"), totals(key)
+        return {place: f"{goals[place] / played[place]:.1f}" if played[place] else "0.0"
+                for place in ("home", "away", "total")}
+                
+    return {
+        "league": {"id": league_id, "name": _league_name(league_id), "country": "Synthetic", "season": season},
+        "team": {"id": team_id, "name": _team_name(team_id), "logo": None},
+        "form": "".join(form),
+        "fixtures": {key: totals(key) for key in ("played", "wins", "draws", "loses")},
+        "goals": {
+            "for": {"total": totals("for"), "average": averages("for")},
+            "against": {"total": totals("against"), "average": averages("against")}
+        },
+        "biggest": {},
+        "clean_sheet": totals("clean_sheet"),
+        "failed_to_score": totals("failed_to_score"),
+        "penalty": {"scored": {"total": 0, "percentage": "0%"}, "missed": {"total": 0, "percentage": "0%"},
+                    "total": 0},
+        "lineups": [{"formation": "4-4-2", "played": totals("played")["total"]}],
+        "cards": {}
+    }
+
+def _empty_record() -> Dict[str, Any]:
+    """Record of a standings row before any match"""
+    return {"played": 0, "win": 0, "draw": 0, "lose": 0, "goals": {"for": 0, "against": 0}}
+
+def _wrap(endpoint: str, params: Dict[str, Any], response: Any) -> Dict[str, Any]:
+    """Wrap a response in the envelope the API returns"""
+    return {
+        "get": endpoint,
+        "parameters": {name: str(value) for name, value in params.items()},
+        "errors": [],
+        "results": len(response) if isinstance(response, list) else 1,
+        "paging": {"current": 1, "total": 1},
+        "response": response
+    }
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    """Draw from a Poisson distribution, Knuth's method is fast for football scores"""
+    limit, goals, product = math.exp(-mean), 0, rng.random()
+    while product > limit:
+        goals += 1
+        product *= rng.random()
+    return goals
+
+def _first_saturday(season: int) -> datetime:
+    """Kickoff of the first round: the first Saturday of August at 15:00 UTC"""
+    day = datetime(season, 8, 1, 15, 0, tzinfo=timezone.utc)
+    return day + timedelta(days=(5 - day.weekday()) % 7)
+
+def _league_name(league_id: int) -> str:
+    """Name of a synthetic league"""
+    return f"Synthetic League {league_id - FIRST_LEAGUE_ID + 1}"
+
+def _team_name(team_id: int) -> str:
+    """Name of a synthetic team"""
+    return f"Team {team_id - FIRST_TEAM_ID + 1}"
+
+def main_synthetic():
+    """Write a synthetic corpus for scale tests"""
+    parser = argparse.ArgumentParser(description="Generate synthetic API data for scale tests")
+    parser.add_argument("--scale", type=float, default=10,
+                        help=f"Multiple of today's {TODAY_LEAGUES} leagues, used without --leagues")
+    parser.add_argument("--leagues", type=int, help="Number of leagues")
+    parser.add_argument("--teams", type=int, default=20, help="Teams per league")
+    parser.add_argument("--seasons", type=int, default=1, help=f"Seasons per league, ending with {CURRENT_SEASON}")
+    parser.add_argument("--seed", type=int, default=0, help="Seed, the same seed gives the same data")
+    parser.add_argument("--played-share", type=float, default=0.6, help="Finished share of the current season")
+    parser.add_argument("--out", default="benchmarks/synthetic.jsonl.gz", help="Corpus file to write")
+    args = parser.parse_args()
+    
+    leagues = args.leagues or max(1, round(TODAY_LEAGUES * args.scale))
+    generator = SyntheticLeagues(leagues, args.teams, args.seasons, args.seed, args.played_share)
+    
+    start = time.perf_counter()
+    count = generator.write_corpus(args.out)
+    print(f"Wrote {count} responses for {leagues} leagues x {generator.teams} teams x {args.seasons} seasons "
+          f"to {args.out} in {time.perf_counter() - start:.1f} s ({os.path.getsize(args.out) / 1e6:.1f} MB)")
+
+if __name__ == "__main__":
+    main_synthetic()
@@ -0,0 +1,256 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from config import ALL_LEAGUES, API_KEY, BASE_URL
+from league_names import LEAGUE_NAMES
+from modules.settings_manager import SettingsManager
+
+logger = logging.getLogger(__name__)
+
+# Leagues kept in the cache: comma separated ids, "all" for every known league,
+# empty for the leagues selected in the settings file
+WARM_LEAGUES = os.getenv('WARM_LEAGUES', '')
+
+# Settings file whose leagues are warmed when WARM_LEAGUES is empty
+WARM_SETTINGS_FILE = os.getenv('WARM_SETTINGS_FILE', 'settings.json')
+
+# Warmed when the settings select all leagues or none, every known league costs too many requests
+DEFAULT_WARM_LEAGUES = [39, 140, 78, 135, 61]
+
+# Minutes between two checks of a league. An entry is only refetched when it
+# would expire before the next check, so standings are requested about every
+# 6 hours and fixtures once a day, the durations of their cache tiers
+CACHE_REFRESH_MINUTES = int(os.getenv('CACHE_REFRESH_MINUTES', '60'))
+
+# Entries kept fresh for every league: fetch method, cache key and cache tier,
+# see FootballAPI.fetch_standings and FootballAPI.fetch_fixtures
+WARMED_ENTRIES = (
+    ("fetch_standings", "standings_{league_id}", "medium"),
+    ("fetch_fixtures", "fixtures_{league_id}_None_None", "long"),
+)
+
+# Number of leagues fetched at once during the warm-up
+WARM_UP_WORKERS = int(os.getenv('WARM_UP_WORKERS', '4'))
+
+# Name of the shared cache lock held by the worker running the warmer, and the
+# seconds after which another worker takes over unless the holder renews it
+WARMER_LOCK = "cache_warmer"
+WARMER_LOCK_SECONDS = 10 * 60
+
+# Set to 0 to start the Dash app with a cold cache
+CACHE_WARM_UP = os.getenv('CACHE_WARM_UP', '1') != '0'
+
+def get_warm_leagues() -> List[int]:
+    """Get the leagues configured by WARM_LEAGUES"""
+    if WARM_LEAGUES.strip().lower() == 'all':
+        return [league_id for league_id in LEAGUE_NAMES if isinstance(league_id, int) and league_id != ALL_LEAGUES]
+        
+    if not WARM_LEAGUES.strip():
+        leagues = SettingsManager(WARM_SETTINGS_FILE).get_leagues() or []
+        if not leagues or ALL_LEAGUES in leagues:
+            return list(DEFAULT_WARM_LEAGUES)
+        return leagues
+        
+    leagues = []
+    for value in WARM_LEAGUES.split(','):
+        try:
+            leagues.append(int(value))
+        except ValueError:
+            if value.strip():
+                logger.warning(f"Ignoring invalid league id in WARM_LEAGUES: {value}")
+    return leagues
+
+class CacheWarmer:
+    """
+    Fills the API cache before the Dash app serves requests and keeps it fresh
+    
+    The warm-up fetches standings and fixtures of every league that are not
+    cached yet. Afterwards a background thread checks one league at a time,
+    spread evenly over CACHE_REFRESH_MINUTES, and refetches an entry only when
+    its cache tier would expire before the next check. The new entry replaces the
+    old one in place, so callbacks never wait for the upstream API.
+    
+    Under gunicorn every worker starts a warmer (see gunicorn.conf.py), but only
+    the one holding WARMER_LOCK in lock_store works. The others wait and take
+    over when it stops renewing the lock, and all read its entries from the
+    shared cache.
+    """
+    
+    def __init__(self, api, league_ids: List[int], refresh_minutes: int = CACHE_REFRESH_MINUTES,
+                 workers: int = WARM_UP_WORKERS, lock_store=None):
+        """
+        Args:
+            api: FootballAPI whose cache is filled
+            league_ids: Leagues kept in the cache
+            refresh_minutes: Minutes between two checks of a league
+            workers: Number of leagues fetched at once during the warm-up
+            lock_store: SharedCache holding WARMER_LOCK, None runs without the lock
+        """
+        self.api = api
+        self.league_ids = list(league_ids)
+        self.refresh_interval = max(1, refresh_minutes) * 60
+        self.workers = workers
+        
+        # The combined ALL_LEAGUES entries are only complete when every league is cached
+        known = {league_id for league_id in LEAGUE_NAMES if isinstance(league_id, int) and league_id != ALL_LEAGUES}
+        self.include_all = known.issubset(self.league_ids)
+        
+        self.lock_store = lock_store
+        self._owner = str(os.getpid())
+        self._stopped = threading.Event()
+        self._thread = None
+        
+    def warm_up(self) -> int:
+        """
+        Fetch standings and fixtures of all leagues, served from the cache when still fresh
+        
+        Returns:
+            int: Number of leagues that failed
+        """
+        start = time.perf_counter()
+        
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="WarmUp") as executor:
+            failed = sum(1 for ok in executor.map(self._fetch_league, self.league_ids) if not ok)
+            
+        if self.include_all:
+            self._fetch_all_leagues(refresh=False)
+            
+        logger.info(f"Cache warm-up of {len(self.league_ids)} leagues took "
+                    f"{time.perf_counter() - start:.1f} s, {failed} failed, "
+                    f"API requests left: {self.api.rate_limits.format_budget() or 'unknown'}")
+        return failed
+        
+    def start(self, warm_up: bool = False):
+        """Keep the cache fresh in a daemon thread, optionally warming it up first"""
+        if self._thread is not None:
+            return
+            
+        self._thread = threading.Thread(target=self._run, args=(warm_up,), name="CacheWarmer", daemon=True)
+        self._thread.start()
+        
+    def stop(self):
+        """Stop refreshing after the current league and let another worker take over"""
+        self._stopped.set()
+        if self.lock_store is not None:
+            self.lock_store.release_lock(WARMER_LOCK, self._owner)
+            
+    def _hold_lock(self) -> bool:
+        """Take or renew WARMER_LOCK, always True without a lock store"""
+        if self.lock_store is None:
+            return True
+        return self.lock_store.acquire_lock(WARMER_LOCK, self._owner, WARMER_LOCK_SECONDS)
+        
+    def _wait(self, seconds: float) -> bool:
+        """
+        Wait, renewing the lock meanwhile or waiting until it can be taken
+        
+        Returns:
+            bool: True when stopped
+        """
+        deadline = time.monotonic() + seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if self._stopped.wait(min(max(0, remaining), WARMER_LOCK_SECONDS / 3)):
+                return True
+                
+            # Another worker holds it, take over if that one stops renewing it
+            while not self._hold_lock():
+                if self._stopped.wait(WARMER_LOCK_SECONDS / 2):
+                    return True
+                    
+            if remaining <= WARMER_LOCK_SECONDS / 3:
+                return False
+                
+    def _run(self, warm_up: bool):
+        """Warm up, then refresh the expiring entries league by league until stopped"""
+        if self._wait(0):
+            return
+            
+        if warm_up:
+            self.warm_up()
+            
+        spacing = self.refresh_interval / max(len(self.league_ids), 1)
+        
+        while not self._stopped.is_set():
+            cycle_start = time.monotonic()
+            
+            for index, league_id in enumerate(self.league_ids):
+                if self._wait(cycle_start + index * spacing - time.monotonic()):
+                    return
+                self._fetch_league(league_id, refresh=True)
+                
+            # Per-league responses older than their 15 minute tier are requested again for it
+            if self.include_all:
+                self._fetch_all_leagues(refresh=True)
+                
+            if self._wait(cycle_start + self.refresh_interval - time.monotonic()):
+                return
+            
+    def _is_expiring(self, key: str, cache_type: str) -> bool:
+        """Check if a cache entry is missing or expires before the next check"""
+        age = self.api.get_cache_age(key, cache_type)
+        duration = self.api.cache[cache_type]['duration'].total_seconds()
+        return age is None or age + self.refresh_interval >= duration
+        
+    def _fetch_league(self, league_id: int, refresh: bool = False) -> bool:
+        """
+        Fetch standings and fixtures of a league into the cache
+        
+        Without refresh cached entries are kept, with refresh only the entries
+        that expire before the next check are refetched.
+        
+        Returns:
+            bool: False if a fetch failed
+        """
+        ok = True
+        for method, key, cache_type in WARMED_ENTRIES:
+            try:
+                if refresh and not self._is_expiring(key.format(league_id=league_id), cache_type):
+                    continue
+                if getattr(self.api, method)(league_id, refresh=refresh) is None:
+                    ok = False
+                    
+            except Exception as e:
+                logger.error(f"Error warming cache for league {league_id}: {str(e)}")
+                ok = False
+        return ok
+        
+    def _fetch_all_leagues(self, refresh: bool):
+        """Rebuild the combined ALL_LEAGUES entries from the cached leagues"""
+        self._fetch_league(ALL_LEAGUES, refresh=refresh)
+
+def start_cache_warmer(api=None, block: bool = True, exclusive: bool = False) -> Optional[CacheWarmer]:
+    """
+    Warm up the cache and keep it fresh in the background
+    
+    Args:
+        api: FootballAPI to fill, a new one with the shared cache when None
+        block: Wait for the warm-up, otherwise it runs in the background thread
+        exclusive: Only work while holding WARMER_LOCK in the shared cache, for
+            starting a warmer in every gunicorn worker. The warm-up then always
+            runs in the background thread, once the lock is taken
+        
+    Returns:
+        CacheWarmer: The running warmer, None if disabled by CACHE_WARM_UP
+    """
+    if not CACHE_WARM_UP:
+        logger.info("Cache warm-up disabled")
+        return None
+        
+    if api is None:
+        from api import FootballAPI
+        api = FootballAPI(API_KEY, BASE_URL)
+        
+        # Its requests are reported by /metrics of the workers under this role
+        api.metrics.role = "cache_warmer"
+        
+    warmer = CacheWarmer(api, get_warm_leagues(), lock_store=api.shared_cache if exclusive else None)
+    block = block and not exclusive
+    if block:
+        warmer.warm_up()
+    warmer.start(warm_up=not block)
+    return warmer
@@ -1,12 +1,16 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 import os
+import threading
 import time
 from typing import Dict, List, Optional
 from venv import logger
 from dotenv import load_dotenv
 import requests
 
+from modules.rate_limiter import TokenBucket
+
 load_dotenv()  # Load environment variables from .env file
 
 API_KEY = os.getenv('FOOTBALL_API_KEY')  # Instead of hardcoding
@@ -18,6 +22,15 @@ CALLS_PER_MINUTE=os.getenv('CALLS_PER_MINUTE')
 ALL_LEAGUES = -1  # Special value for all leagues
 PERF_DIFF_THRESHOLD = 0.75
 
+# Leagues checked at once by find_active_leagues, all requests share one rate limiter
+LEAGUE_SCAN_WORKERS = 4
+
+# Progress of find_active_leagues, an interrupted scan resumes from this file
+LEAGUE_SCAN_CHECKPOINT = os.path.join('cache', 'league_scan.json')
+
+# Seconds after which a league found inactive is checked again, it may have started since
+INACTIVE_LEAGUE_RECHECK_AGE = 7 * 24 * 60 * 60
+
 class FootballDataFetcher:
     def __init__(self):
         self.api_key = os.getenv('FOOTBALL_API_KEY')
@@ -26,13 +39,19 @@ class FootballDataFetcher:
             'x-rapidapi-key': self.api_key,
             'x-rapidapi-host': 'v3.football.api-sports.io'
         }
+        # Shared by the scanner threads, one request at a time at most calls_per_minute
+        self.rate_limiter = TokenBucket(self.calls_per_minute / 60, 1)
+        self._checkpoint_lock = threading.Lock()
 
     def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
         """Make API request with rate limiting"""
         try:
-            time.sleep(60 / self.calls_per_minute)  # Rate limiting
+            self.rate_limiter.acquire()
             url = f"https://v3.football.api-sports.io/{endpoint}"
             response = requests.get(url, headers=self.headers, params=params)
+            if response.status_code == 429:
+                # Pause all scanner threads for a minute
+                self.rate_limiter.drain(60)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -70,15 +89,54 @@ class FootballDataFetcher:
         
         return unique_leagues
 
+    def get_leagues_for_season(self, season: int) -> List[Dict]:
+        """Get all leagues of a season with their coverage in a single request"""
+        response = self._make_request("leagues", {"season": season})
+        if not response or not response.get('response'):
+            logger.error(f"Failed to fetch leagues for {season}")
+            return []
+            
+        # Remove duplicate leagues (same id)
+        unique_leagues = {}
+        for league in response['response']:
+            unique_leagues.setdefault(league['league']['id'], league)
+        return list(unique_leagues.values())
+
+    def check_league_coverage(self, league: Dict, season: int) -> Optional[bool]:
+        """
+        Check if a league has fixtures and players for given season from the /leagues coverage data
+        
+        Returns:
+            bool: Whether the league is active, None if the coverage data is missing
+        """
+        for league_season in league.get('seasons') or []:
+            if league_season.get('year') != season:
+                continue
+                
+            coverage = league_season.get('coverage')
+            if not coverage or 'fixtures' not in coverage:
+                return None
+            # statistics_players is the coverage of the fixtures/players endpoint
+            return bool(coverage['fixtures'].get('statistics_players'))
+            
+        return None
+
     def check_league_activity(self, league_id: int, season: int) -> Dict:
-        """Check if a league has active fixtures and players for given season"""
+        """
+        Check if a league has active fixtures and players for given season
+        
+        Downloads the fixtures of the season, used when a league has no coverage
+        data. "active" is None if a request failed.
+        """
         # Get fixtures for the season
         fixtures = self._make_request("fixtures", {
             "league": league_id,
             "season": season
         })
 
-        if not fixtures or not fixtures.get('response'):
+        if fixtures is None:
+            return {"active": None, "fixture_count": 0}
+        if not fixtures.get('response'):
             return {"active": False, "fixture_count": 0}
 
         # Check first fixture for players
@@ -87,7 +145,9 @@ class FootballDataFetcher:
             players = self._make_request("fixtures/players", {
                 "fixture": fixture_id
             })
-            if players and players.get('response'):
+            if players is None:
+                return {"active": None, "fixture_count": 0}
+            if players.get('response'):
                 return {
                     "active": True,
                     "fixture_count": len(fixtures['response'])
@@ -95,48 +155,136 @@ class FootballDataFetcher:
 
         return {"active": False, "fixture_count": 0}
 
-    def find_active_leagues(self, season: int = 2024) -> List[Dict]:
-        """Find all leagues with active fixtures and players for given season"""
-        active_leagues = []
-        countries = self.get_countries()
+    def _load_checkpoint(self, path: str, season: int) -> Dict:
+        """Load the progress of an earlier scan of the season, a new checkpoint if there is none"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('season') == season:
+                # Checkpoints written before inactive leagues had a timestamp are rechecked
+                if isinstance(checkpoint.get('inactive'), list):
+                    checkpoint['inactive'] = {}
+                return checkpoint
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading league scan checkpoint {path}: {str(e)}")
+            
+        return {"season": season, "active": {}, "inactive": {}}
+
+    def _save_checkpoint(self, path: str, checkpoint: Dict):
+        """Save the scan progress, replacing the file so an interruption cannot corrupt it"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+                
+            with self._checkpoint_lock:
+                temp_path = f"{path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+                os.replace(temp_path, path)
+                
+        except OSError as e:
+            logger.error(f"Error saving league scan checkpoint {path}: {str(e)}")
+
+    def _record_league(self, checkpoint: Dict, league: Dict, active: bool, fixture_count: Optional[int]):
+        """Add the result of a league check to the checkpoint, inactive leagues with the time of the check"""
+        league_id = league['league']['id']
         
-        print(f"\nScanning countries for active leagues in {season} season...")
-        print("="*50)
+        with self._checkpoint_lock:
+            if active:
+                checkpoint['inactive'].pop(str(league_id), None)
+                checkpoint['active'][str(league_id)] = {
+                    "id": league_id,
+                    "name": league['league']['name'],
+                    "country": league['country']['name'],
+                    "flag": league['country'].get('flag'),
+                    "type": league['league'].get('type', 'Unknown'),
+                    "fixture_count": fixture_count
+                }
+            else:
+                checkpoint['inactive'][str(league_id)] = time.time()
 
-        for country in countries:
-            country_name = country['name']
-            print(f"\nChecking leagues in {country['flag']} {country_name}")
+    def find_active_leagues(self, season: int = 2024, checkpoint_path: Optional[str] = LEAGUE_SCAN_CHECKPOINT,
+                            max_workers: int = LEAGUE_SCAN_WORKERS,
+                            recheck_age: float = INACTIVE_LEAGUE_RECHECK_AGE) -> List[Dict]:
+        """
+        Find all leagues with active fixtures and players for given season
+        
+        All leagues of the season come from one /leagues request and most are
+        decided by its coverage data. Only leagues without coverage data are
+        checked by downloading fixtures, max_workers at a time. Progress is saved
+        to checkpoint_path, so a scan that is interrupted or run again skips the
+        active leagues. Inactive leagues are skipped for recheck_age seconds, then
+        checked again. Leagues whose check failed are retried.
+        
+        Args:
+            season: Season to scan
+            checkpoint_path: Checkpoint file, None scans without one
+            max_workers: Number of leagues checked at once
+            recheck_age: Seconds after which inactive leagues are checked again
             
-            leagues = self.get_leagues_for_country(country_name)
-            if not leagues:
-                print(f"  No leagues found for {country_name}")
-                continue
+        Returns:
+            list: Active leagues, fixture_count is None for leagues decided by coverage
+        """
+        if checkpoint_path:
+            checkpoint = self._load_checkpoint(checkpoint_path, season)
+        else:
+            checkpoint = {"season": season, "active": {}, "inactive": {}}
+        checked_after = time.time() - recheck_age
+        checked = {int(league_id) for league_id in checkpoint['active']} | {
+            int(league_id) for league_id, checked_at in checkpoint['inactive'].items() if checked_at > checked_after
+        }
+        
+        print(f"\nScanning leagues for the {season} season...")
+        print("="*50)
+        
+        leagues = [league for league in self.get_leagues_for_season(season) if league['league']['id'] not in checked]
+        print(f"  {len(checked)} leagues known from the last scan, {len(leagues)} to check")
+        
+        # Decide leagues from the coverage data without further requests
+        unknown = []
+        for league in leagues:
+            active = self.check_league_coverage(league, season)
+            if active is None:
+                unknown.append(league)
+            else:
+                self._record_league(checkpoint, league, active, None)
                 
-            print(f"  Found {len(leagues)} leagues to check")
+        if checkpoint_path:
+            self._save_checkpoint(checkpoint_path, checkpoint)
+        print(f"  {len(leagues) - len(unknown)} leagues decided by coverage data, {len(unknown)} without")
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="LeagueScan") as executor:
+            futures = {
+                executor.submit(self.check_league_activity, league['league']['id'], season): league
+                for league in unknown
+            }
             
-            for league in leagues:
-                league_id = league['league']['id']
+            for future in as_completed(futures):
+                league = futures[future]
                 league_name = league['league']['name']
-                league_type = league['league'].get('type', 'Unknown')
-                
-                print(f"  - Checking {league_name} ({league_type})")
-                
-                activity = self.check_league_activity(league_id, season)
+                try:
+                    activity = future.result()
+                except Exception as e:
+                    logger.error(f"Error checking league {league_name}: {str(e)}")
+                    continue
+                    
+                if activity['active'] is None:
+                    print(f"    ⚠️ Check of {league_name} failed, retried on the next scan")
+                    continue
+                    
+                self._record_league(checkpoint, league, activity['active'], activity['fixture_count'])
+                if checkpoint_path:
+                    self._save_checkpoint(checkpoint_path, checkpoint)
+                    
                 if activity['active']:
-                    active_league = {
-                        "id": league_id,
-                        "name": league_name,
-                        "country": country_name,
-                        "flag": country['flag'],
-                        "type": league_type,
-                        "fixture_count": activity['fixture_count']
-                    }
-                    active_leagues.append(active_league)
                     print(f"    ✅ Added {league_name} - {activity['fixture_count']} fixtures found")
                 else:
-                    print(f"    ❌ No active fixtures/players found")
-
-        return active_leagues
+                    print(f"    ❌ No active fixtures/players found for {league_name}")
+                    
+        return list(checkpoint['active'].values())
 
 def generate_league_names_dict(active_leagues: List[Dict]) -> str:
     """Generate LEAGUE_NAMES dictionary string in the required format"""
@@ -1,3 +1,38 @@
-bind = "0.0.0.0:10000"
-workers = 2
-timeout = 120
\ No newline at end of file
+import os
+
+# All settings can be overridden through the environment, the defaults suit a small container
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '10000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+
+# Worker model: "gthread" serves each worker's requests from a thread pool, "gevent"
+# from greenlets (requires gevent), "sync" handles one request per worker at a time.
+# Callbacks wait on upstream requests, so a sync worker is blocked while they run
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+# Requests served at once per worker, threads for gthread, greenlets for gevent.
+# Gunicorn turns sync workers with more than one thread into gthread workers
+threads = int(os.getenv("GUNICORN_THREADS", "8")) if worker_class != "sync" else 1
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "100"))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+
+def when_ready(server):
+    """Log the worker settings once the master is ready"""
+    server.log.info(f"Starting {workers} {worker_class} workers")
+
+
+def post_worker_init(worker):
+    """Start the cache warmer in the background, one worker at a time fills the shared cache"""
+    from cache_warmer import start_cache_warmer
+    from shared_cache import SharedCache
+    
+    # Workers only see each other's entries through the shared cache
+    if SharedCache.from_env() is None:
+        worker.log.warning("Shared cache disabled, skipping cache warm-up")
+        return
+        
+    # The master must not start threads or open connections, the workers are forked from it
+    start_cache_warmer(block=False, exclusive=True)
@@ -1,6 +1,7 @@
 import os
 import json
 import logging
+import importlib
 import sqlite3
 import customtkinter as ctk
 import tkinter as tk
@@ -13,21 +14,30 @@ from modules.config import API_KEY, BASE_URL, ALL_LEAGUES, PERF_DIFF_THRESHOLD
 from modules.league_names import LEAGUE_NAMES
 from modules.db_manager import DatabaseManager
 from modules.settings_manager import SettingsManager
+from modules.refresh_scheduler import RefreshScheduler
+from modules.background import BackgroundRunner
 from modules.translations import translate
 
-# Import tabs
-from tabs.form_tab import FormTab
-from tabs.settings_tab import SettingsTab
-from tabs.stats_tab import StatsTab
-from tabs.winless_tab import WinlessTab
-from tabs.team_tab import TeamTab
-from tabs.next_round_tab import NextRoundTab
-from tabs.league_stats_tab import LeagueStatsTab
-from tabs.data_collection_tab import DataCollectionTab
-from tabs.firebase_tab import FirebaseTab
-from tabs.db_view_tab import DbViewTab
-from tabs.about_tab import AboutTab
-from tabs.logs_tab import LogsTab
+# Import tabs. Tab modules are imported when the tab is first opened, except the
+# logs tab, which has to capture log records from startup on
+from tabs.logs_tab import LogsTab, apply_log_settings
+
+# Tabs in display order: (title, attribute, module, class). StatsTab and SettingsTab
+# take different constructor arguments, see _create_tab_content
+TABS = [
+    ("Winless Streaks", "winless_tab", "tabs.winless_tab", "WinlessTab"),
+    ("Team Analysis", "team_tab", "tabs.team_tab", "TeamTab"),
+    ("Next Round", "next_round_tab", "tabs.next_round_tab", "NextRoundTab"),
+    ("League Stats", "league_stats_tab", "tabs.league_stats_tab", "LeagueStatsTab"),
+    ("Form Analysis", "form_tab", "tabs.form_tab", "FormTab"),
+    ("Data Collection", "data_collection_tab", "tabs.data_collection_tab", "DataCollectionTab"),
+    ("Firebase Analysis", "firebase_tab", "tabs.firebase_tab", "FirebaseTab"),
+    ("Statistics", "stats_tab", "tabs.stats_tab", "StatsTab"),
+    ("Database View", "db_view_tab", "tabs.db_view_tab", "DbViewTab"),
+    ("Logs", "logs_tab", "tabs.logs_tab", "LogsTab"),
+    ("About", "about_tab", "tabs.about_tab", "AboutTab"),
+    ("Settings", "settings_tab", "tabs.settings_tab", "SettingsTab")
+]
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -47,9 +57,19 @@ class FootballStatsApp(ctk.CTk):
         # Initialize database manager
         self.db_manager = DatabaseManager("football_stats.db")
         
+        # Keep team statistics until their teams play again
+        self.api.attach_stats_store(self.db_manager)
+        
         # Initialize settings manager
         self.settings_manager = SettingsManager()
         
+        # Apply log buffer and log file settings before any tab is built
+        apply_log_settings(self.settings_manager)
+        
+        # Refresh data in the background when auto refresh is enabled
+        self.refresh_scheduler = RefreshScheduler.shared(self.api)
+        self._apply_refresh_settings()
+        
         # Configure window
         self.title(translate("Football Statistics Analyzer"))
         self.geometry("1200x800")
@@ -63,59 +83,118 @@ class FootballStatsApp(ctk.CTk):
         style.configure("TNotebook.Tab", font=('Helvetica', 36))  # Increased font size from 28 to 36
         style.configure("TNotebook", font=('Helvetica', 36))  # Add font configuration for the notebook itself
         
-        # Create tabview
-        self.tabview = ctk.CTkTabview(self.main_container)
+        # Create tabview, tab contents are built when a tab is first opened
+        self.tabview = ctk.CTkTabview(self.main_container, command=self._on_tab_changed)
         self.tabview.pack(fill="both", expand=True)
         
         # Add tabs with Slovak translations
-        self.winless_tab = self.tabview.add(translate("Winless Streaks"))
-        self.team_tab = self.tabview.add(translate("Team Analysis"))
-        self.next_round_tab = self.tabview.add(translate("Next Round"))
-        self.league_stats_tab = self.tabview.add(translate("League Stats"))
-        self.form_tab = self.tabview.add(translate("Form Analysis"))
-        self.data_collection_tab = self.tabview.add(translate("Data Collection"))
-        self.firebase_tab = self.tabview.add(translate("Firebase Analysis"))
-        self.stats_tab = self.tabview.add(translate("Statistics"))
-        self.db_view_tab = self.tabview.add(translate("Database View"))
-        self.logs_tab = self.tabview.add(translate("Logs"))
-        self.about_tab = self.tabview.add(translate("About"))
-        self.settings_tab = self.tabview.add(translate("Settings"))
-        
-        # Initialize tab contents
-        self.winless_tab_content = WinlessTab(self.winless_tab, self.api, self.db_manager, self.settings_manager)
-        self.team_tab_content = TeamTab(self.team_tab, self.api, self.db_manager, self.settings_manager)
-        self.next_round_tab_content = NextRoundTab(self.next_round_tab, self.api, self.db_manager, self.settings_manager)
-        self.league_stats_tab_content = LeagueStatsTab(self.league_stats_tab, self.api, self.db_manager, self.settings_manager)
-        self.form_tab_content = FormTab(self.form_tab, self.api, self.db_manager, self.settings_manager)
-        self.data_collection_tab_content = DataCollectionTab(self.data_collection_tab, self.api, self.db_manager, self.settings_manager)
-        self.firebase_tab_content = FirebaseTab(self.firebase_tab, self.api, self.db_manager, self.settings_manager)
-        self.stats_tab_content = StatsTab(self.stats_tab, self.db_manager)
-        self.db_view_tab_content = DbViewTab(self.db_view_tab, self.api, self.db_manager, self.settings_manager)
-        self.logs_tab_content = LogsTab(self.logs_tab, self.api, self.db_manager, self.settings_manager)
-        self.about_tab_content = AboutTab(self.about_tab, self.api, self.db_manager, self.settings_manager)
-        self.settings_tab_content = SettingsTab(self.settings_tab, self.settings_manager, self.on_settings_changed, self.db_manager)
-        
-        # Set default tab
+        self.tab_titles = {}
+        self.failed_tabs = set()
+        for title, attribute, module_name, class_name in TABS:
+            setattr(self, attribute, self.tabview.add(translate(title)))
+            setattr(self, f"{attribute}_content", None)
+            self.tab_titles[translate(title)] = attribute
+            
+        # Create status bar
+        status_frame = ctk.CTkFrame(self, fg_color="transparent")
+        status_frame.pack(fill="x", padx=10, pady=(0, 10))
+        
+        self.status_bar = ctk.CTkLabel(status_frame, text=translate("Ready"), anchor="w", font=ctk.CTkFont(size=14))
+        self.status_bar.pack(side="left", fill="x", expand=True)
+        
+        # Remaining API requests, updated from the headers of every response
+        self.budget_label = ctk.CTkLabel(status_frame, text="", anchor="e", font=ctk.CTkFont(size=14))
+        self.budget_label.pack(side="right")
+        
+        # Responses arrive on worker threads, hand the budget over to the main thread
+        runner = BackgroundRunner.shared(self)
+        self.api.rate_limits.add_listener(lambda budget: runner.post(self._show_budget, budget))
+        
+        # Set default tab and build only its content
         self.tabview.set(translate("Winless Streaks"))
+        self._ensure_tab_content("winless_tab")
         
-        # Create status bar
-        self.status_bar = ctk.CTkLabel(self, text=translate("Ready"), anchor="w", font=ctk.CTkFont(size=14))
-        self.status_bar.pack(fill="x", padx=10, pady=(0, 10))
+        # Optionally build the other tabs one by one once the window has been drawn
+        if self.settings_manager.get_warm_up_tabs():
+            self.after(500, self._warm_up_tabs)
+            
+    def _create_tab_content(self, attribute, module_name, class_name):
+        """Import a tab module and create the tab content"""
+        tab_class = getattr(importlib.import_module(module_name), class_name)
+        parent = getattr(self, attribute)
+        
+        if class_name == "StatsTab":
+            return tab_class(parent, self.db_manager)
+        if class_name == "SettingsTab":
+            return tab_class(parent, self.settings_manager, self.on_settings_changed, self.db_manager)
+        return tab_class(parent, self.api, self.db_manager, self.settings_manager)
+        
+    def _ensure_tab_content(self, attribute):
+        """Build the content of a tab if it has not been built yet"""
+        content = getattr(self, f"{attribute}_content")
+        if content is not None:
+            return content
+            
+        for title, tab_attribute, module_name, class_name in TABS:
+            if tab_attribute == attribute:
+                try:
+                    content = self._create_tab_content(attribute, module_name, class_name)
+                    setattr(self, f"{attribute}_content", content)
+                    logger.info(f"Created {title} tab")
+                except Exception as e:
+                    self.failed_tabs.add(attribute)
+                    logger.error(f"Error creating {title} tab: {str(e)}")
+                break
+                
+        return content
+        
+    def _on_tab_changed(self):
+        """Build the selected tab on first activation"""
+        attribute = self.tab_titles.get(self.tabview.get())
+        if attribute:
+            self._ensure_tab_content(attribute)
+            
+    def _warm_up_tabs(self):
+        """Build the next unbuilt tab, one tab per idle period so the UI stays responsive"""
+        for title, attribute, module_name, class_name in TABS:
+            if getattr(self, f"{attribute}_content") is None and attribute not in self.failed_tabs:
+                self._ensure_tab_content(attribute)
+                self.after(200, self._warm_up_tabs)
+                return
+                
+    def _show_budget(self, budget):
+        """Show the remaining API requests in the status bar"""
+        if budget["blocked"]:
+            self.budget_label.configure(text=translate("API request limit reached"))
+            return
+            
+        parts = []
+        if budget["daily_remaining"] is not None:
+            parts.append(f"{budget['daily_remaining']}/{budget['daily_limit'] or '?'} {translate('today')}")
+        if budget["minute_remaining"] is not None:
+            parts.append(f"{budget['minute_remaining']}/{budget['minute_limit'] or '?'} {translate('this minute')}")
+        if parts:
+            self.budget_label.configure(text=f"{translate('API requests left')}: {', '.join(parts)}")
+            
+    def _apply_refresh_settings(self):
+        """Start, stop or reschedule auto refresh from the settings"""
+        self.refresh_scheduler.configure(
+            self.settings_manager.get_auto_refresh(),
+            self.settings_manager.get_refresh_interval(),
+            self.settings_manager.get_leagues(),
+            self.settings_manager.get_form_length()
+        )
         
     def on_settings_changed(self):
         """Callback when settings are changed"""
-        # Update tabs with new settings
-        self.winless_tab_content.update_settings()
-        self.team_tab_content.update_settings()
-        self.next_round_tab_content.update_settings()
-        self.league_stats_tab_content.update_settings()
-        self.form_tab_content.update_settings()
-        self.data_collection_tab_content.update_settings()
-        self.firebase_tab_content.update_settings()
-        self.stats_tab_content.update_settings()
-        self.db_view_tab_content.update_settings()
-        self.logs_tab_content.update_settings()
-        self.about_tab_content.update_settings()
+        apply_log_settings(self.settings_manager)
+        self._apply_refresh_settings()
+        
+        # Update tabs with new settings, unbuilt tabs read the settings when created
+        for title, attribute, module_name, class_name in TABS:
+            content = getattr(self, f"{attribute}_content")
+            if content is not None and attribute != "settings_tab":
+                content.update_settings()
         
         # Update appearance
         ctk.set_appearance_mode(self.settings_manager.get_setting("appearance_mode"))
@@ -3,14 +3,22 @@ import time
 import requests
 import logging
 import json
-from typing import Dict, Any, Optional, List
-
-from modules.config import ALL_LEAGUES, PERF_DIFF_THRESHOLD
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Callable, Iterable, Tuple
+
+from modules.config import (ALL_LEAGUES, PERF_DIFF_THRESHOLD, API_REQUESTS_PER_SECOND, API_BURST_SIZE,
+                            PREFETCH_WORKERS, FINISHED_STATUSES, MATCH_DURATION, ODDS_BOOKMAKER)
+from modules.db_manager import get_fixture_timestamp
+from modules.rate_limiter import TokenBucket, RateLimitManager, RetryQueue, RETRY_ATTEMPTS
+from modules.api_metrics import ApiMetrics, ERROR_STATUS, get_endpoint
 from modules.league_names import LEAGUE_NAMES
 from modules.form_analyzer import FormAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of fixture ids the API accepts in one request
+FIXTURE_IDS_PER_REQUEST = 20
+
 class FootballAPI:
     def __init__(self, api_key, base_url):
         self.api_key = api_key
@@ -19,6 +27,27 @@ class FootballAPI:
         self.logger = logging.getLogger(__name__)
         self._initialize_cache()
         
+        # Shared by all threads that use this client
+        self.rate_limiter = TokenBucket(API_REQUESTS_PER_SECOND, API_BURST_SIZE)
+        
+        # Request budget reported by the API, shown in the status bar
+        self.rate_limits = RateLimitManager(self.rate_limiter)
+        
+        # Request counts, latencies and cache hits, see stats()
+        self.metrics = ApiMetrics()
+        
+        # Persistent team statistics store, see attach_stats_store()
+        self.stats_store = None
+        
+    def attach_stats_store(self, db_manager):
+        """
+        Keep team statistics in the database of db_manager
+        
+        Stored statistics are used until a newer finished fixture of the team is
+        fetched, instead of being refetched when the memory cache expires.
+        """
+        self.stats_store = db_manager
+        
     def _initialize_cache(self):
         """Initialize different cache stores with different durations"""
         self.cache = {
@@ -33,52 +62,108 @@ class FootballAPI:
         if key in cache_store:
             data, timestamp = cache_store[key]
             if datetime.now() - timestamp < self.cache[cache_type]['duration']:
+                self.metrics.record_cache(cache_type, True)
                 return data
-            del cache_store[key]
+            # Another thread may have removed it already
+            cache_store.pop(key, None)
+        self.metrics.record_cache(cache_type, False)
         return None
 
     def _set_cache(self, key: str, data: Any, cache_type: str = 'short'):
         """Set data in cache with specified duration type"""
         self.cache[cache_type]['data'][key] = (data, datetime.now())
+        
+    def stats(self) -> Dict[str, Any]:
+        """Get the request counters and the request budget, see ApiMetrics.stats"""
+        return dict(self.metrics.stats(), budget=self.rate_limits.get_budget())
 
+    def expire_league(self, league_id, kinds: Iterable[str] = ('standings', 'fixtures')):
+        """
+        Drop cached standings and/or fixtures of a league, so the next fetch requests them again
+        
+        Args:
+            league_id: League to expire
+            kinds: "standings" and/or "fixtures"
+        """
+        keys = set()
+        prefixes = []
+        urls = []
+        if 'standings' in kinds:
+            keys.add(f'standings_{league_id}')
+            urls.append(f"{self.base_url}/standings")
+        if 'fixtures' in kinds:
+            prefixes.extend([f'fixtures_{league_id}_', f'next_fixtures_{league_id}_'])
+            urls.append(f"{self.base_url}/fixtures")
+            
+        for cache_type in self.cache:
+            cache_store = self.cache[cache_type]['data']
+            for key in list(cache_store):
+                if key in keys or key.startswith(tuple(prefixes)):
+                    cache_store.pop(key, None)
+                    continue
+                    
+                # Raw responses are cached by url and params, see _batch_request
+                url, separator, params = key.partition('_{')
+                if separator and url in urls:
+                    try:
+                        if str(json.loads('{' + params).get('league')) == str(league_id):
+                            cache_store.pop(key, None)
+                    except ValueError:
+                        continue
+                        
     def _batch_request(self, url: str, params_list: list) -> Dict:
         """Make batch requests and handle rate limiting and interruptions"""
         results = {}
-        for params in params_list:
+        
+        # Requests answered with 429 are retried after a backoff, the others go ahead meanwhile
+        queue = RetryQueue(params_list)
+        while queue:
+            params, attempt = queue.pop()
             cache_key = f"{url}_{json.dumps(params, sort_keys=True)}"
             cached_data = self._get_from_cache(cache_key)
             
             if cached_data:
                 results[json.dumps(params)] = cached_data
                 continue
-
+                
+            if not self.rate_limits.can_request():
+                logger.warning(f"Daily request budget used up, skipping {len(queue) + 1} requests to {url}")
+                return results
+                
             try:
+                # Wait for the rate limiter, it is shared by all threads
+                self.rate_limiter.acquire()
+                start = time.perf_counter()
+                
                 # Set a timeout for the request to prevent hanging
                 response = requests.get(url, headers=self.headers, params=params, timeout=10)
+                self.metrics.record_request(get_endpoint(url), response.status_code, time.perf_counter() - start,
+                                            len(response.content), params.get('league'))
+                self.rate_limits.update(response.headers)
+                
                 if response.status_code == 200:
                     data = response.json()
                     self._set_cache(cache_key, data)
                     results[json.dumps(params)] = data
                 elif response.status_code == 429:  # Rate limit
-                    logger.warning(f"Rate limit hit for {url} with params {params}")
-                    time.sleep(2)  # Reduced wait time to avoid long pauses
-                    try:
-                        response = requests.get(url, headers=self.headers, params=params, timeout=10)
-                        if response.status_code == 200:
-                            data = response.json()
-                            self._set_cache(cache_key, data)
-                            results[json.dumps(params)] = data
-                    except Exception as retry_e:
-                        logger.error(f"Error in retry request: {str(retry_e)}")
+                    if attempt < RETRY_ATTEMPTS:
+                        delay = self.rate_limits.retry_delay(attempt, response.headers)
+                        logger.warning(f"Rate limit hit for {url} with params {params}, retrying in {delay:.1f} s")
+                        self.metrics.record_retry(get_endpoint(url))
+                        queue.retry(params, attempt, delay)
+                    else:
+                        logger.warning(f"Rate limit hit for {url} with params {params}, giving up")
                 else:
                     logger.warning(f"Request failed with status {response.status_code} for {url} with params {params}")
-                
-                time.sleep(0.2)  # Small delay between requests
             except requests.exceptions.Timeout:
                 logger.warning(f"Request timeout for {url} with params {params}")
+                self.metrics.record_request(get_endpoint(url), ERROR_STATUS, time.perf_counter() - start,
+                                            league=params.get('league'))
                 continue
             except requests.exceptions.ConnectionError:
                 logger.warning(f"Connection error for {url} with params {params}")
+                self.metrics.record_request(get_endpoint(url), ERROR_STATUS, time.perf_counter() - start,
+                                            league=params.get('league'))
                 continue
             except KeyboardInterrupt:
                 logger.warning("Request interrupted by user")
@@ -89,7 +174,7 @@ class FootballAPI:
                 continue
                 
         return results
-    
+        
     def fetch_all_teams(self, league_names, matches_count=3):
         """
         Fetch all teams across all leagues with form analysis
@@ -292,19 +377,23 @@ class FootballAPI:
 
         url = f"{self.base_url}/standings"
         if league_id == ALL_LEAGUES:
-            # Batch request for all leagues
-            params_list = [
-                {"league": lid, "season": 2024}
-                for lid in LEAGUE_NAMES.keys()
-                if isinstance(lid, int) and lid != ALL_LEAGUES
-            ]
+            # Leagues fetched on their own, e.g. by auto refresh, need no request
+            all_standings = {}
+            params_list = []
+            for lid in LEAGUE_NAMES.keys():
+                if not isinstance(lid, int) or lid == ALL_LEAGUES:
+                    continue
+                league_standings = self._get_from_cache(f'standings_{lid}', 'medium')
+                if league_standings:
+                    all_standings[lid] = league_standings
+                else:
+                    params_list.append({"league": lid, "season": 2024})
             
             # Log the leagues being requested
             logger.info(f"Fetching standings for {len(params_list)} leagues")
             
             results = self._batch_request(url, params_list)
             
-            all_standings = {}
             for params_str, data in results.items():
                 params = json.loads(params_str)
                 league_id = int(params['league'])  # Ensure league_id is an integer
@@ -338,6 +427,7 @@ class FootballAPI:
             params = {'id': fixture_id}
             results = self._batch_request(url, [params])
             data = results.get(json.dumps(params), {}).get('response', [])
+            self._invalidate_team_statistics(data)
             self._set_cache(cache_key, data, cache_type)
             return data
 
@@ -346,16 +436,21 @@ class FootballAPI:
             league_ids = [lid for lid in LEAGUE_NAMES.keys() 
                          if isinstance(lid, int) and lid != ALL_LEAGUES]
             
+            # Leagues fetched on their own, e.g. by auto refresh, need no request
+            all_fixtures = []
+            params_list = []
+            for lid in league_ids:
+                league_fixtures = self._get_from_cache(f'fixtures_{lid}_{team_id}_None', cache_type)
+                if league_fixtures:
+                    all_fixtures.extend(league_fixtures)
+                else:
+                    params_list.append({'league': lid, 'season': season, **({"team": team_id} if team_id else {})})
+                    
             # Log the leagues being requested
-            logger.info(f"Fetching fixtures for {len(league_ids)} leagues")
+            logger.info(f"Fetching fixtures for {len(params_list)} leagues")
             
-            params_list = [
-                {'league': lid, 'season': season, **({"team": team_id} if team_id else {})}
-                for lid in league_ids
-            ]
             results = self._batch_request(url, params_list)
             
-            all_fixtures = []
             for params_str, result in results.items():
                 if result and result.get('response'):
                     fixtures = result['response']
@@ -363,6 +458,7 @@ class FootballAPI:
                     params = json.loads(params_str)
                     logger.info(f"Received {len(fixtures)} fixtures for league {params['league']}")
                     
+            self._invalidate_team_statistics(all_fixtures)
             self._set_cache(cache_key, all_fixtures, cache_type)
             return all_fixtures
         
@@ -373,9 +469,43 @@ class FootballAPI:
         }
         results = self._batch_request(url, [params])
         data = results.get(json.dumps(params), {}).get('response', [])
+        self._invalidate_team_statistics(data)
         self._set_cache(cache_key, data, cache_type)
         return data
 
+    def fetch_fixture(self, fixture_id) -> Optional[Dict]:
+        """Fetch a single fixture by its id, None if it was not found"""
+        data = self.fetch_fixtures(None, fixture_id=fixture_id)
+        return data[0] if data else None
+        
+    def fetch_fixtures_by_ids(self, fixture_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Fetch many fixtures by id, up to FIXTURE_IDS_PER_REQUEST per request
+        
+        Returns:
+            dict: Fixtures by id, fixtures that were not found are missing
+        """
+        unique_ids = list(dict.fromkeys(fixture_ids))
+        if not unique_ids:
+            return {}
+            
+        url = f"{self.base_url}/fixtures"
+        params_list = [
+            {'ids': '-'.join(str(fixture_id) for fixture_id in unique_ids[i:i + FIXTURE_IDS_PER_REQUEST])}
+            for i in range(0, len(unique_ids), FIXTURE_IDS_PER_REQUEST)
+        ]
+        results = self._batch_request(url, params_list)
+        
+        fixtures = {}
+        for result in results.values():
+            for fixture in (result or {}).get('response', []):
+                fixtures[fixture['fixture']['id']] = fixture
+                
+        self._invalidate_team_statistics(list(fixtures.values()))
+        
+        logger.info(f"Fetched {len(fixtures)} of {len(unique_ids)} fixtures in {len(params_list)} requests")
+        return fixtures
+        
     def fetch_team_statistics(self, league_id, team_id, season='2024'):
         """Optimized team statistics fetch with null safety"""
         cache_key = f'team_stats_{league_id}_{team_id}'
@@ -383,6 +513,12 @@ class FootballAPI:
         if cached_data:
             return cached_data
             
+        stored = self._get_stored_statistics(league_id, team_id, season)
+        if stored:
+            self._set_cache(cache_key, stored, 'medium')
+            return stored
+            
+        fetched_at = time.time()
         url = f"{self.base_url}/teams/statistics"
         params = {
             'league': league_id,
@@ -413,12 +549,168 @@ class FootballAPI:
             }
             
             self._set_cache(cache_key, stats, 'medium')
+            self._store_statistics(league_id, team_id, season, stats, fetched_at)
             return stats
             
         except Exception as e:
             self.logger.error(f"Error fetching team statistics for {team_id}: {str(e)}")
             return {}
 
+    def _get_stored_statistics(self, league_id, team_id, season) -> Optional[Dict]:
+        """Get team statistics from the statistics store, None if there are none"""
+        if self.stats_store is None:
+            return None
+            
+        try:
+            stored = self.stats_store.get_team_statistics(league_id, int(season), team_id)
+        except Exception as e:
+            self.logger.error(f"Error reading stored statistics for {team_id}: {str(e)}")
+            return None
+            
+        if stored is None:
+            return None
+            
+        self.logger.debug(f"Using stored statistics for team {team_id} (fixture {stored['last_fixture_id']})")
+        return stored['stats']
+        
+    def _store_statistics(self, league_id, team_id, season, stats: Dict, fetched_at: float):
+        """Queue team statistics for the statistics store, the version is looked up when writing"""
+        if self.stats_store is None:
+            return
+            
+        try:
+            self.stats_store.writer.submit(
+                "save_team_statistics", league_id, int(season), team_id, stats, updated_at=fetched_at
+            )
+        except Exception as e:
+            self.logger.error(f"Error storing statistics for {team_id}: {str(e)}")
+            
+    def _invalidate_team_statistics(self, fixtures: List[Dict]):
+        """Drop cached and stored statistics of teams with a newer finished fixture"""
+        for fixture in fixtures:
+            try:
+                if fixture['fixture']['status']['short'] not in FINISHED_STATUSES:
+                    continue
+                    
+                kickoff = get_fixture_timestamp(fixture)
+                if kickoff is None:
+                    continue
+                match_end = datetime.fromtimestamp(kickoff + MATCH_DURATION)
+                
+                # Statistics cached before the match ended do not include it
+                stats_cache = self.cache['medium']['data']
+                for side in ('home', 'away'):
+                    cache_key = f"team_stats_{fixture['league']['id']}_{fixture['teams'][side]['id']}"
+                    cached = stats_cache.get(cache_key)
+                    if cached and cached[1] < match_end:
+                        stats_cache.pop(cache_key, None)
+                        
+            except Exception as e:
+                self.logger.error(f"Error checking fixture for finished matches: {str(e)}")
+                
+        if self.stats_store is None:
+            return
+            
+        # Stored rows are compared with their version while writing, so queued
+        # statistics saves before this one are checked too
+        try:
+            if any(fixture.get('fixture', {}).get('status', {}).get('short') in FINISHED_STATUSES
+                   for fixture in fixtures):
+                self.stats_store.writer.submit("invalidate_team_statistics", fixtures)
+        except Exception as e:
+            self.logger.error(f"Error invalidating stored statistics: {str(e)}")
+            
+    def prefetch_team_statistics(self, pairs: Iterable[Tuple[int, int]], season='2024',
+                                 max_workers: int = PREFETCH_WORKERS,
+                                 cancelled: Optional[Callable[[], bool]] = None) -> Dict[Tuple[int, int], Dict]:
+        """
+        Fetch team statistics for many teams concurrently
+        
+        Requests go through the shared rate limiter and results land in the statistics
+        cache, so later fetch_team_statistics calls for these teams are cache hits.
+        
+        Args:
+            pairs: (league_id, team_id) pairs, duplicates are fetched once
+            season: Season of the statistics
+            max_workers: Number of concurrent requests
+            cancelled: Checked while waiting, stops early when it returns True
+            
+        Returns:
+            dict: Statistics by (league_id, team_id), {} for teams that failed
+        """
+        unique_pairs = list(dict.fromkeys(pairs))
+        results = {}
+        
+        # Cached teams need no request
+        missing = []
+        for league_id, team_id in unique_pairs:
+            cached_data = self._get_from_cache(f'team_stats_{league_id}_{team_id}', 'medium')
+            if cached_data:
+                results[(league_id, team_id)] = cached_data
+            else:
+                missing.append((league_id, team_id))
+                
+        if not missing:
+            return results
+            
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Prefetch")
+        try:
+            futures = {
+                executor.submit(self.fetch_team_statistics, league_id, team_id, season): (league_id, team_id)
+                for league_id, team_id in missing
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if cancelled and cancelled():
+                    self.logger.info("Team statistics prefetch cancelled")
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+        self.logger.info(f"Prefetched statistics for {len(missing)} teams ({len(unique_pairs) - len(missing)} cached)")
+        return results
+        
+    def fetch_match_odds(self, fixture_id) -> Dict[str, str]:
+        """
+        Fetch the home, draw and away odds of a fixture, cached for a short time
+        
+        Returns:
+            dict: Odds as strings by "home", "draw" and "away", "0" where none are offered
+        """
+        cache_key = f'odds_{fixture_id}'
+        cached_data = self._get_from_cache(cache_key, 'short')
+        if cached_data:
+            return cached_data
+            
+        url = f"{self.base_url}/odds"
+        params = {"fixture": fixture_id, "bookmaker": ODDS_BOOKMAKER}
+        no_odds = {'home': '0', 'draw': '0', 'away': '0'}
+        
+        try:
+            results = self._batch_request(url, [params])
+            data = results.get(json.dumps(params)) or {}
+            
+            response = data.get('response') or [{}]
+            bookmakers = response[0].get('bookmakers') or [{}]
+            bets = bookmakers[0].get('bets') or [{}]
+            values = bets[0].get('values') or []
+            if len(values) < 3:
+                self.logger.warning(f"No odds found for fixture {fixture_id}")
+                return no_odds
+                
+            odds = {
+                'home': values[0].get('odd', '0'),
+                'draw': values[1].get('odd', '0'),
+                'away': values[2].get('odd', '0')
+            }
+            self._set_cache(cache_key, odds, 'short')
+            return odds
+            
+        except Exception as e:
+            self.logger.error(f"Error fetching odds for fixture {fixture_id}: {str(e)}")
+            
+        return no_odds
+        
     def fetch_next_fixtures(self, league_id, season='2024'):
         """Fetch next round of fixtures for a league with short-term caching"""
         cache_key = f'next_fixtures_{league_id}_{season}'
@@ -0,0 +1,341 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Any, Optional, List, Callable
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Seconds between two summaries in the log, 0 turns them off
+METRICS_LOG_INTERVAL = float(os.getenv('API_METRICS_LOG_INTERVAL', '300'))
+
+# Number of slowest leagues listed in the log summary
+SLOW_LEAGUES_LOGGED = 5
+
+# Prefix of the Prometheus metric names
+METRICS_PREFIX = "football_api"
+
+# Status recorded for requests that got no response, e.g. on a timeout
+ERROR_STATUS = "error"
+
+# Seconds between two snapshots of the counters written to the metrics store
+METRICS_PUBLISH_INTERVAL = float(os.getenv('API_METRICS_PUBLISH_INTERVAL', '15'))
+
+# Snapshots of processes that published nothing for this long are left out, e.g. of exited workers
+METRICS_MAX_AGE = 60 * 60
+
+def get_endpoint(url: str) -> str:
+    """Get the API path of a request URL, e.g. /fixtures"""
+    return urlparse(url).path.rstrip("/") or "/"
+
+class ApiMetrics:
+    """
+    Counters of the requests an API client makes
+    
+    Per endpoint it counts requests by status, bytes received, 429 responses and
+    retries and keeps a latency histogram. Cache lookups are counted per cache
+    tier and the request time per league, to find the leagues that make a
+    refresh slow. The counters are read with stats(), summarized in the log every
+    log_interval seconds and exported for Prometheus with to_prometheus().
+    
+    Counters are per process. With a store (see SharedCache.set_metrics) every
+    process publishes a snapshot of its counters at most every publish_interval
+    seconds, and to_prometheus() exports the snapshots of all processes sharing
+    the store, e.g. of every gunicorn worker and of the cache warmer running in
+    one of them, each labelled with its role and pid.
+    """
+    
+    def __init__(self, log_interval: float = METRICS_LOG_INTERVAL, store=None, role: str = "worker",
+                 get_budget: Optional[Callable[[], Dict[str, Any]]] = None,
+                 publish_interval: float = METRICS_PUBLISH_INTERVAL):
+        """
+        Args:
+            log_interval: Seconds between two summaries in the log, 0 turns them off
+            store: Store shared by processes, with set_metrics and get_metrics
+            role: Role of the process in the exported labels, e.g. worker or cache_warmer
+            get_budget: Returns the request budget of the client, see RateLimitManager.get_budget
+            publish_interval: Minimum seconds between two snapshots written to the store
+        """
+        self.log_interval = log_interval
+        self.store = store
+        self.role = role
+        self.get_budget = get_budget
+        self.publish_interval = publish_interval
+        self._lock = threading.Lock()
+        self._last_published = 0.0
+        self.reset()
+        
+    def reset(self):
+        """Set all counters to zero"""
+        with self._lock:
+            self.started_at = time.time()
+            self._endpoints = {}
+            self._cache = {}
+            self._leagues = {}
+            self._last_logged = time.monotonic()
+            self._interval_requests = 0
+            
+    def record_request(self, endpoint: str, status: Any, seconds: float, size: int = 0,
+                       league: Optional[Any] = None):
+        """
+        Record a request made to the API
+        
+        Args:
+            endpoint: API path, see get_endpoint
+            status: HTTP status of the response, ERROR_STATUS if there was none
+            seconds: Time until the response was read
+            size: Bytes received
+            league: League the request was for, if any
+        """
+        with self._lock:
+            counters = self._endpoints.get(endpoint)
+            if counters is None:
+                counters = {"statuses": {}, "bytes": 0, "seconds": 0.0, "retries": 0,
+                            "buckets": [0] * (len(LATENCY_BUCKETS) + 1)}
+                self._endpoints[endpoint] = counters
+                
+            status = str(status)
+            counters["statuses"][status] = counters["statuses"].get(status, 0) + 1
+            counters["bytes"] += size
+            counters["seconds"] += seconds
+            counters["buckets"][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            
+            if league is not None:
+                league_counters = self._leagues.setdefault(str(league), {"requests": 0, "seconds": 0.0})
+                league_counters["requests"] += 1
+                league_counters["seconds"] += seconds
+                
+            self._interval_requests += 1
+            
+        self.log_summary()
+        self.publish()
+        
+    def record_retry(self, endpoint: str):
+        """Record that a request answered with 429 is retried"""
+        with self._lock:
+            counters = self._endpoints.get(endpoint)
+            if counters is not None:
+                counters["retries"] += 1
+                
+    def record_cache(self, tier: str, hit: bool):
+        """Record a cache lookup in a cache tier, e.g. short, medium or long"""
+        with self._lock:
+            counters = self._cache.setdefault(tier, {"hits": 0, "misses": 0})
+            counters["hits" if hit else "misses"] += 1
+            
+        self.publish()
+            
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get a copy of the counters
+        
+        Returns:
+            dict: "endpoints" with requests, statuses, errors, rate_limited, retries,
+                bytes, seconds, mean_seconds and the latency histogram per endpoint,
+                "cache" with hits, misses and hit_rate per tier, "leagues" with
+                requests and seconds per league and the totals of all endpoints
+        """
+        with self._lock:
+            endpoints = {}
+            for endpoint, counters in self._endpoints.items():
+                requests = sum(counters["statuses"].values())
+                endpoints[endpoint] = {
+                    "requests": requests,
+                    "statuses": dict(counters["statuses"]),
+                    "errors": counters["statuses"].get(ERROR_STATUS, 0),
+                    "rate_limited": counters["statuses"].get("429", 0),
+                    "retries": counters["retries"],
+                    "bytes": counters["bytes"],
+                    "seconds": counters["seconds"],
+                    "mean_seconds": counters["seconds"] / requests if requests else 0.0,
+                    "histogram": dict(zip([*LATENCY_BUCKETS, float("inf")], counters["buckets"]))
+                }
+                
+            cache = {}
+            for tier, counters in self._cache.items():
+                lookups = counters["hits"] + counters["misses"]
+                cache[tier] = dict(counters, hit_rate=counters["hits"] / lookups if lookups else 0.0)
+                
+            leagues = {league: dict(counters) for league, counters in self._leagues.items()}
+            started_at = self.started_at
+            
+        return {
+            "started_at": started_at,
+            "requests": sum(counters["requests"] for counters in endpoints.values()),
+            "errors": sum(counters["errors"] for counters in endpoints.values()),
+            "rate_limited": sum(counters["rate_limited"] for counters in endpoints.values()),
+            "retries": sum(counters["retries"] for counters in endpoints.values()),
+            "bytes": sum(counters["bytes"] for counters in endpoints.values()),
+            "endpoints": endpoints,
+            "cache": cache,
+            "leagues": leagues
+        }
+        
+    def get_slowest_leagues(self, count: int = SLOW_LEAGUES_LOGGED) -> List[tuple]:
+        """Get the (league, seconds, requests) of the leagues with the most request time"""
+        with self._lock:
+            leagues = [(league, counters["seconds"], counters["requests"])
+                       for league, counters in self._leagues.items()]
+        return sorted(leagues, key=lambda league: league[1], reverse=True)[:count]
+        
+    def format_summary(self) -> str:
+        """Describe the counters in one line"""
+        stats = self.stats()
+        parts = [f"{stats['requests']} requests", f"{stats['bytes'] / 1e6:.1f} MB",
+                 f"{stats['rate_limited']} rate limited", f"{stats['retries']} retries", f"{stats['errors']} errors"]
+                 
+        for endpoint, counters in sorted(stats["endpoints"].items()):
+            parts.append(f"{endpoint} {counters['requests']}x {counters['mean_seconds'] * 1000:.0f} ms")
+            
+        for tier, counters in sorted(stats["cache"].items()):
+            parts.append(f"cache {tier} {counters['hit_rate']:.0%} hits")
+            
+        slowest = self.get_slowest_leagues()
+        if slowest:
+            parts.append("slowest leagues " + " ".join(f"{league} ({seconds:.1f} s)" for league, seconds, _ in slowest))
+            
+        return ", ".join(parts)
+        
+    def log_summary(self, force: bool = False):
+        """Log the summary when log_interval passed and requests were made since the last one"""
+        with self._lock:
+            due = force or (self.log_interval > 0 and self._interval_requests
+                            and time.monotonic() - self._last_logged >= self.log_interval)
+            if not due:
+                return
+            self._last_logged = time.monotonic()
+            self._interval_requests = 0
+            
+        logger.info(f"API requests: {self.format_summary()}")
+        
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the counters and the request budget of this process, labelled with its role and pid"""
+        return {
+            "role": self.role,
+            "pid": os.getpid(),
+            "updated_at": time.time(),
+            "stats": self.stats(),
+            "budget": self.get_budget() if self.get_budget else None
+        }
+        
+    def publish(self, force: bool = False):
+        """Write a snapshot to the store when publish_interval passed since the last one"""
+        if self.store is None:
+            return
+            
+        with self._lock:
+            if not force and time.monotonic() - self._last_published < self.publish_interval:
+                return
+            self._last_published = time.monotonic()
+            
+        snapshot = self.snapshot()
+        self.store.set_metrics(f"{snapshot['role']}-{snapshot['pid']}", snapshot)
+        
+    def collect(self) -> List[Dict[str, Any]]:
+        """Get the snapshots of all processes sharing the store, this one's is current"""
+        if self.store is None:
+            return [self.snapshot()]
+            
+        self.publish(force=True)
+        return self.store.get_metrics(METRICS_MAX_AGE)
+        
+    def to_prometheus(self, prefix: str = METRICS_PREFIX) -> str:
+        """
+        Export the counters of all processes sharing the store in the Prometheus text format
+        
+        Returns:
+            str: The metrics, served as text/plain; version=0.0.4
+        """
+        return format_prometheus(self.collect(), prefix)
+
+def format_prometheus(snapshots: List[Dict[str, Any]], prefix: str = METRICS_PREFIX) -> str:
+    """
+    Format snapshots of ApiMetrics in the Prometheus text format
+    
+    Every series is labelled with the role and pid of its process, so counters of
+    different processes are never mixed and a restarted worker shows up as a new
+    series. The budget is the account's, it is taken from the latest response
+    seen by any process.
+    """
+    lines = []
+    
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for suffix, labels, value in samples:
+            label_text = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+            lines.append(f"{prefix}_{name}{suffix}{{{label_text}}} {value}" if label_text
+                         else f"{prefix}_{name}{suffix} {value}")
+                         
+    processes = []
+    for snapshot in sorted(snapshots, key=lambda snapshot: (snapshot["role"], snapshot["pid"])):
+        process = {"process": snapshot["role"], "pid": snapshot["pid"]}
+        processes.append((process, snapshot["stats"]))
+        
+    metric("requests_total", "counter", "API requests by endpoint and status", [
+        ("", dict(process, endpoint=endpoint, status=status), count)
+        for process, stats in processes
+        for endpoint, counters in sorted(stats["endpoints"].items())
+        for status, count in sorted(counters["statuses"].items())
+    ])
+    metric("retries_total", "counter", "Requests retried after a 429 response", [
+        ("", dict(process, endpoint=endpoint), counters["retries"])
+        for process, stats in processes for endpoint, counters in sorted(stats["endpoints"].items())
+    ])
+    metric("response_bytes_total", "counter", "Bytes received from the API", [
+        ("", dict(process, endpoint=endpoint), counters["bytes"])
+        for process, stats in processes for endpoint, counters in sorted(stats["endpoints"].items())
+    ])
+    
+    latency_samples = []
+    for process, stats in processes:
+        for endpoint, counters in sorted(stats["endpoints"].items()):
+            labels = dict(process, endpoint=endpoint)
+            cumulative = 0
+            for bound, count in counters["histogram"].items():
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else str(bound)
+                latency_samples.append(("_bucket", dict(labels, le=le), cumulative))
+            latency_samples.append(("_sum", labels, counters["seconds"]))
+            latency_samples.append(("_count", labels, counters["requests"]))
+    metric("request_duration_seconds", "histogram", "Time until the API response was read", latency_samples)
+    
+    metric("cache_lookups_total", "counter", "Cache lookups by cache tier and result", [
+        ("", dict(process, tier=tier, result=result), counters[key])
+        for process, stats in processes
+        for tier, counters in sorted(stats["cache"].items())
+        for result, key in (("hit", "hits"), ("miss", "misses"))
+    ])
+    
+    metric("league_request_seconds_total", "counter", "Time spent on the requests of a league", [
+        ("", dict(process, league=league), counters["seconds"])
+        for process, stats in processes for league, counters in sorted(stats["leagues"].items())
+    ])
+    metric("league_requests_total", "counter", "Requests made for a league", [
+        ("", dict(process, league=league), counters["requests"])
+        for process, stats in processes for league, counters in sorted(stats["leagues"].items())
+    ])
+    
+    budgets = [snapshot["budget"] for snapshot in snapshots
+               if snapshot.get("budget") and snapshot["budget"].get("updated_at")]
+    if budgets:
+        budget = max(budgets, key=lambda budget: budget["updated_at"])
+        metric("budget_remaining", "gauge", "Requests left according to the last response", [
+            ("", {"period": period}, budget[f"{period}_remaining"])
+            for period in ("daily", "minute") if budget.get(f"{period}_remaining") is not None
+        ])
+        metric("budget_limit", "gauge", "Request limit according to the last response", [
+            ("", {"period": period}, budget[f"{period}_limit"])
+            for period in ("daily", "minute") if budget.get(f"{period}_limit") is not None
+        ])
+        
+    return "\n".join(lines) + "\n"
+
+def _escape_label(value: Any) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
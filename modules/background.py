@@ -0,0 +1,153 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+class BackgroundRunner:
+    """
+    Shared worker pool for blocking work started from the Tk main thread
+    
+    Work runs on a thread pool. Results are put on a thread-safe queue that the Tk
+    main loop drains with after(), so callbacks always run on the main thread.
+    Every task has a key. Starting a new task with the same key, or cancelling the key,
+    makes the results of older tasks stale and they are dropped without calling back.
+    """
+    
+    # Runner shared by the whole application, see shared()
+    _shared = None
+    
+    def __init__(self, root, max_workers: int = 4, poll_interval: int = 50):
+        self.root = root
+        self.poll_interval = poll_interval
+        
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Worker")
+        self._results = queue.Queue()
+        self._generations = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        
+        self.root.after(self.poll_interval, self._poll)
+        
+    @classmethod
+    def shared(cls, root) -> "BackgroundRunner":
+        """Get the application wide runner, created on first use on the main thread"""
+        if cls._shared is None:
+            cls._shared = cls(root)
+        return cls._shared
+        
+    def run(self, key: Any, func: Callable, *args, on_success: Optional[Callable] = None,
+            on_error: Optional[Callable] = None, **kwargs) -> Future:
+        """
+        Run func(*args, **kwargs) in a worker thread
+        
+        Args:
+            key: Task key, a newer task with the same key supersedes this one
+            func: Function to run, must not touch Tk widgets or variables
+            on_success: Called on the main thread with the return value
+            on_error: Called on the main thread with the exception
+            
+        Returns:
+            Future: The future of the task
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            
+            # A task that has not started yet is not needed anymore
+            previous = self._futures.get(key)
+            if previous is not None:
+                previous.cancel()
+                
+            future = self._executor.submit(self._call, key, generation, func, args, kwargs)
+            self._futures[key] = future
+            
+        future.add_done_callback(
+            lambda f: self._results.put(("result", (key, generation, f, on_success, on_error)))
+        )
+        
+        return future
+        
+    def cancel(self, key: Any):
+        """Cancel the task with the given key and drop its result"""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            future = self._futures.pop(key, None)
+            
+        if future is not None:
+            future.cancel()
+            
+    def is_current(self, key: Any, generation: int) -> bool:
+        """Check if a task generation is still the newest one for its key"""
+        with self._lock:
+            return self._generations.get(key) == generation
+            
+    def task_cancelled(self) -> bool:
+        """Check from inside a running task if it was cancelled or superseded
+        
+        Long running tasks can call this between steps and stop early.
+        """
+        task = getattr(self._local, "task", None)
+        return task is not None and not self.is_current(*task)
+        
+    def _call(self, key: Any, generation: int, func: Callable, args: tuple, kwargs: Dict[str, Any]):
+        """Run a task in a worker thread, remembering which task the thread runs"""
+        self._local.task = (key, generation)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._local.task = None
+            
+    def post(self, callback: Callable, *args):
+        """Run a callback on the main thread, safe to call from any thread"""
+        self._results.put(("post", (callback, args)))
+        
+    def shutdown(self):
+        """Stop the worker threads, running tasks are finished first"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        
+    def _poll(self):
+        """Deliver finished results on the main thread"""
+        try:
+            while True:
+                try:
+                    kind, item = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                    
+                # Callbacks posted from other threads
+                if kind == "post":
+                    callback, args = item
+                    try:
+                        callback(*args)
+                    except Exception as e:
+                        logger.error(f"Error in posted callback: {str(e)}")
+                    continue
+                    
+                key, generation, future, on_success, on_error = item
+                
+                with self._lock:
+                    current = self._generations.get(key) == generation
+                    if current and self._futures.get(key) is future:
+                        del self._futures[key]
+                        
+                if not current or future.cancelled():
+                    logger.debug(f"Dropping stale result of {key}")
+                    continue
+                    
+                try:
+                    error = future.exception()
+                    if error is not None:
+                        if on_error:
+                            on_error(error)
+                        else:
+                            logger.error(f"Error in background task {key}: {str(error)}")
+                    elif on_success:
+                        on_success(future.result())
+                except Exception as e:
+                    logger.error(f"Error handling result of {key}: {str(e)}")
+        finally:
+            self.root.after(self.poll_interval, self._poll)
@@ -0,0 +1,239 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+# The Agg canvas renders without a GUI, so charts can be drawn in worker threads
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Number of rendered chart images kept, one image is about width * height * 4 bytes
+CHART_CACHE_SIZE = 16
+
+# Size used before the chart widget has been drawn
+DEFAULT_CHART_SIZE = (1000, 600)
+
+class ChartRenderer:
+    """
+    Renders charts to images with the Agg backend
+    
+    Every slot (one chart on screen) keeps its own figure. Bar charts with the same
+    labels reuse their bars and value labels and only update sizes and texts, so
+    switching between stats does not rebuild the figure. Rendered images are cached
+    by slot, chart spec and size, so showing a chart again costs nothing.
+    
+    A chart spec is a dict with "type" ("barh", "bar", "pie" or "message") and the
+    chart data, e.g. {"type": "barh", "labels": [...], "values": [...], "title": "..."}.
+    
+    render() can run in a worker thread. The returned PIL image has to be turned into
+    a PhotoImage on the main thread, see to_photo_image.
+    """
+    
+    def __init__(self, cache_size: int = CHART_CACHE_SIZE, dpi: int = 100):
+        self.cache_size = cache_size
+        self.dpi = dpi
+        
+        self._slots = {}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def get_cached(self, slot: str, spec: Dict[str, Any], size: Tuple[int, int]) -> Optional[Image.Image]:
+        """Get a rendered chart from the cache, None if it has not been rendered yet"""
+        key = _cache_key(slot, spec, size)
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+            return image
+            
+    def render(self, slot: str, spec: Dict[str, Any], size: Tuple[int, int]) -> Image.Image:
+        """
+        Render a chart to an image, using the cache when possible
+        
+        Args:
+            slot: Name of the chart on screen, each slot keeps its own figure
+            spec: Chart spec
+            size: Image size in pixels (width, height)
+            
+        Returns:
+            PIL.Image.Image: The rendered chart
+        """
+        key = _cache_key(slot, spec, size)
+        
+        # One lock for all slots, Agg rendering is CPU bound and matplotlib text
+        # layout is not safe to run for several figures at once
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+                return image
+                
+            image = self._draw(slot, spec, size)
+            
+            self._cache[key] = image
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                
+            return image
+            
+    def clear_cache(self, slot: Optional[str] = None):
+        """Drop cached images, of one slot or of all slots"""
+        with self._lock:
+            if slot is None:
+                self._cache.clear()
+            else:
+                for key in [key for key in self._cache if key[0] == slot]:
+                    del self._cache[key]
+                    
+    def _get_slot(self, slot: str, size: Tuple[int, int]) -> Dict[str, Any]:
+        """Get the figure of a slot, creating it on first use"""
+        state = self._slots.get(slot)
+        if state is None:
+            figure = Figure(figsize=(size[0] / self.dpi, size[1] / self.dpi), dpi=self.dpi)
+            state = {
+                "figure": figure,
+                "canvas": FigureCanvasAgg(figure),
+                "ax": figure.add_subplot(111),
+                "kind": None,
+                "labels": None,
+                "bars": None,
+                "texts": [],
+                "size": None
+            }
+            self._slots[slot] = state
+        return state
+        
+    def _draw(self, slot: str, spec: Dict[str, Any], size: Tuple[int, int]) -> Image.Image:
+        """Draw a chart into the figure of its slot and copy out the pixels"""
+        state = self._get_slot(slot, size)
+        figure = state["figure"]
+        ax = state["ax"]
+        kind = spec.get("type", "message")
+        
+        relayout = state["size"] != size
+        if relayout:
+            figure.set_size_inches(size[0] / self.dpi, size[1] / self.dpi)
+            state["size"] = size
+            
+        labels = list(spec.get("labels", []))
+        
+        if kind in ("bar", "barh") and labels and state["kind"] == kind and state["labels"] == labels:
+            # Same bars as last time, only update their sizes
+            self._update_bars(state, spec)
+        else:
+            ax.clear()
+            state["bars"] = None
+            state["texts"] = []
+            
+            if kind in ("bar", "barh") and labels:
+                self._create_bars(state, spec)
+            elif kind == "pie" and sum(spec.get("values", [])) > 0:
+                ax.pie(
+                    spec["values"],
+                    labels=labels,
+                    autopct='%1.1f%%',
+                    startangle=90,
+                    colors=spec.get("colors")
+                )
+                ax.axis('equal')
+            else:
+                ax.text(0.5, 0.5, spec.get("text", "No data available"), ha='center', va='center')
+                ax.axis('off')
+                
+            state["kind"] = kind
+            state["labels"] = labels
+            relayout = True
+            
+        ax.set_title(spec.get("title", ""))
+        
+        # Layout only changes when the figure was rebuilt or resized
+        if relayout:
+            figure.tight_layout()
+            
+        canvas = state["canvas"]
+        canvas.draw()
+        width, height = canvas.get_width_height()
+        return Image.frombuffer("RGBA", (width, height), bytes(canvas.buffer_rgba()), "raw", "RGBA", 0, 1)
+        
+    def _create_bars(self, state: Dict[str, Any], spec: Dict[str, Any]):
+        """Create the bars and value labels of a bar chart"""
+        ax = state["ax"]
+        labels = spec["labels"]
+        values = spec["values"]
+        horizontal = spec["type"] == "barh"
+        
+        if horizontal:
+            bars = ax.barh(labels, values, color=spec.get("color", "blue"))
+        else:
+            bars = ax.bar(labels, values, color=spec.get("color", "blue"))
+            
+        texts = []
+        if spec.get("value_labels", True):
+            for bar in bars:
+                if horizontal:
+                    texts.append(ax.text(0, bar.get_y() + bar.get_height() / 2, "", ha='left', va='center'))
+                else:
+                    texts.append(ax.text(bar.get_x() + bar.get_width() / 2, 0, "", ha='center', va='bottom'))
+                    
+        ax.set_xlabel(spec.get("xlabel", ""))
+        ax.set_ylabel(spec.get("ylabel", ""))
+        
+        state["bars"] = bars
+        state["texts"] = texts
+        self._update_bars(state, spec)
+        
+    def _update_bars(self, state: Dict[str, Any], spec: Dict[str, Any]):
+        """Set bar sizes, colors and value labels of an existing bar chart"""
+        ax = state["ax"]
+        values = spec["values"]
+        horizontal = spec["type"] == "barh"
+        value_texts = spec.get("value_texts") or [f"{value}" for value in values]
+        color = spec.get("color", "blue")
+        
+        for bar, value in zip(state["bars"], values):
+            if horizontal:
+                bar.set_width(value)
+            else:
+                bar.set_height(value)
+            bar.set_color(color)
+            
+        for text, bar, value, label in zip(state["texts"], state["bars"], values, value_texts):
+            if horizontal:
+                text.set_x(value + 0.5)
+            else:
+                text.set_y(value + 0.1)
+            text.set_text(label)
+            
+        # Leave room for the value labels
+        top = max(list(values) + [0]) * 1.1 + 1
+        if horizontal:
+            ax.set_xlim(0, top)
+        else:
+            ax.set_ylim(0, top)
+            
+        ax.set_xlabel(spec.get("xlabel", ""))
+        ax.set_ylabel(spec.get("ylabel", ""))
+
+def _cache_key(slot: str, spec: Dict[str, Any], size: Tuple[int, int]) -> tuple:
+    """Build a hashable cache key from a chart spec"""
+    items = []
+    for name in sorted(spec):
+        value = spec[name]
+        items.append((name, tuple(value) if isinstance(value, list) else value))
+    return (slot, tuple(size), tuple(items))
+
+def get_widget_size(widget, default: Tuple[int, int] = DEFAULT_CHART_SIZE) -> Tuple[int, int]:
+    """Get the size to render a chart for a widget, a default before it is drawn"""
+    width = widget.winfo_width()
+    height = widget.winfo_height()
+    if width <= 1 or height <= 1:
+        return default
+    return (width, height)
+
+def to_photo_image(image: Image.Image):
+    """Turn a rendered chart into a Tk image, must be called on the main thread"""
+    from PIL import ImageTk
+    return ImageTk.PhotoImage(image)
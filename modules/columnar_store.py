@@ -0,0 +1,407 @@
+import logging
+import os
+import shutil
+import sqlite3
+from typing import Dict, List, Any, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Supported file formats and their file extensions
+COLUMNAR_FORMATS = {
+    "parquet": ".parquet",
+    "arrow": ".arrow"
+}
+
+# Number of rows converted into one record batch
+BATCH_SIZE = 10000
+
+# Suffix of the directory an export is written to, it replaces the exported
+# directory when complete. The replaced directory is renamed with OLD_SUFFIX
+# until it is deleted
+TEMP_SUFFIX = ".tmp"
+OLD_SUFFIX = ".old"
+
+# Season of a date column: the year the season started in, seasons start in July
+SEASON_EXPR = "(CAST(substr({0}, 1, 4) AS INTEGER) - (CAST(substr({0}, 6, 2) AS INTEGER) < 7))"
+
+# Exportable tables: source query, date column used for the season and the columns
+# restored on import. Column types are given in _get_schema
+COLUMNAR_TABLES = {
+    "fixtures": {
+        "date_column": "match_date",
+        "columns": [
+            "id", "league_id", "home_team_id", "home_team_name", "away_team_id",
+            "away_team_name", "match_date", "match_time", "venue", "status",
+            "home_score", "away_score", "created_at"
+        ]
+    },
+    "standings": {
+        "date_column": "created_at",
+        "columns": [
+            "league_id", "team_id", "team_name", "position", "played", "won", "drawn",
+            "lost", "goals_for", "goals_against", "goal_diff", "points", "form", "created_at"
+        ]
+    },
+    "predictions": {
+        "date_column": "match_date",
+        "columns": [
+            "team_id", "team_name", "league_id", "league_name", "fixture_id", "opponent_id",
+            "opponent_name", "match_date", "venue", "performance_diff", "prediction",
+            "prediction_level", "result", "correct", "created_at"
+        ]
+    }
+}
+
+def is_available() -> bool:
+    """Check if pyarrow is installed"""
+    return pa is not None
+
+def _require_pyarrow():
+    """Raise an error if pyarrow is not installed"""
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Parquet/Arrow export, install it with 'pip install pyarrow'")
+
+def _get_schema(table: str, file_format: str = "parquet"):
+    """Get the Arrow schema of an exportable table"""
+    _require_pyarrow()
+    
+    # Repeated names are dictionary encoded in Parquet. An Arrow IPC file allows only
+    # one dictionary per column and every batch would bring its own, so plain strings
+    name = pa.dictionary(pa.int32(), pa.string()) if file_format == "parquet" else pa.string()
+    
+    schemas = {
+        "fixtures": [
+            ("id", pa.int64()),
+            ("league_id", pa.int32()),
+            ("home_team_id", pa.int64()),
+            ("home_team_name", name),
+            ("away_team_id", pa.int64()),
+            ("away_team_name", name),
+            ("match_date", pa.string()),
+            ("match_time", pa.string()),
+            ("venue", name),
+            ("status", name),
+            ("home_score", pa.int16()),
+            ("away_score", pa.int16()),
+            ("created_at", pa.string())
+        ],
+        "standings": [
+            ("league_id", pa.int32()),
+            ("team_id", pa.int64()),
+            ("team_name", name),
+            ("position", pa.int16()),
+            ("played", pa.int16()),
+            ("won", pa.int16()),
+            ("drawn", pa.int16()),
+            ("lost", pa.int16()),
+            ("goals_for", pa.int16()),
+            ("goals_against", pa.int16()),
+            ("goal_diff", pa.int16()),
+            ("points", pa.int16()),
+            ("form", pa.string()),
+            ("created_at", pa.string())
+        ],
+        "predictions": [
+            ("team_id", pa.int64()),
+            ("team_name", name),
+            ("league_id", pa.int32()),
+            ("league_name", name),
+            ("fixture_id", pa.int64()),
+            ("opponent_id", pa.int64()),
+            ("opponent_name", name),
+            ("match_date", pa.string()),
+            ("venue", name),
+            ("performance_diff", pa.float64()),
+            ("prediction", name),
+            ("prediction_level", pa.int8()),
+            ("result", name),
+            ("correct", pa.int8()),
+            ("created_at", pa.string())
+        ]
+    }
+    
+    return pa.schema(schemas[table] + [("season", pa.int16())])
+
+def _league_dir(root_dir: str, table: str, league_id: int) -> str:
+    """Get the directory of the partitions of one league"""
+    return os.path.join(root_dir, table, f"league_id={league_id}")
+
+def _partition_dir(root_dir: str, table: str, league_id: int, season: int) -> str:
+    """Get the directory of one league and season partition"""
+    return os.path.join(_league_dir(root_dir, table, league_id), f"season={season}")
+
+def _open_writer(file_path: str, schema, file_format: str):
+    """Open a Parquet or Arrow IPC file writer"""
+    if file_format == "parquet":
+        return pq.ParquetWriter(file_path, schema, compression="zstd")
+    return ipc.new_file(file_path, schema)
+
+def _replace_dir(source: str, target: str):
+    """Move a directory into place, replacing target with everything in it"""
+    old_dir = target + OLD_SUFFIX
+    shutil.rmtree(old_dir, ignore_errors=True)
+    
+    if os.path.exists(target):
+        os.replace(target, old_dir)
+    if os.path.exists(source):
+        os.replace(source, target)
+        
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+def export_table(db_path: str, table: str, root_dir: str, file_format: str = "parquet",
+                 league_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Export a table to Parquet or Arrow IPC files partitioned by league and season
+    
+    Rows are read in batches ordered by partition, so only one batch is held in memory.
+    Files are written to <root_dir>/<table>/league_id=<id>/season=<year>/data.<ext>.
+    The export is written to a temporary directory that replaces the table, or
+    with league_id the league, when it is complete. Partitions no longer in the
+    database and files of the other format are removed with it, and a failed
+    export leaves the previous one untouched.
+    
+    Args:
+        db_path: Path to the SQLite database
+        table: One of COLUMNAR_TABLES
+        root_dir: Root directory of the exported dataset
+        file_format: "parquet" or "arrow"
+        league_id: Only export one league
+        
+    Returns:
+        dict: {"rows": number of rows, "files": list of written files}
+    """
+    _require_pyarrow()
+    
+    if table not in COLUMNAR_TABLES:
+        raise ValueError(f"Table {table} can not be exported to {file_format}")
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported columnar format: {file_format}")
+        
+    schema = _get_schema(table, file_format)
+    columns = COLUMNAR_TABLES[table]["columns"]
+    season_expr = SEASON_EXPR.format(COLUMNAR_TABLES[table]["date_column"])
+    
+    query = f"SELECT {', '.join(columns)}, {season_expr} AS season FROM {table}"
+    params = []
+    if league_id is not None:
+        query += " WHERE league_id = ?"
+        params.append(league_id)
+    query += " ORDER BY league_id, season"
+    
+    # Written next to the table directory, so it can be moved into place
+    staging_table = f"{table}{TEMP_SUFFIX}"
+    staging_dir = os.path.join(root_dir, staging_table)
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+    
+    conn = sqlite3.connect(db_path)
+    writer = None
+    partition = None
+    files = []
+    count = 0
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        
+        league_index = columns.index("league_id")
+        
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+                
+            # Split the batch where the partition changes
+            start = 0
+            while start < len(rows):
+                key = (rows[start][league_index], rows[start][-1])
+                end = start
+                while end < len(rows) and (rows[end][league_index], rows[end][-1]) == key:
+                    end += 1
+                    
+                if key != partition:
+                    if writer is not None:
+                        writer.close()
+                        writer = None
+                        
+                    directory = _partition_dir(root_dir, staging_table, key[0], key[1])
+                    os.makedirs(directory)
+                    file_name = f"data{COLUMNAR_FORMATS[file_format]}"
+                    
+                    writer = _open_writer(os.path.join(directory, file_name), schema, file_format)
+                    files.append(os.path.join(_partition_dir(root_dir, table, key[0], key[1]), file_name))
+                    partition = key
+                    
+                # Build typed column arrays from the row tuples
+                chunk = rows[start:end]
+                arrays = [
+                    pa.array([row[i] for row in chunk], type=field.type)
+                    for i, field in enumerate(schema)
+                ]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                
+                count += end - start
+                start = end
+                
+        if writer is not None:
+            writer.close()
+            writer = None
+            
+        if league_id is None:
+            _replace_dir(staging_dir, os.path.join(root_dir, table))
+        else:
+            os.makedirs(os.path.join(root_dir, table), exist_ok=True)
+            _replace_dir(_league_dir(root_dir, staging_table, league_id), _league_dir(root_dir, table, league_id))
+            
+    finally:
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception as e:
+                logger.debug(f"Error closing partial {file_format} file: {str(e)}")
+        conn.close()
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        
+    logger.info(f"Exported {count} {table} rows to {len(files)} {file_format} files")
+    
+    return {"rows": count, "files": files}
+
+def _find_files(root_dir: str, table: str, league_id: Optional[int] = None,
+                season: Optional[int] = None, file_format: Optional[str] = None) -> List[str]:
+    """
+    Find the partition files of a table, skipping partitions that do not match
+    
+    Every partition contributes one file, of file_format if given. Without it the
+    newest file of any format is used, so rows are never read twice.
+    """
+    table_dir = os.path.join(root_dir, table)
+    if not os.path.isdir(table_dir):
+        return []
+        
+    if file_format is None:
+        extensions = set(COLUMNAR_FORMATS.values())
+    elif file_format in COLUMNAR_FORMATS:
+        extensions = {COLUMNAR_FORMATS[file_format]}
+    else:
+        raise ValueError(f"Unsupported columnar format: {file_format}")
+        
+    files = []
+    for league_dir in sorted(os.listdir(table_dir)):
+        # Directories of a league export in progress have a suffix
+        if os.path.splitext(league_dir)[1]:
+            continue
+        if league_id is not None and league_dir != f"league_id={league_id}":
+            continue
+        for season_dir in sorted(os.listdir(os.path.join(table_dir, league_dir))):
+            if season is not None and season_dir != f"season={season}":
+                continue
+            directory = os.path.join(table_dir, league_dir, season_dir)
+            candidates = [os.path.join(directory, file_name) for file_name in os.listdir(directory)
+                          if os.path.splitext(file_name)[1] in extensions]
+            if candidates:
+                files.append(max(candidates, key=os.path.getmtime))
+                
+    return files
+
+def _read_file(file_path: str, columns: Optional[List[str]] = None):
+    """Read a Parquet or Arrow IPC file using a memory map"""
+    if file_path.endswith(COLUMNAR_FORMATS["arrow"]):
+        # Arrow IPC buffers point straight into the mapped file
+        source = pa.memory_map(file_path, "r")
+        table = ipc.open_file(source).read_all()
+        return table.select(columns) if columns else table
+    return pq.read_table(file_path, columns=columns, memory_map=True)
+
+def load_table(root_dir: str, table: str, league_id: Optional[int] = None,
+               season: Optional[int] = None, columns: Optional[List[str]] = None,
+               as_pandas: bool = False, file_format: Optional[str] = None):
+    """
+    Load an exported table as one Arrow table
+    
+    Args:
+        root_dir: Root directory of the exported dataset
+        table: One of COLUMNAR_TABLES
+        league_id: Only load one league
+        season: Only load one season
+        columns: Only load these columns
+        as_pandas: Return a pandas DataFrame instead of an Arrow table
+        file_format: Only load "parquet" or "arrow" files, None the newest file of a partition
+        
+    Returns:
+        pyarrow.Table or pandas.DataFrame, None if nothing was exported
+    """
+    _require_pyarrow()
+    
+    files = _find_files(root_dir, table, league_id, season, file_format)
+    if not files:
+        return None
+        
+    tables = [_read_file(file_path, columns) for file_path in files]
+    
+    # Name columns are only dictionary encoded in Parquet, partitions exported in
+    # different formats are cast to the schema of the first one
+    schema = tables[0].schema
+    result = pa.concat_tables([table if table.schema.equals(schema) else table.cast(schema) for table in tables])
+    
+    if as_pandas:
+        # Numeric columns without nulls are converted without copying
+        return result.to_pandas(split_blocks=True)
+        
+    return result
+
+def import_table(db_path: str, table: str, root_dir: str, league_id: Optional[int] = None,
+                 season: Optional[int] = None, file_format: Optional[str] = None) -> int:
+    """
+    Import exported Parquet or Arrow IPC files back into the database
+    
+    Rows replace existing rows with the same key.
+    
+    Args:
+        db_path: Path to the SQLite database
+        table: One of COLUMNAR_TABLES
+        root_dir: Root directory of the exported dataset
+        league_id: Only import one league
+        season: Only import one season
+        file_format: Only import "parquet" or "arrow" files, None the newest file of a partition
+        
+    Returns:
+        int: Number of imported rows
+    """
+    _require_pyarrow()
+    
+    if table not in COLUMNAR_TABLES:
+        raise ValueError(f"Table {table} can not be imported")
+        
+    columns = COLUMNAR_TABLES[table]["columns"]
+    query = f'''
+        INSERT OR REPLACE INTO {table} ({', '.join(columns)})
+        VALUES ({', '.join('?' for _ in columns)})
+    '''
+    
+    conn = sqlite3.connect(db_path)
+    count = 0
+    
+    try:
+        cursor = conn.cursor()
+        
+        for file_path in _find_files(root_dir, table, league_id, season, file_format):
+            for batch in _read_file(file_path, columns).to_batches(BATCH_SIZE):
+                values = zip(*(column.to_pylist() for column in batch.columns))
+                cursor.executemany(query, values)
+                count += batch.num_rows
+                
+        conn.commit()
+        
+    finally:
+        conn.close()
+        
+    logger.info(f"Imported {count} {table} rows from {root_dir}")
+    
+    return count
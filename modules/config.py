@@ -2,6 +2,22 @@
 API_KEY = "2061b15078fc8e299dd268fb5a066f34"
 BASE_URL = "https://v3.football.api-sports.io"
 
+# API rate limit: requests per second and the number of requests allowed in a burst
+API_REQUESTS_PER_SECOND = 5
+API_BURST_SIZE = 5
+
+# Number of concurrent requests used to prefetch team statistics
+PREFETCH_WORKERS = 4
+
+# Short status codes of finished fixtures
+FINISHED_STATUSES = ('FT', 'AET', 'PEN')
+
+# Seconds after kickoff when a match is over and included in team statistics
+MATCH_DURATION = 2 * 60 * 60
+
+# Bookmaker whose match odds are requested (Bet365)
+ODDS_BOOKMAKER = "8"
+
 # Special value for all leagues
 ALL_LEAGUES = -1
 
@@ -69,6 +85,10 @@ DEFAULT_SETTINGS = {
     "threshold": PERF_DIFF_THRESHOLD,
     "auto_refresh": False,
     "refresh_interval": 30,
+    "warm_up_tabs": False,  # Build unopened tabs in the background after startup
+    "log_buffer_capacity": 5000,  # Log records kept for the logs tab
+    "log_to_file": False,  # Also write log records to a rotating log file
+    "log_file_path": "logs/football_stats.log",
     "leagues": [39],  # Premier League
     "prediction_threshold_level1": PREDICTION_THRESHOLD_LEVEL1,
     "prediction_threshold_level2": PREDICTION_THRESHOLD_LEVEL2,
@@ -1,16 +1,143 @@
 import sqlite3
 import logging
-import csv
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import atexit
+import threading
+import json
+import time
+from typing import Dict, List, Any, Optional, Callable
+from datetime import datetime, timezone
+
+from modules.exporter import iter_query, export_rows
+from modules import columnar_store
+from modules.db_writer import DatabaseWriter
+from modules.config import FINISHED_STATUSES, MATCH_DURATION
 
 logger = logging.getLogger(__name__)
 
+# Default number of rows returned by the paginated readers
+PAGE_SIZE = 200
+
+# Base queries for the paginated readers. Every query exposes the row id as "id"
+PAGE_QUERIES = {
+    "predictions": '''
+        SELECT p.*,
+               CASE WHEN p.result IS NULL THEN 'WAITING' ELSE 'COMPLETED' END AS status
+        FROM predictions p
+    ''',
+    "fixtures": '''
+        SELECT f.*, l.name as league_name
+        FROM fixtures f
+        LEFT JOIN (
+            SELECT id, name FROM teams
+        ) l ON f.league_id = l.id
+    ''',
+    "teams": '''
+        SELECT t.*, l.name as league_name
+        FROM teams t
+        LEFT JOIN (
+            SELECT id, name FROM teams
+        ) l ON t.league_id = l.id
+    '''
+}
+
+# Row id column of each paginated table, used as the keyset tie-breaker
+PAGE_ID_COLUMNS = {
+    "predictions": "p.id",
+    "fixtures": "f.id",
+    "teams": "t.id"
+}
+
+# Sortable columns of each paginated table mapped to their SQL sort expression
+PAGE_SORT_COLUMNS = {
+    "predictions": {
+        "id": "p.id",
+        "team_name": "p.team_name",
+        "league_name": "p.league_name",
+        "opponent_name": "p.opponent_name",
+        "match_date": "p.match_date",
+        "prediction": "p.prediction",
+        "performance_diff": "p.performance_diff",
+        "result": "COALESCE(p.result, '')"
+    },
+    "fixtures": {
+        "id": "f.id",
+        "league_name": "COALESCE(l.name, '')",
+        "home_team_name": "f.home_team_name",
+        "away_team_name": "f.away_team_name",
+        "match_date": "f.match_date",
+        "status": "COALESCE(f.status, '')"
+    },
+    "teams": {
+        "id": "t.id",
+        "name": "t.name",
+        "league_name": "COALESCE(l.name, '')",
+        "country": "COALESCE(t.country, '')"
+    }
+}
+
+# Queries for tables that are exported but not paginated
+EXPORT_QUERIES = {
+    "leagues": '''
+        SELECT DISTINCT league_id as id, league_name as name, '' as country, '' as logo, '' as season
+        FROM predictions
+        ORDER BY league_name
+    ''',
+    "form_changes": '''
+        SELECT
+            id,
+            team_id,
+            team_name,
+            league_id,
+            league_name,
+            match_date as date,
+            performance_diff,
+            fixture_id
+        FROM predictions
+        WHERE performance_diff > 0
+        ORDER BY performance_diff DESC
+    '''
+}
+
+# Long status names of finished fixtures, as stored in the fixtures table
+FINISHED_STATUS_NAMES = ('Match Finished', 'Match Finished After Extra Time', 'Match Finished After Penalty')
+
+def get_season(date: datetime) -> int:
+    """Get the season of a date: the year the season started in, seasons start in July"""
+    return date.year if date.month >= 7 else date.year - 1
+
+def get_fixture_timestamp(fixture: Dict[str, Any]) -> Optional[int]:
+    """Get the kickoff of an API fixture as unix timestamp, None if it is unknown"""
+    try:
+        timestamp = fixture['fixture'].get('timestamp')
+        if timestamp:
+            return int(timestamp)
+        return int(datetime.fromisoformat(fixture['fixture']['date']).timestamp())
+    except (KeyError, TypeError, ValueError):
+        return None
+
 class DatabaseManager:
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._writer = None
+        self._writer_lock = threading.Lock()
         self._initialize_db()
         
+    @property
+    def writer(self) -> DatabaseWriter:
+        """Background writer for save_* and update_prediction_result calls, started on first use
+        
+        Example:
+            future = db_manager.writer.submit("save_fixtures", fixtures)
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = DatabaseWriter(self)
+                
+                # Commit queued writes before the application exits
+                atexit.register(self._writer.close)
+                
+            return self._writer
+        
     def _initialize_db(self):
         """Initialize the database with required tables"""
         try:
@@ -119,6 +246,50 @@ class DatabaseManager:
                 )
             ''')
             
+            # Create append-only standings history. Only rows that changed since the
+            # previous snapshot of a team are stored, the goal difference is derived
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS standings_snapshots (
+                    league_id INTEGER NOT NULL,
+                    season INTEGER NOT NULL,
+                    team_id INTEGER NOT NULL,
+                    captured_at TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    played INTEGER NOT NULL,
+                    won INTEGER NOT NULL,
+                    drawn INTEGER NOT NULL,
+                    lost INTEGER NOT NULL,
+                    goals_for INTEGER NOT NULL,
+                    goals_against INTEGER NOT NULL,
+                    points INTEGER NOT NULL,
+                    form TEXT,
+                    PRIMARY KEY (league_id, season, team_id, captured_at)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_captured ON standings_snapshots(league_id, season, captured_at)")
+            
+            # Create team statistics store. The version of a row is the last finished
+            # fixture of the team it includes, NULL if no fixture of the team was known
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS team_statistics (
+                    league_id INTEGER NOT NULL,
+                    season INTEGER NOT NULL,
+                    team_id INTEGER NOT NULL,
+                    last_fixture_id INTEGER,
+                    last_fixture_at INTEGER,
+                    stats TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (league_id, season, team_id)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Create indexes used by the paginated readers
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_predictions_match_date ON predictions(match_date, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_predictions_league ON predictions(league_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_fixtures_match_date ON fixtures(match_date, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_fixtures_league ON fixtures(league_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_teams_name ON teams(name, id)")
+            
             conn.commit()
             conn.close()
             
@@ -134,42 +305,7 @@ class DatabaseManager:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            # Check if prediction already exists
-            cursor.execute(
-                "SELECT id FROM predictions WHERE fixture_id = ? AND team_id = ?",
-                (prediction_data['fixture_id'], prediction_data['team_id'])
-            )
-            existing = cursor.fetchone()
-            
-            if existing:
-                # Prediction already exists, return existing ID
-                conn.close()
-                return 0
-                
-            # Insert new prediction
-            cursor.execute('''
-                INSERT INTO predictions (
-                    team_id, team_name, league_id, league_name, fixture_id,
-                    opponent_id, opponent_name, match_date, venue,
-                    performance_diff, prediction, prediction_level, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                prediction_data['team_id'],
-                prediction_data['team_name'],
-                prediction_data['league_id'],
-                prediction_data['league_name'],
-                prediction_data['fixture_id'],
-                prediction_data['opponent_id'],
-                prediction_data['opponent_name'],
-                prediction_data['match_date'],
-                prediction_data.get('venue', ''),
-                prediction_data['performance_diff'],
-                prediction_data['prediction'],
-                prediction_data['prediction_level'],
-                datetime.now().isoformat()
-            ))
-            
-            prediction_id = cursor.lastrowid
+            prediction_id = self._save_prediction(cursor, prediction_data)
             
             conn.commit()
             conn.close()
@@ -180,16 +316,82 @@ class DatabaseManager:
             logger.error(f"Error saving prediction: {str(e)}")
             return 0
             
+    def _save_prediction(self, cursor, prediction_data: Dict[str, Any]) -> int:
+        """Insert a prediction using an open cursor, returns 0 if it already exists"""
+        # Check if prediction already exists
+        cursor.execute(
+            "SELECT id FROM predictions WHERE fixture_id = ? AND team_id = ?",
+            (prediction_data['fixture_id'], prediction_data['team_id'])
+        )
+        existing = cursor.fetchone()
+        
+        if existing:
+            # Prediction already exists
+            return 0
+            
+        # Insert new prediction
+        cursor.execute('''
+            INSERT INTO predictions (
+                team_id, team_name, league_id, league_name, fixture_id,
+                opponent_id, opponent_name, match_date, venue,
+                performance_diff, prediction, prediction_level, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            prediction_data['team_id'],
+            prediction_data['team_name'],
+            prediction_data['league_id'],
+            prediction_data['league_name'],
+            prediction_data['fixture_id'],
+            prediction_data['opponent_id'],
+            prediction_data['opponent_name'],
+            prediction_data['match_date'],
+            prediction_data.get('venue', ''),
+            prediction_data['performance_diff'],
+            prediction_data['prediction'],
+            prediction_data['prediction_level'],
+            datetime.now().isoformat()
+        ))
+        
+        return cursor.lastrowid
+        
+    def save_predictions(self, predictions: List[Dict[str, Any]]) -> int:
+        """Save many predictions in one transaction, returns the number of new predictions"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            saved_count = self._save_predictions(cursor, predictions)
+            
+            conn.commit()
+            conn.close()
+            
+            return saved_count
+            
+        except Exception as e:
+            logger.error(f"Error saving predictions: {str(e)}")
+            return 0
+            
+    def _save_predictions(self, cursor, predictions: List[Dict[str, Any]]) -> int:
+        """Insert many predictions using an open cursor, existing predictions are skipped"""
+        saved_count = 0
+        
+        for prediction_data in predictions:
+            try:
+                if self._save_prediction(cursor, prediction_data):
+                    saved_count += 1
+            except Exception as e:
+                logger.error(f"Error saving prediction for fixture {prediction_data.get('fixture_id', 'unknown')}: {str(e)}")
+                continue
+                
+        return saved_count
+        
     def update_prediction_result(self, prediction_id: int, result: str, correct: int) -> bool:
         """Update a prediction with its result"""
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            cursor.execute(
-                "UPDATE predictions SET result = ?, correct = ? WHERE id = ?",
-                (result, correct, prediction_id)
-            )
+            self._update_prediction_result(cursor, prediction_id, result, correct)
             
             conn.commit()
             conn.close()
@@ -200,6 +402,39 @@ class DatabaseManager:
             logger.error(f"Error updating prediction result: {str(e)}")
             return False
             
+    def _update_prediction_result(self, cursor, prediction_id: int, result: str, correct: int) -> bool:
+        """Update a prediction with its result using an open cursor"""
+        cursor.execute(
+            "UPDATE predictions SET result = ?, correct = ? WHERE id = ?",
+            (result, correct, prediction_id)
+        )
+        return True
+        
+    def update_prediction_results(self, results: List[tuple]) -> int:
+        """Update many predictions with their (prediction_id, result, correct) in one transaction"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            updated_count = self._update_prediction_results(cursor, results)
+            
+            conn.commit()
+            conn.close()
+            
+            return updated_count
+            
+        except Exception as e:
+            logger.error(f"Error updating prediction results: {str(e)}")
+            return 0
+            
+    def _update_prediction_results(self, cursor, results: List[tuple]) -> int:
+        """Update many predictions with their results using an open cursor"""
+        cursor.executemany(
+            "UPDATE predictions SET result = ?, correct = ? WHERE id = ?",
+            [(result, correct, prediction_id) for prediction_id, result, correct in results]
+        )
+        return len(results)
+        
     def get_predictions(self) -> List[Dict[str, Any]]:
         """Get all predictions from the database"""
         try:
@@ -370,44 +605,7 @@ class DatabaseManager:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            saved_count = 0
-            
-            for fixture in fixtures:
-                try:
-                    # Extract data
-                    fixture_id = fixture['fixture']['id']
-                    league_id = fixture['league']['id']
-                    home_team_id = fixture['teams']['home']['id']
-                    home_team_name = fixture['teams']['home']['name']
-                    away_team_id = fixture['teams']['away']['id']
-                    away_team_name = fixture['teams']['away']['name']
-                    match_date = fixture['fixture']['date'].split('T')[0]
-                    match_time = fixture['fixture']['date'].split('T')[1].split('+')[0][:-3]
-                    venue = fixture['fixture']['venue']['name'] if fixture['fixture']['venue']['name'] else ""
-                    status = fixture['fixture']['status']['long']
-                    
-                    # Get scores if available
-                    home_score = fixture['goals']['home'] if fixture['goals']['home'] is not None else None
-                    away_score = fixture['goals']['away'] if fixture['goals']['away'] is not None else None
-                    
-                    # Insert or update fixture
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO fixtures (
-                            id, league_id, home_team_id, home_team_name,
-                            away_team_id, away_team_name, match_date, match_time,
-                            venue, status, home_score, away_score, created_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        fixture_id, league_id, home_team_id, home_team_name,
-                        away_team_id, away_team_name, match_date, match_time,
-                        venue, status, home_score, away_score, datetime.now().isoformat()
-                    ))
-                    
-                    saved_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error saving fixture {fixture.get('fixture', {}).get('id', 'unknown')}: {str(e)}")
-                    continue
+            saved_count = self._save_fixtures(cursor, fixtures)
             
             conn.commit()
             conn.close()
@@ -418,35 +616,59 @@ class DatabaseManager:
             logger.error(f"Error saving fixtures: {str(e)}")
             return 0
             
+    def _save_fixtures(self, cursor, fixtures: List[Dict[str, Any]]) -> int:
+        """Save fixtures using an open cursor"""
+        saved_count = 0
+        
+        for fixture in fixtures:
+            try:
+                # Extract data
+                fixture_id = fixture['fixture']['id']
+                league_id = fixture['league']['id']
+                home_team_id = fixture['teams']['home']['id']
+                home_team_name = fixture['teams']['home']['name']
+                away_team_id = fixture['teams']['away']['id']
+                away_team_name = fixture['teams']['away']['name']
+                match_date = fixture['fixture']['date'].split('T')[0]
+                match_time = fixture['fixture']['date'].split('T')[1].split('+')[0][:-3]
+                venue = fixture['fixture']['venue']['name'] if fixture['fixture']['venue']['name'] else ""
+                status = fixture['fixture']['status']['long']
+                
+                # Get scores if available
+                home_score = fixture['goals']['home'] if fixture['goals']['home'] is not None else None
+                away_score = fixture['goals']['away'] if fixture['goals']['away'] is not None else None
+                
+                # Insert or update fixture
+                cursor.execute('''
+                    INSERT OR REPLACE INTO fixtures (
+                        id, league_id, home_team_id, home_team_name,
+                        away_team_id, away_team_name, match_date, match_time,
+                        venue, status, home_score, away_score, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    fixture_id, league_id, home_team_id, home_team_name,
+                    away_team_id, away_team_name, match_date, match_time,
+                    venue, status, home_score, away_score, datetime.now().isoformat()
+                ))
+                
+                saved_count += 1
+                
+            except Exception as e:
+                logger.error(f"Error saving fixture {fixture.get('fixture', {}).get('id', 'unknown')}: {str(e)}")
+                continue
+                
+        # Finished fixtures make the stored statistics of their teams outdated
+        self._invalidate_team_statistics(cursor, fixtures)
+        
+        return saved_count
+        
     def save_teams(self, teams: List[Dict[str, Any]]) -> int:
         """Save teams to the database"""
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            saved_count = 0
-            
-            for team in teams:
-                try:
-                    # Extract data
-                    team_id = team['team']['id']
-                    name = team['team']['name']
-                    league_id = team.get('league', {}).get('id', 0)
-                    
-                    # Insert or update team
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO teams (
-                            id, name, league_id, created_at
-                        ) VALUES (?, ?, ?, ?)
-                    ''', (
-                        team_id, name, league_id, datetime.now().isoformat()
-                    ))
-                    
-                    saved_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error saving team {team.get('team', {}).get('id', 'unknown')}: {str(e)}")
-                    continue
+            saved_count = self._save_teams(cursor, teams)
             
             conn.commit()
             conn.close()
@@ -457,35 +679,41 @@ class DatabaseManager:
             logger.error(f"Error saving teams: {str(e)}")
             return 0
             
+    def _save_teams(self, cursor, teams: List[Dict[str, Any]]) -> int:
+        """Save teams using an open cursor"""
+        saved_count = 0
+        
+        for team in teams:
+            try:
+                # Extract data
+                team_id = team['team']['id']
+                name = team['team']['name']
+                league_id = team.get('league', {}).get('id', 0)
+                
+                # Insert or update team
+                cursor.execute('''
+                    INSERT OR REPLACE INTO teams (
+                        id, name, league_id, created_at
+                    ) VALUES (?, ?, ?, ?)
+                ''', (
+                    team_id, name, league_id, datetime.now().isoformat()
+                ))
+                
+                saved_count += 1
+                
+            except Exception as e:
+                logger.error(f"Error saving team {team.get('team', {}).get('id', 'unknown')}: {str(e)}")
+                continue
+                
+        return saved_count
+        
     def save_players(self, players: List[Dict[str, Any]]) -> int:
         """Save players to the database"""
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            saved_count = 0
-            
-            for player in players:
-                try:
-                    # Extract data
-                    player_id = player['player']['id']
-                    name = player['player']['name']
-                    team_id = player.get('statistics', [{}])[0].get('team', {}).get('id', 0)
-                    
-                    # Insert or update player
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO players (
-                            id, name, team_id, created_at
-                        ) VALUES (?, ?, ?, ?)
-                    ''', (
-                        player_id, name, team_id, datetime.now().isoformat()
-                    ))
-                    
-                    saved_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error saving player {player.get('player', {}).get('id', 'unknown')}: {str(e)}")
-                    continue
+            saved_count = self._save_players(cursor, players)
             
             conn.commit()
             conn.close()
@@ -496,94 +724,420 @@ class DatabaseManager:
             logger.error(f"Error saving players: {str(e)}")
             return 0
             
-    def save_standings(self, standings: List[Dict[str, Any]]) -> int:
-        """Save standings to the database"""
+    def _save_players(self, cursor, players: List[Dict[str, Any]]) -> int:
+        """Save players using an open cursor"""
+        saved_count = 0
+        
+        for player in players:
+            try:
+                # Extract data
+                player_id = player['player']['id']
+                name = player['player']['name']
+                team_id = player.get('statistics', [{}])[0].get('team', {}).get('id', 0)
+                
+                # Insert or update player
+                cursor.execute('''
+                    INSERT OR REPLACE INTO players (
+                        id, name, team_id, created_at
+                    ) VALUES (?, ?, ?, ?)
+                ''', (
+                    player_id, name, team_id, datetime.now().isoformat()
+                ))
+                
+                saved_count += 1
+                
+            except Exception as e:
+                logger.error(f"Error saving player {player.get('player', {}).get('id', 'unknown')}: {str(e)}")
+                continue
+                
+        return saved_count
+        
+    def save_standings(self, standings: List[Dict[str, Any]], league_id: Optional[int] = None,
+                       season: Optional[int] = None) -> int:
+        """
+        Save standings to the database and append changed rows to the standings history
+        
+        Args:
+            standings: Standings rows as returned by the API
+            league_id: League of the standings, API standings rows do not contain it
+            season: Season of the standings, defaults to the current season
+            
+        Returns:
+            int: Number of saved standings
+        """
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            saved_count = 0
-            
-            for team in standings:
-                try:
-                    # Extract data
-                    league_id = team.get('league', {}).get('id', 0)
-                    team_id = team['team']['id']
-                    team_name = team['team']['name']
-                    position = team['rank']
-                    played = team['all']['played']
-                    won = team['all']['win']
-                    drawn = team['all']['draw']
-                    lost = team['all']['lose']
-                    goals_for = team['all']['goals']['for']
-                    goals_against = team['all']['goals']['against']
-                    goal_diff = team['goalsDiff']
-                    points = team['points']
-                    form = team.get('form', '')
-                    
-                    # Insert or update standing
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO standings (
-                            league_id, team_id, team_name, position, played,
-                            won, drawn, lost, goals_for, goals_against,
-                            goal_diff, points, form, created_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
+            saved_count = self._save_standings(cursor, standings, league_id, season)
+            
+            conn.commit()
+            conn.close()
+            
+            return saved_count
+            
+        except Exception as e:
+            logger.error(f"Error saving standings: {str(e)}")
+            return 0
+            
+    def _save_standings(self, cursor, standings: List[Dict[str, Any]], league_id: Optional[int] = None,
+                        season: Optional[int] = None) -> int:
+        """Save standings and their snapshots using an open cursor"""
+        saved_count = 0
+        captured_at = datetime.now().isoformat()
+        if season is None:
+            season = get_season(datetime.now())
+            
+        snapshots = []
+        
+        for team in standings:
+            try:
+                # Extract data
+                team_league_id = league_id if league_id is not None else team.get('league', {}).get('id', 0)
+                team_id = team['team']['id']
+                team_name = team['team']['name']
+                position = team['rank']
+                played = team['all']['played']
+                won = team['all']['win']
+                drawn = team['all']['draw']
+                lost = team['all']['lose']
+                goals_for = team['all']['goals']['for']
+                goals_against = team['all']['goals']['against']
+                goal_diff = team['goalsDiff']
+                points = team['points']
+                form = team.get('form', '')
+                
+                # Insert or update standing
+                cursor.execute('''
+                    INSERT OR REPLACE INTO standings (
                         league_id, team_id, team_name, position, played,
                         won, drawn, lost, goals_for, goals_against,
-                        goal_diff, points, form, datetime.now().isoformat()
-                    ))
-                    
-                    saved_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error saving standing for team {team.get('team', {}).get('id', 'unknown')}: {str(e)}")
-                    continue
+                        goal_diff, points, form, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    team_league_id, team_id, team_name, position, played,
+                    won, drawn, lost, goals_for, goals_against,
+                    goal_diff, points, form, captured_at
+                ))
+                
+                snapshots.append((
+                    team_league_id, season, team_id, captured_at, position, played,
+                    won, drawn, lost, goals_for, goals_against, points, form
+                ))
+                
+                saved_count += 1
+                
+            except Exception as e:
+                logger.error(f"Error saving standing for team {team.get('team', {}).get('id', 'unknown')}: {str(e)}")
+                continue
+                
+        self._save_standings_snapshots(cursor, snapshots)
+        
+        return saved_count
+        
+    def _save_standings_snapshots(self, cursor, snapshots: List[tuple]) -> int:
+        """Append standings rows that differ from the latest snapshot of the team"""
+        inserted = 0
+        
+        for snapshot in snapshots:
+            league_id, season, team_id = snapshot[:3]
+            
+            cursor.execute('''
+                SELECT position, played, won, drawn, lost, goals_for, goals_against, points, form
+                FROM standings_snapshots
+                WHERE league_id = ? AND season = ? AND team_id = ?
+                ORDER BY captured_at DESC
+                LIMIT 1
+            ''', (league_id, season, team_id))
+            
+            latest = cursor.fetchone()
+            if latest is not None and tuple(latest) == tuple(snapshot[4:]):
+                continue
+                
+            cursor.execute('''
+                INSERT OR IGNORE INTO standings_snapshots (
+                    league_id, season, team_id, captured_at, position, played,
+                    won, drawn, lost, goals_for, goals_against, points, form
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', snapshot)
+            inserted += cursor.rowcount
+            
+        return inserted
+        
+    def get_standings_history(self, league_id: int, season: int, team_id: Optional[int] = None,
+                              start: Optional[str] = None, end: Optional[str] = None,
+                              from_matchday: Optional[int] = None,
+                              to_matchday: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get standings snapshots of a league season ordered by capture time
+        
+        Each row is the state of a team from its captured_at until its next snapshot,
+        so position and points over time can be charted directly.
+        
+        Args:
+            league_id: League ID
+            season: Season start year
+            team_id: Only return the history of one team
+            start: Earliest capture time (ISO format)
+            end: Latest capture time (ISO format)
+            from_matchday: Minimum number of played matches
+            to_matchday: Maximum number of played matches
+            
+        Returns:
+            list: Snapshot rows with team_name, matchday and goal_diff
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            
+            conditions = ["s.league_id = ?", "s.season = ?"]
+            params = [league_id, season]
+            
+            if team_id is not None:
+                conditions.append("s.team_id = ?")
+                params.append(team_id)
+            if start is not None:
+                conditions.append("s.captured_at >= ?")
+                params.append(start)
+            if end is not None:
+                conditions.append("s.captured_at <= ?")
+                params.append(end)
+            if from_matchday is not None:
+                conditions.append("s.played >= ?")
+                params.append(from_matchday)
+            if to_matchday is not None:
+                conditions.append("s.played <= ?")
+                params.append(to_matchday)
+                
+            cursor.execute(f'''
+                SELECT s.*, s.played as matchday, s.goals_for - s.goals_against as goal_diff,
+                       COALESCE(t.team_name, '') as team_name
+                FROM standings_snapshots s
+                LEFT JOIN standings t ON t.league_id = s.league_id AND t.team_id = s.team_id
+                WHERE {" AND ".join(conditions)}
+                ORDER BY s.captured_at, s.position
+            ''', params)
+            
+            history = [dict(row) for row in cursor.fetchall()]
+            
+            conn.close()
+            
+            return history
+            
+        except Exception as e:
+            logger.error(f"Error getting standings history: {str(e)}")
+            return []
+            
+    def get_standings_at(self, league_id: int, season: int, at: str) -> List[Dict[str, Any]]:
+        """Get the standings table of a league season as it was at the given time (ISO format)"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT s.*, s.played as matchday, s.goals_for - s.goals_against as goal_diff,
+                       COALESCE(t.team_name, '') as team_name
+                FROM standings_snapshots s
+                LEFT JOIN standings t ON t.league_id = s.league_id AND t.team_id = s.team_id
+                WHERE s.league_id = ? AND s.season = ? AND s.captured_at = (
+                    SELECT MAX(captured_at) FROM standings_snapshots
+                    WHERE league_id = s.league_id AND season = s.season
+                      AND team_id = s.team_id AND captured_at <= ?
+                )
+                ORDER BY s.position
+            ''', (league_id, season, at))
+            
+            standings = [dict(row) for row in cursor.fetchall()]
+            
+            conn.close()
+            
+            return standings
+            
+        except Exception as e:
+            logger.error(f"Error getting standings at {at}: {str(e)}")
+            return []
+            
+    def save_team_statistics(self, league_id: int, season: int, team_id: int, stats: Dict[str, Any],
+                             last_fixture_id: Optional[int] = None, last_fixture_at: Optional[int] = None,
+                             updated_at: Optional[float] = None) -> int:
+        """
+        Save the statistics of a team
+        
+        Args:
+            league_id: League of the statistics
+            season: Season of the statistics
+            team_id: Team of the statistics
+            stats: Normalized statistics as returned by FootballAPI.fetch_team_statistics
+            last_fixture_id: Last finished fixture included in the statistics, looked up
+                in the fixtures table when not given
+            last_fixture_at: Kickoff of the last finished fixture as unix timestamp
+            updated_at: Unix time the statistics were fetched, defaults to now
+            
+        Returns:
+            int: Number of saved rows
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
             
+            saved_count = self._save_team_statistics(cursor, league_id, season, team_id, stats,
+                                                     last_fixture_id, last_fixture_at, updated_at)
+                                                     
             conn.commit()
             conn.close()
             
             return saved_count
             
         except Exception as e:
-            logger.error(f"Error saving standings: {str(e)}")
+            logger.error(f"Error saving team statistics: {str(e)}")
             return 0
             
-    def export_predictions_to_csv(self, filepath: str) -> bool:
-        """Export predictions to CSV file"""
+    def _save_team_statistics(self, cursor, league_id: int, season: int, team_id: int, stats: Dict[str, Any],
+                              last_fixture_id: Optional[int] = None, last_fixture_at: Optional[int] = None,
+                              updated_at: Optional[float] = None) -> int:
+        """Save the statistics of a team using an open cursor"""
+        if last_fixture_id is None:
+            last_fixture_id, last_fixture_at = self._get_last_finished_fixture(cursor, league_id, season, team_id)
+            
+        cursor.execute('''
+            INSERT OR REPLACE INTO team_statistics (
+                league_id, season, team_id, last_fixture_id, last_fixture_at, stats, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            league_id, int(season), team_id, last_fixture_id, last_fixture_at,
+            json.dumps(stats), updated_at if updated_at is not None else time.time()
+        ))
+        
+        return 1
+        
+    def _get_last_finished_fixture(self, cursor, league_id: int, season: int, team_id: int) -> tuple:
+        """Get id and kickoff timestamp of the last finished fixture of a team in the fixtures table"""
+        placeholders = ", ".join("?" for _ in FINISHED_STATUS_NAMES)
+        cursor.execute(f'''
+            SELECT id, match_date, match_time FROM fixtures
+            WHERE league_id = ? AND (home_team_id = ? OR away_team_id = ?)
+              AND status IN ({placeholders}) AND match_date BETWEEN ? AND ?
+            ORDER BY match_date DESC, match_time DESC
+            LIMIT 1
+        ''', (league_id, team_id, team_id, *FINISHED_STATUS_NAMES,
+              f"{int(season)}-07-01", f"{int(season) + 1}-06-30"))
+              
+        row = cursor.fetchone()
+        if not row:
+            return None, None
+            
+        # Fixture dates and times are stored in UTC
+        kickoff = datetime.strptime(f"{row[1]} {row[2]}", "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc)
+        return row[0], int(kickoff.timestamp())
+        
+    def get_team_statistics(self, league_id: int, season: int, team_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored statistics of a team
+        
+        Returns:
+            dict: "stats", "last_fixture_id", "last_fixture_at" and "updated_at",
+                None if no valid statistics are stored
+        """
         try:
             conn = sqlite3.connect(self.db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
             cursor.execute('''
-                SELECT * FROM predictions
-                ORDER BY match_date DESC
-            ''')
+                SELECT * FROM team_statistics
+                WHERE league_id = ? AND season = ? AND team_id = ?
+            ''', (league_id, int(season), team_id))
             
-            predictions = cursor.fetchall()
+            row = cursor.fetchone()
             
-            if not predictions:
-                conn.close()
-                return False
-                
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                
-                # Write headers
-                writer.writerow([column[0] for column in cursor.description])
+            conn.close()
+            
+            if row is None:
+                return None
                 
-                # Write data
-                for prediction in predictions:
-                    writer.writerow(prediction)
-                    
+            result = dict(row)
+            result["stats"] = json.loads(result["stats"])
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error getting team statistics for {team_id}: {str(e)}")
+            return None
+            
+    def invalidate_team_statistics(self, fixtures: List[Dict[str, Any]]) -> int:
+        """
+        Delete stored team statistics that do not include the given finished fixtures yet
+        
+        Args:
+            fixtures: Fixtures as returned by the API, unfinished fixtures are ignored
+            
+        Returns:
+            int: Number of deleted rows
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            deleted_count = self._invalidate_team_statistics(cursor, fixtures)
+            
+            conn.commit()
             conn.close()
             
-            return True
+            return deleted_count
             
         except Exception as e:
-            logger.error(f"Error exporting predictions to CSV: {str(e)}")
-            return False
+            logger.error(f"Error invalidating team statistics: {str(e)}")
+            return 0
+            
+    def _invalidate_team_statistics(self, cursor, fixtures: List[Dict[str, Any]]) -> int:
+        """Delete outdated team statistics using an open cursor"""
+        # Only the latest finished fixture of every team matters
+        latest = {}
+        for fixture in fixtures:
+            try:
+                if fixture['fixture']['status']['short'] not in FINISHED_STATUSES:
+                    continue
+                    
+                kickoff = get_fixture_timestamp(fixture)
+                if kickoff is None:
+                    continue
+                    
+                league_id = fixture['league']['id']
+                season = fixture['league'].get('season')
+                if season is None:
+                    season = get_season(datetime.fromtimestamp(kickoff))
+                    
+                for side in ('home', 'away'):
+                    key = (league_id, int(season), fixture['teams'][side]['id'])
+                    if key not in latest or latest[key][1] < kickoff:
+                        latest[key] = (fixture['fixture']['id'], kickoff)
+                        
+            except Exception as e:
+                logger.error(f"Error reading fixture {fixture.get('fixture', {}).get('id', 'unknown')}: {str(e)}")
+                continue
+                
+        deleted_count = 0
+        
+        for (league_id, season, team_id), (fixture_id, kickoff) in latest.items():
+            # Rows without a version are kept if they were fetched after the match ended
+            cursor.execute('''
+                DELETE FROM team_statistics
+                WHERE league_id = ? AND season = ? AND team_id = ?
+                  AND (last_fixture_id IS NULL OR last_fixture_id != ?)
+                  AND CASE WHEN last_fixture_at IS NULL THEN updated_at < ? ELSE last_fixture_at < ? END
+            ''', (league_id, season, team_id, fixture_id, kickoff + MATCH_DURATION, kickoff))
+            deleted_count += cursor.rowcount
+            
+        if deleted_count:
+            logger.info(f"Invalidated statistics of {deleted_count} teams")
+            
+        return deleted_count
+        
+    def export_predictions_to_csv(self, filepath: str) -> bool:
+        """Export predictions to CSV file"""
+        return self.export_table("predictions", filepath, export_format="csv",
+                                 sort_by="match_date", descending=True) > 0
             
     def get_fixtures(self) -> List[Dict[str, Any]]:
         """Get all fixtures from the database"""
@@ -691,3 +1245,243 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Error getting form changes: {str(e)}")
             return []
+            
+    def _build_page_filters(self, table: str, filters: Optional[Dict[str, Any]]):
+        """Build the WHERE conditions and parameters for a paginated table"""
+        conditions = []
+        params = []
+        filters = filters or {}
+        
+        alias = PAGE_ID_COLUMNS[table].split('.')[0]
+        
+        if filters.get('league_id') is not None:
+            conditions.append(f"{alias}.league_id = ?")
+            params.append(filters['league_id'])
+            
+        status = filters.get('status')
+        if status and table == "predictions":
+            # Prediction status is derived from the stored result
+            if status == "WAITING":
+                conditions.append("p.result IS NULL")
+            elif status == "COMPLETED":
+                conditions.append("p.result IS NOT NULL")
+            elif status == "CORRECT":
+                conditions.append("p.correct = 1")
+            elif status == "INCORRECT":
+                conditions.append("p.correct = 0 AND p.result IS NOT NULL")
+        elif status and table == "fixtures":
+            conditions.append("f.status = ?")
+            params.append(status)
+            
+        return conditions, params
+        
+    def get_page(self, table: str, cursor: Optional[tuple] = None, limit: int = PAGE_SIZE,
+                 sort_by: Optional[str] = None, descending: bool = False,
+                 filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Get one page of rows from a table using a keyset cursor
+        
+        Args:
+            table: One of "predictions", "fixtures" or "teams"
+            cursor: The next_cursor of the previous page, None for the first page
+            limit: Maximum number of rows to return
+            sort_by: Column to sort by (see PAGE_SORT_COLUMNS)
+            descending: Sort direction
+            filters: Optional filters ("league_id", "status")
+            
+        Returns:
+            dict: {"rows": list of row dicts, "next_cursor": cursor for the next page or None}
+        """
+        try:
+            if table not in PAGE_QUERIES:
+                raise ValueError(f"Table {table} does not support pagination")
+                
+            sort_columns = PAGE_SORT_COLUMNS[table]
+            sort_expr = sort_columns.get(sort_by, PAGE_ID_COLUMNS[table])
+            id_expr = PAGE_ID_COLUMNS[table]
+            
+            conditions, params = self._build_page_filters(table, filters)
+            
+            # Keyset condition: continue strictly after the last row of the previous page
+            if cursor is not None:
+                op = "<" if descending else ">"
+                conditions.append(f"({sort_expr} {op} ? OR ({sort_expr} = ? AND {id_expr} {op} ?))")
+                params.extend([cursor[0], cursor[0], cursor[1]])
+                
+            direction = "DESC" if descending else "ASC"
+            query = PAGE_QUERIES[table].replace("SELECT ", f"SELECT {sort_expr} AS _sort_key, ", 1)
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += f" ORDER BY {sort_expr} {direction}, {id_expr} {direction} LIMIT ?"
+            params.append(limit)
+            
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            db_cursor = conn.cursor()
+            
+            db_cursor.execute(query, params)
+            rows = [dict(row) for row in db_cursor.fetchall()]
+            
+            conn.close()
+            
+            # The cursor for the next page is the sort key and id of the last row
+            next_cursor = None
+            if len(rows) == limit:
+                next_cursor = (rows[-1]['_sort_key'], rows[-1]['id'])
+                
+            for row in rows:
+                del row['_sort_key']
+                
+            return {"rows": rows, "next_cursor": next_cursor}
+            
+        except Exception as e:
+            logger.error(f"Error getting page of {table}: {str(e)}")
+            return {"rows": [], "next_cursor": None}
+            
+    def get_predictions_page(self, cursor: Optional[tuple] = None, limit: int = PAGE_SIZE,
+                             sort_by: str = "match_date", descending: bool = True,
+                             filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get one page of predictions, newest match first by default"""
+        return self.get_page("predictions", cursor, limit, sort_by, descending, filters)
+        
+    def get_fixtures_page(self, cursor: Optional[tuple] = None, limit: int = PAGE_SIZE,
+                          sort_by: str = "match_date", descending: bool = True,
+                          filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get one page of fixtures, newest match first by default"""
+        return self.get_page("fixtures", cursor, limit, sort_by, descending, filters)
+        
+    def get_teams_page(self, cursor: Optional[tuple] = None, limit: int = PAGE_SIZE,
+                       sort_by: str = "name", descending: bool = False,
+                       filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get one page of teams, ordered by name by default"""
+        return self.get_page("teams", cursor, limit, sort_by, descending, filters)
+        
+    def count_rows(self, table: str, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count the rows of a paginated table matching the given filters"""
+        try:
+            if table not in PAGE_QUERIES:
+                raise ValueError(f"Table {table} does not support pagination")
+                
+            conditions, params = self._build_page_filters(table, filters)
+            
+            alias = PAGE_ID_COLUMNS[table].split('.')[0]
+            query = f"SELECT COUNT(*) FROM {table} {alias}"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+                
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.execute(query, params)
+            count = cursor.fetchone()[0]
+            
+            conn.close()
+            
+            return count
+            
+        except Exception as e:
+            logger.error(f"Error counting rows of {table}: {str(e)}")
+            return 0
+            
+    def export_table(self, table: str, file_path: str, export_format: Optional[str] = None,
+                     sort_by: Optional[str] = None, descending: bool = False,
+                     filters: Optional[Dict[str, Any]] = None,
+                     progress_callback: Optional[Callable[[int, Optional[int]], None]] = None) -> int:
+        """
+        Stream a table to a CSV, NDJSON or JSON file without loading it into memory
+        
+        Args:
+            table: A paginated table or one of EXPORT_QUERIES
+            file_path: Output file, gzip compressed when it ends with .gz
+            export_format: "csv", "ndjson" or "json", detected from file_path if None
+            sort_by: Column to sort by (paginated tables only, see PAGE_SORT_COLUMNS)
+            descending: Sort direction
+            filters: Optional filters ("league_id", "status"), paginated tables only
+            progress_callback: Called with (rows written, total rows)
+            
+        Returns:
+            int: Number of rows exported, -1 on error
+        """
+        try:
+            total = None
+            
+            if table in PAGE_QUERIES:
+                sort_expr = PAGE_SORT_COLUMNS[table].get(sort_by, PAGE_ID_COLUMNS[table])
+                id_expr = PAGE_ID_COLUMNS[table]
+                direction = "DESC" if descending else "ASC"
+                
+                conditions, params = self._build_page_filters(table, filters)
+                
+                query = PAGE_QUERIES[table]
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                query += f" ORDER BY {sort_expr} {direction}, {id_expr} {direction}"
+                
+                if progress_callback:
+                    total = self.count_rows(table, filters)
+            elif table in EXPORT_QUERIES:
+                query = EXPORT_QUERIES[table]
+                params = []
+            else:
+                raise ValueError(f"Table {table} can not be exported")
+                
+            return export_rows(
+                iter_query(self.db_path, query, params),
+                file_path,
+                export_format=export_format,
+                progress_callback=progress_callback,
+                total=total
+            )
+            
+        except Exception as e:
+            logger.error(f"Error exporting {table}: {str(e)}")
+            return -1
+            
+    def export_columnar(self, table: str, root_dir: str, file_format: str = "parquet",
+                        league_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Export fixtures, standings or predictions to Parquet or Arrow IPC files
+        partitioned by league and season
+        
+        Args:
+            table: "fixtures", "standings" or "predictions"
+            root_dir: Root directory of the exported dataset
+            file_format: "parquet" or "arrow"
+            league_id: Only export one league
+            
+        Returns:
+            dict: {"rows": number of rows, "files": list of written files}, with
+                "error" set to the reason if the export failed
+        """
+        try:
+            return columnar_store.export_table(self.db_path, table, root_dir, file_format, league_id)
+            
+        except Exception as e:
+            logger.error(f"Error exporting {table} to {file_format}: {str(e)}")
+            return {"rows": 0, "files": [], "error": str(e)}
+            
+    def import_columnar(self, table: str, root_dir: str, league_id: Optional[int] = None,
+                        season: Optional[int] = None, file_format: Optional[str] = None) -> int:
+        """Import fixtures, standings or predictions from Parquet or Arrow IPC files"""
+        try:
+            return columnar_store.import_table(self.db_path, table, root_dir, league_id, season, file_format)
+            
+        except Exception as e:
+            logger.error(f"Error importing {table}: {str(e)}")
+            return 0
+            
+    def load_columnar(self, table: str, root_dir: str, league_id: Optional[int] = None,
+                      season: Optional[int] = None, columns: Optional[List[str]] = None,
+                      as_pandas: bool = False, file_format: Optional[str] = None):
+        """
+        Load an exported table memory-mapped, without going through the database
+        
+        Returns:
+            pyarrow.Table, or pandas.DataFrame if as_pandas is True, None if not found
+        """
+        try:
+            return columnar_store.load_table(root_dir, table, league_id, season, columns, as_pandas, file_format)
+            
+        except Exception as e:
+            logger.error(f"Error loading {table}: {str(e)}")
+            return None
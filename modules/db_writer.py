@@ -0,0 +1,170 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Write operations accepted by the writer mapped to their DatabaseManager cursor helpers
+WRITE_OPERATIONS = {
+    "save_prediction": "_save_prediction",
+    "save_predictions": "_save_predictions",
+    "update_prediction_result": "_update_prediction_result",
+    "update_prediction_results": "_update_prediction_results",
+    "save_fixtures": "_save_fixtures",
+    "save_teams": "_save_teams",
+    "save_players": "_save_players",
+    "save_standings": "_save_standings",
+    "save_team_statistics": "_save_team_statistics",
+    "invalidate_team_statistics": "_invalidate_team_statistics"
+}
+
+# Queue markers
+_FLUSH = "flush"
+_STOP = "stop"
+
+class DatabaseWriter:
+    """
+    Single background thread that performs all database writes
+    
+    Writes are queued and committed in batches. A batch is committed when it holds
+    batch_size writes or flush_interval seconds after its first write. Every write runs
+    in its own savepoint, so a failing write does not roll back the rest of the batch.
+    """
+    
+    def __init__(self, db_manager, max_queue_size: int = 1000, batch_size: int = 100,
+                 flush_interval: float = 0.25):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        
+        self._thread = threading.Thread(target=self._run, name="DatabaseWriter", daemon=True)
+        self._thread.start()
+        
+    def submit(self, operation: str, *args, **kwargs) -> Future:
+        """
+        Queue a write operation
+        
+        Blocks while the queue is full.
+        
+        Args:
+            operation: One of WRITE_OPERATIONS, e.g. "save_fixtures"
+            *args, **kwargs: Arguments of the DatabaseManager method
+            
+        Returns:
+            Future: Resolves to the method's return value once the write is committed
+        """
+        if operation not in WRITE_OPERATIONS:
+            raise ValueError(f"Unknown write operation: {operation}")
+        if self._closed:
+            raise RuntimeError("Database writer is closed")
+            
+        future = Future()
+        self._queue.put((operation, args, kwargs, future))
+        return future
+        
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Commit all queued writes and wait for them, returns False on timeout"""
+        if self._closed:
+            return True
+            
+        future = Future()
+        self._queue.put((_FLUSH, (), {}, future))
+        try:
+            future.result(timeout)
+            return True
+        except Exception:
+            return False
+            
+    def close(self, timeout: Optional[float] = 10):
+        """Commit all queued writes and stop the writer thread"""
+        if self._closed:
+            return
+            
+        self._closed = True
+        self._queue.put((_STOP, (), {}, None))
+        self._thread.join(timeout)
+        
+    def _run(self):
+        """Writer thread: collect batches from the queue and commit them"""
+        conn = sqlite3.connect(self.db_manager.db_path, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 5000")
+        
+        try:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                
+                # Collect more writes until the batch is full or the time limit passes
+                while batch[-1][0] not in (_FLUSH, _STOP) and len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                        
+                self._write_batch(conn, batch)
+                
+                if batch[-1][0] == _STOP:
+                    break
+        finally:
+            conn.close()
+            
+    def _write_batch(self, conn, batch: List[tuple]):
+        """Run a batch of writes in one transaction and resolve their futures"""
+        completed = []
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("BEGIN")
+            
+            for operation, args, kwargs, future in batch:
+                if operation in (_FLUSH, _STOP):
+                    completed.append((future, None, None))
+                    continue
+                if not future.set_running_or_notify_cancel():
+                    continue
+                    
+                cursor.execute("SAVEPOINT write_op")
+                try:
+                    method = getattr(self.db_manager, WRITE_OPERATIONS[operation])
+                    result = method(cursor, *args, **kwargs)
+                    cursor.execute("RELEASE SAVEPOINT write_op")
+                    completed.append((future, result, None))
+                except Exception as e:
+                    logger.error(f"Error in queued {operation}: {str(e)}")
+                    cursor.execute("ROLLBACK TO SAVEPOINT write_op")
+                    cursor.execute("RELEASE SAVEPOINT write_op")
+                    completed.append((future, None, e))
+                    
+            cursor.execute("COMMIT")
+            
+        except Exception as e:
+            logger.error(f"Error committing write batch: {str(e)}")
+            if conn.in_transaction:
+                conn.rollback()
+            for operation, args, kwargs, future in batch:
+                if future is None or future.done():
+                    continue
+                if future.running() or future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            return
+            
+        # Resolve futures only after the commit, so done means durable
+        for future, result, error in completed:
+            if future is None:
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+                
+        logger.debug(f"Committed batch of {len(completed)} writes")
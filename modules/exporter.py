@@ -0,0 +1,161 @@
+import csv
+import gzip
+import json
+import logging
+import os
+import sqlite3
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Supported export formats
+EXPORT_FORMATS = ["csv", "ndjson", "json"]
+
+# Number of rows fetched from the database and written between progress reports
+CHUNK_SIZE = 1000
+
+# File extensions mapped to export formats
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".json": "json"
+}
+
+def detect_format(file_path: str, default: str = "csv") -> str:
+    """Get the export format from a file name, ignoring a trailing .gz"""
+    name = file_path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+        
+    for extension, export_format in FORMAT_EXTENSIONS.items():
+        if name.endswith(extension):
+            return export_format
+            
+    return default
+
+def open_output(file_path: str, compress: Optional[bool] = None):
+    """Open a text file for writing, gzip compressed when the name ends with .gz"""
+    if compress is None:
+        compress = file_path.lower().endswith(".gz")
+        
+    if compress:
+        return gzip.open(file_path, "wt", encoding="utf-8", newline="")
+    return open(file_path, "w", encoding="utf-8", newline="")
+
+def iter_query(db_path: str, query: str, params: Iterable[Any] = (),
+               chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the rows of a query without loading the whole result
+    
+    Args:
+        db_path: Path to the SQLite database
+        query: SQL query to run
+        params: Query parameters
+        chunk_size: Number of rows fetched from the cursor at a time
+        
+    Yields:
+        dict: One row at a time
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute(query, list(params))
+        
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+    finally:
+        conn.close()
+
+def export_rows(rows: Iterable[Dict[str, Any]], file_path: str, export_format: Optional[str] = None,
+                columns: Optional[List[str]] = None, metadata: Optional[Dict[str, Any]] = None,
+                progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+                total: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Write rows to a CSV, NDJSON or JSON file one row at a time
+    
+    The file is written next to the target and moved into place when complete, so a
+    failed export never leaves a truncated file behind.
+    
+    Args:
+        rows: Iterable of row dicts, e.g. from iter_query
+        file_path: Output file, gzip compressed when it ends with .gz
+        export_format: "csv", "ndjson" or "json", detected from file_path if None
+        columns: CSV columns, taken from the first row if None
+        metadata: JSON only, written as top level keys with the rows under "items"
+        progress_callback: Called with (rows written, total) every chunk_size rows
+        total: Expected number of rows, passed through to progress_callback
+        chunk_size: Number of rows between progress reports
+        
+    Returns:
+        int: Number of rows written
+    """
+    export_format = export_format or detect_format(file_path)
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+        
+    temp_path = f"{file_path}.part"
+    count = 0
+    
+    try:
+        with open_output(temp_path, compress=file_path.lower().endswith(".gz")) as output:
+            if export_format == "csv":
+                writer = None
+                for row in rows:
+                    if writer is None:
+                        writer = csv.DictWriter(output, fieldnames=columns or list(row.keys()), extrasaction="ignore")
+                        writer.writeheader()
+                    writer.writerow(row)
+                    count += 1
+                    if progress_callback and count % chunk_size == 0:
+                        progress_callback(count, total)
+                        
+                # Write the header even if there are no rows
+                if writer is None and columns:
+                    csv.writer(output).writerow(columns)
+                    
+            elif export_format == "ndjson":
+                for row in rows:
+                    output.write(json.dumps(row, ensure_ascii=False, default=str))
+                    output.write("\n")
+                    count += 1
+                    if progress_callback and count % chunk_size == 0:
+                        progress_callback(count, total)
+                        
+            else:  # json
+                if metadata is not None:
+                    # Write the metadata keys, then stream the rows into "items"
+                    header = json.dumps(metadata, ensure_ascii=False, indent=4, default=str)
+                    header = header[:-1].rstrip()
+                    output.write(header + (",\n" if metadata else "\n"))
+                    output.write('    "items": [')
+                else:
+                    output.write("[")
+                    
+                for row in rows:
+                    output.write(",\n" if count else "\n")
+                    output.write(json.dumps(row, ensure_ascii=False, default=str))
+                    count += 1
+                    if progress_callback and count % chunk_size == 0:
+                        progress_callback(count, total)
+                        
+                output.write("\n]" if metadata is None else "\n    ]\n}")
+                output.write("\n")
+                
+        os.replace(temp_path, file_path)
+        
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+            
+    if progress_callback:
+        progress_callback(count, total)
+        
+    logger.info(f"Exported {count} rows to {file_path}")
+    
+    return count
@@ -0,0 +1,355 @@
+import argparse
+import copy
+import gzip
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from urllib.request import Request, urlopen
+
+logger = logging.getLogger(__name__)
+
+# Live API the recording proxy forwards to
+UPSTREAM_URL = "https://v3.football.api-sports.io"
+
+# Request headers passed on to the live API, the API key among them
+FORWARDED_HEADERS = ("x-apisports-key", "x-rapidapi-key", "x-rapidapi-host")
+
+# Default corpus file, a gzip compressed JSON line per recorded response
+DEFAULT_CORPUS = "benchmarks/corpus.jsonl.gz"
+
+# Number of upcoming fixtures per league whose odds are recorded
+RECORDED_ODDS_FIXTURES = 10
+
+def request_key(path: str, params: Iterable[Tuple[str, str]]) -> str:
+    """Key of a request, the same for any order of the query parameters"""
+    return f"{path.rstrip('/')}?{urlencode(sorted((str(name), str(value)) for name, value in params))}"
+
+def load_corpus(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load recorded responses
+    
+    Returns:
+        dict: Entries with "status" and "body" by request key, later recordings win
+    """
+    corpus = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                corpus[request_key(entry["path"], entry["params"])] = entry
+    return corpus
+
+class ReplayServer:
+    """
+    Local stand-in for the api-sports service
+    
+    In replay mode recorded responses are served by request path and query
+    parameters, optionally slowed down by latency, answered with 429 at a given
+    rate or after a per-minute or daily limit (with the rate limit headers the
+    live API sends), and with the lists in their "response" repeated scale times
+    to test larger payloads. Requests that were not recorded get a 404.
+    
+    In record mode every request is forwarded to upstream and successful
+    responses are appended to the corpus, so pointing a client at the server
+    records exactly the requests the client makes.
+    
+    Point a client at url instead of BASE_URL, e.g. FootballAPI(key, server.url).
+    """
+    
+    def __init__(self, corpus_path: str = DEFAULT_CORPUS, host: str = "127.0.0.1", port: int = 0,
+                 record: bool = False, upstream: str = UPSTREAM_URL, latency: float = 0, jitter: float = 0,
+                 error_rate: float = 0, minute_limit: int = 0, daily_limit: int = 0, scale: int = 1,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            corpus_path: Corpus file to replay or to append recordings to
+            host: Address to listen on
+            port: Port to listen on, 0 picks a free port
+            record: Forward requests to upstream and record the responses
+            upstream: Live API used in record mode
+            latency: Seconds added to every replayed response
+            jitter: Up to this many seconds are added at random on top of latency
+            error_rate: Share of replayed requests answered with 429
+            minute_limit: Requests per minute before answering with 429, 0 for no limit
+            daily_limit: Requests per server lifetime before answering with 429, 0 for no limit
+            scale: Number of times the "response" lists are repeated
+            seed: Seed of the random latency and errors, for repeatable benchmarks
+        """
+        self.corpus_path = corpus_path
+        self.record = record
+        self.upstream = upstream.rstrip("/")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.minute_limit = minute_limit
+        self.daily_limit = daily_limit
+        self.scale = max(1, scale)
+        
+        self.corpus = {} if record else load_corpus(corpus_path)
+        self.stats = {"requests": 0, "replayed": 0, "recorded": 0, "missing": 0, "throttled": 0}
+        
+        self._random = random.Random(seed)
+        self._minute = None
+        self._minute_count = 0
+        self._scaled = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        
+        self._server = ThreadingHTTPServer((host, port), self._create_handler())
+        self._server.daemon_threads = True
+        
+    @property
+    def url(self) -> str:
+        """Base URL of the server"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+        
+    def start(self) -> "ReplayServer":
+        """Serve requests in a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="ReplayServer", daemon=True)
+            self._thread.start()
+            logger.info(f"{'Recording' if self.record else 'Replaying'} {self.corpus_path} at {self.url}")
+        return self
+        
+    def serve_forever(self):
+        """Serve requests in the calling thread until interrupted"""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+            
+    def stop(self):
+        """Stop serving and close the socket"""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread = None
+        
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+        
+    def __exit__(self, *exc_info):
+        self.stop()
+        
+    def _create_handler(self):
+        """Create the request handler class bound to this server"""
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections open like the live API, clients use connection pools
+            protocol_version = "HTTP/1.1"
+            
+            def do_GET(self):
+                url = urlsplit(self.path)
+                params = parse_qsl(url.query, keep_blank_values=True)
+                if server.record:
+                    status, headers, body = server._forward(url.path, params, self.headers)
+                else:
+                    status, headers, body = server._replay(url.path, params)
+                    
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                
+            def log_message(self, format, *args):
+                logger.debug(f"{self.address_string()} {format % args}")
+                
+        return Handler
+        
+    def _replay(self, path: str, params: List[Tuple[str, str]]) -> Tuple[int, Dict[str, str], bytes]:
+        """Answer a request from the corpus"""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            inject_error = self.error_rate and self._random.random() < self.error_rate
+            headers, throttled = self._count_request()
+            
+        if delay:
+            time.sleep(delay)
+            
+        if throttled or inject_error:
+            with self._lock:
+                self.stats["throttled"] += 1
+            headers["Retry-After"] = "1"
+            return 429, headers, json.dumps({"errors": {"rateLimit": "Too many requests"}}).encode()
+            
+        key = request_key(path, params)
+        entry = self.corpus.get(key)
+        if entry is None:
+            with self._lock:
+                self.stats["missing"] += 1
+            logger.debug(f"Not recorded: {key}")
+            return 404, headers, json.dumps({"errors": {"replay": f"Not recorded: {key}"}, "response": []}).encode()
+            
+        with self._lock:
+            self.stats["replayed"] += 1
+        return entry["status"], headers, self._get_body(key, entry)
+        
+    def _count_request(self) -> Tuple[Dict[str, str], bool]:
+        """Count a request against the limits, caller holds the lock"""
+        minute = int(time.time() // 60)
+        if minute != self._minute:
+            self._minute, self._minute_count = minute, 0
+        self._minute_count += 1
+        
+        headers = {}
+        throttled = False
+        if self.minute_limit:
+            headers["X-RateLimit-Limit"] = str(self.minute_limit)
+            headers["X-RateLimit-Remaining"] = str(max(0, self.minute_limit - self._minute_count))
+            throttled = self._minute_count > self.minute_limit
+        if self.daily_limit:
+            headers["x-ratelimit-requests-limit"] = str(self.daily_limit)
+            headers["x-ratelimit-requests-remaining"] = str(max(0, self.daily_limit - self.stats["requests"]))
+            throttled = throttled or self.stats["requests"] > self.daily_limit
+        return headers, throttled
+        
+    def _get_body(self, key: str, entry: Dict[str, Any]) -> bytes:
+        """Encode a recorded body, with its response list repeated scale times"""
+        body = self._scaled.get(key)
+        if body is not None:
+            return body
+            
+        data = entry["body"]
+        if self.scale > 1 and isinstance(data, dict) and isinstance(data.get("response"), list):
+            data = dict(data)
+            data["response"] = [copy.deepcopy(item) for item in data["response"] for _ in range(self.scale)]
+            data["results"] = len(data["response"])
+            
+        body = json.dumps(data).encode()
+        with self._lock:
+            self._scaled[key] = body
+        return body
+        
+    def _forward(self, path: str, params: List[Tuple[str, str]], request_headers) -> Tuple[int, Dict[str, str], bytes]:
+        """Forward a request to upstream and record a successful response"""
+        headers = {name: request_headers[name] for name in FORWARDED_HEADERS if request_headers.get(name)}
+        url = f"{self.upstream}{path}?{urlencode(params)}"
+        response_headers = {}
+        
+        try:
+            with urlopen(Request(url, headers=headers), timeout=30) as response:
+                status, body = response.status, response.read()
+                response_headers = {name: value for name, value in response.headers.items()
+                                    if name.lower().startswith("x-ratelimit")}
+        except HTTPError as e:
+            status, body = e.code, e.read()
+        except URLError as e:
+            logger.error(f"Error forwarding {path}: {str(e)}")
+            return 502, {}, json.dumps({"errors": {"upstream": str(e)}}).encode()
+            
+        with self._lock:
+            self.stats["requests"] += 1
+            if status == 200:
+                self._append(path, params, status, json.loads(body))
+                self.stats["recorded"] += 1
+                
+        return status, response_headers, body
+        
+    def _append(self, path: str, params: List[Tuple[str, str]], status: int, body: Any):
+        """Append a response to the corpus, caller holds the lock"""
+        entry = {"path": path, "params": params, "status": status, "body": body}
+        # Every append is a complete gzip member, an interrupted recording keeps what it has
+        with gzip.open(self.corpus_path, "at", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+def record_leagues(api_key: str, league_ids: List[int], corpus_path: str = DEFAULT_CORPUS,
+                   form_length: int = 5, upstream: str = UPSTREAM_URL) -> Dict[str, int]:
+    """
+    Record standings, fixtures, team statistics and odds of leagues from the live API
+    
+    The requests are made by FootballAPI through a recording ReplayServer, so
+    the corpus holds exactly the requests the application makes.
+    
+    Returns:
+        dict: Request counts of the recording server
+    """
+    from modules.api_client import FootballAPI
+    
+    with ReplayServer(corpus_path, record=True, upstream=upstream) as server:
+        api = FootballAPI(api_key, server.url)
+        
+        for league_id in league_ids:
+            logger.info(f"Recording league {league_id}")
+            standings = api.fetch_standings(league_id) or {}
+            fixtures = api.fetch_fixtures(league_id) or []
+            api.fetch_all_teams({league_id: {"name": "", "flag": ""}}, form_length)
+            
+            # Statistics of every team in the standings
+            team_ids = [
+                row['team']['id']
+                for response in standings.get('response', [])
+                for group in response.get('league', {}).get('standings', [])
+                for row in group
+            ]
+            api.prefetch_team_statistics((league_id, team_id) for team_id in team_ids)
+            
+            # Odds are only offered for upcoming fixtures
+            upcoming = [fixture for fixture in fixtures if fixture['fixture']['status']['short'] == 'NS']
+            for fixture in upcoming[:RECORDED_ODDS_FIXTURES]:
+                api.fetch_match_odds(fixture['fixture']['id'])
+                
+        return dict(server.stats)
+
+def main():
+    """Record a corpus from the live API or serve a recorded one"""
+    parser = argparse.ArgumentParser(description="Record and replay API responses for offline benchmarks")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Corpus file")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    record = commands.add_parser("record", help="Record leagues from the live API")
+    record.add_argument("--leagues", type=int, nargs="+", required=True, help="League ids to record")
+    record.add_argument("--form-length", type=int, default=5, help="Number of recent matches used for the form")
+    record.add_argument("--upstream", default=UPSTREAM_URL, help="Live API")
+    
+    proxy = commands.add_parser("proxy", help="Record whatever a client requests through this server")
+    proxy.add_argument("--port", type=int, default=8099, help="Port to listen on")
+    proxy.add_argument("--upstream", default=UPSTREAM_URL, help="Live API")
+    
+    serve = commands.add_parser("serve", help="Serve the recorded responses")
+    serve.add_argument("--port", type=int, default=8099, help="Port to listen on")
+    serve.add_argument("--latency", type=float, default=0, help="Seconds added to every response")
+    serve.add_argument("--jitter", type=float, default=0, help="Random seconds added on top of the latency")
+    serve.add_argument("--error-rate", type=float, default=0, help="Share of requests answered with 429")
+    serve.add_argument("--minute-limit", type=int, default=0, help="Requests per minute before 429")
+    serve.add_argument("--daily-limit", type=int, default=0, help="Requests before 429 until restarted")
+    serve.add_argument("--scale", type=int, default=1, help="Repeat the response lists this many times")
+    serve.add_argument("--seed", type=int, help="Seed of the random latency and errors")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+                        
+    if args.command == "record":
+        from modules.config import API_KEY
+        stats = record_leagues(API_KEY, args.leagues, args.corpus, args.form_length, args.upstream)
+        print(f"Recorded {stats['recorded']} of {stats['requests']} requests to {args.corpus}")
+        return
+        
+    if args.command == "proxy":
+        server = ReplayServer(args.corpus, port=args.port, record=True, upstream=args.upstream)
+    else:
+        server = ReplayServer(args.corpus, port=args.port, latency=args.latency, jitter=args.jitter,
+                              error_rate=args.error_rate, minute_limit=args.minute_limit,
+                              daily_limit=args.daily_limit, scale=args.scale, seed=args.seed)
+        print(f"Serving {len(server.corpus)} recorded responses")
+        
+    print(f"Listening on {server.url}, set BASE_URL to it. Press Ctrl+C to stop")
+    server.serve_forever()
+    print(f"Requests: {server.stats}")
+
+if __name__ == "__main__":
+    main()
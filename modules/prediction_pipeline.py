@@ -0,0 +1,234 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+from modules.config import FINISHED_STATUSES, PREDICTION_THRESHOLD_LEVEL2, PERF_DIFF_THRESHOLD, PREFETCH_WORKERS
+from modules.form_analyzer import FormAnalyzer
+from modules.league_names import get_league_display_name
+
+logger = logging.getLogger(__name__)
+
+def generate_prediction(performance_diff: float) -> Tuple[str, int]:
+    """Generate prediction and prediction level based on performance difference"""
+    prediction_level = 1
+    
+    if abs(performance_diff) >= PREDICTION_THRESHOLD_LEVEL2:
+        prediction_level = 2
+        
+    if performance_diff > 0:
+        if prediction_level == 2:
+            prediction = "BIG WIN"
+        else:
+            prediction = "WIN"
+    else:
+        if prediction_level == 2:
+            prediction = "BIG LOSS"
+        else:
+            prediction = "LOSS"
+            
+    return prediction, prediction_level
+
+def evaluate_prediction(prediction: Dict[str, Any], fixture: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+    """
+    Compare a saved prediction with the result of its fixture
+    
+    Args:
+        prediction: Prediction row with "team_id" and "prediction"
+        fixture: Fixture as returned by the API
+        
+    Returns:
+        tuple: (result, correct) with result HOME_WIN, AWAY_WIN or DRAW and correct 1 or 0,
+            None if the fixture is not finished
+    """
+    if not fixture or fixture['fixture']['status']['short'] not in FINISHED_STATUSES:
+        return None
+        
+    home_score = fixture['goals']['home']
+    away_score = fixture['goals']['away']
+    
+    # Determine winner
+    if home_score > away_score:
+        result = "HOME_WIN"
+    elif away_score > home_score:
+        result = "AWAY_WIN"
+    else:
+        result = "DRAW"
+        
+    # Check if prediction was correct
+    is_home = fixture['teams']['home']['id'] == prediction['team_id']
+    
+    prediction_correct = False
+    
+    if prediction['prediction'] in ["WIN", "BIG WIN"]:
+        if (is_home and result == "HOME_WIN") or (not is_home and result == "AWAY_WIN"):
+            prediction_correct = True
+    elif prediction['prediction'] in ["LOSS", "BIG LOSS"]:
+        if (is_home and result == "AWAY_WIN") or (not is_home and result == "HOME_WIN"):
+            prediction_correct = True
+            
+    return result, 1 if prediction_correct else 0
+
+class PredictionPipeline:
+    """
+    Headless prediction pipeline, the steps FirebaseTab runs for one league
+    
+    Leagues are collected concurrently: form analysis, upcoming opponents and
+    predictions. All requests go through the rate limiter of the shared API client.
+    New predictions are saved in one transaction, then pending predictions are
+    checked against finished fixtures fetched in bulk. Seconds spent per stage
+    are kept in timings.
+    """
+    
+    def __init__(self, api, db_manager, form_length: int = 5, threshold: float = PERF_DIFF_THRESHOLD,
+                 max_workers: int = PREFETCH_WORKERS):
+        """
+        Args:
+            api: FootballAPI client
+            db_manager: DatabaseManager the predictions are saved to
+            form_length: Number of recent matches used for the form
+            threshold: Minimum absolute performance difference for a prediction
+            max_workers: Number of leagues collected at once
+        """
+        self.api = api
+        self.db_manager = db_manager
+        self.form_length = form_length
+        self.threshold = threshold
+        self.max_workers = max_workers
+        
+        self.timings = {}
+        
+    @contextmanager
+    def _stage(self, name: str):
+        """Measure the time spent in a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+            logger.info(f"Stage {name} took {self.timings[name]:.2f} s")
+            
+    def run(self, league_ids: Iterable[int], check_results: bool = True) -> Dict[str, Any]:
+        """
+        Run the pipeline for the given leagues
+        
+        Args:
+            league_ids: Leagues to create predictions for
+            check_results: Check results of pending predictions afterwards
+            
+        Returns:
+            dict: Counts of the run, failed leagues and timings per stage
+        """
+        league_ids = list(dict.fromkeys(league_ids))
+        self.timings = {}
+        
+        with self._stage("collect"):
+            predictions, failed_leagues = self.collect_predictions(league_ids)
+            
+        with self._stage("save"):
+            saved_count = self.db_manager.save_predictions(predictions)
+            
+        checked_count, correct_count = 0, 0
+        if check_results:
+            with self._stage("check_results"):
+                checked_count, correct_count = self.check_results()
+                
+        return {
+            "leagues": len(league_ids),
+            "failed_leagues": failed_leagues,
+            "predictions": len(predictions),
+            "saved": saved_count,
+            "checked": checked_count,
+            "correct": correct_count,
+            "timings": dict(self.timings)
+        }
+        
+    def collect_predictions(self, league_ids: List[int]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Create predictions for several leagues concurrently
+        
+        Returns:
+            tuple: Prediction rows ready for save_predictions and the leagues that failed
+        """
+        predictions = []
+        failed_leagues = []
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Pipeline") as executor:
+            futures = {executor.submit(self.collect_league, league_id): league_id for league_id in league_ids}
+            
+            for future in as_completed(futures):
+                league_id = futures[future]
+                try:
+                    league_predictions = future.result()
+                    predictions.extend(league_predictions)
+                    logger.info(f"League {league_id}: {len(league_predictions)} predictions")
+                except Exception as e:
+                    logger.error(f"Error collecting predictions for league {league_id}: {str(e)}")
+                    failed_leagues.append(league_id)
+                    
+        return predictions, failed_leagues
+        
+    def collect_league(self, league_id: int) -> List[Dict[str, Any]]:
+        """Create predictions for the teams of one league with significant form changes"""
+        form_data = self.api.fetch_all_teams({league_id: {"name": "", "flag": ""}}, self.form_length)
+        
+        predictions = []
+        fixtures = None
+        
+        for team_data in form_data:
+            if abs(team_data.get('performance_diff', 0)) < self.threshold:
+                continue
+                
+            # Fixtures are only needed once a team qualifies
+            if fixtures is None:
+                fixtures = self.api.fetch_fixtures(league_id)
+                
+            for match in FormAnalyzer.get_upcoming_opponents(fixtures, team_data['team_id'], 1):
+                prediction, prediction_level = generate_prediction(team_data['performance_diff'])
+                
+                predictions.append({
+                    'team_id': team_data['team_id'],
+                    'team_name': team_data['team'],
+                    'league_id': league_id,
+                    'league_name': get_league_display_name(league_id),
+                    'fixture_id': match['fixture_id'],
+                    'opponent_id': match['opponent_id'],
+                    'opponent_name': match['opponent'],
+                    'match_date': match['date'],
+                    'venue': match['venue'],
+                    'performance_diff': team_data['performance_diff'],
+                    'prediction': prediction,
+                    'prediction_level': prediction_level
+                })
+                
+        return predictions
+        
+    def check_results(self) -> Tuple[int, int]:
+        """
+        Check results of pending predictions
+        
+        Returns:
+            tuple: Number of checked and of correct predictions
+        """
+        pending = self.db_manager.get_predictions_to_check()
+        if not pending:
+            return 0, 0
+            
+        fixtures = self.api.fetch_fixtures_by_ids([prediction['fixture_id'] for prediction in pending])
+        
+        updates = []
+        correct_count = 0
+        
+        for prediction in pending:
+            evaluation = evaluate_prediction(prediction, fixtures.get(prediction['fixture_id']))
+            if evaluation is None:
+                continue
+                
+            result, correct = evaluation
+            updates.append((prediction['id'], result, correct))
+            correct_count += correct
+            
+        self.db_manager.update_prediction_results(updates)
+        
+        return len(updates), correct_count
@@ -0,0 +1,302 @@
+import heapq
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Callable, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+    
+    Tokens are added at a steady rate up to capacity. Every request takes one token
+    and waits while the bucket is empty, so concurrent callers together stay under
+    the rate while short bursts up to capacity go through right away.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of stored tokens, defaults to rate
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        
+    def _refill(self):
+        """Add the tokens earned since the last update, caller holds the lock"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, waiting until they are available
+        
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait, None waits as long as needed
+            
+        Returns:
+            bool: True if the tokens were taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+                
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+                
+            time.sleep(wait)
+            
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take tokens right away, going into debt if the bucket is empty
+        
+        For callers that must not block, e.g. coroutines, which then sleep
+        asynchronously for the returned time before making the request.
+        
+        Returns:
+            float: Seconds to wait before the tokens may be used
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+            
+    def drain(self, seconds: float):
+        """Empty the bucket so no request is made for about the given seconds, e.g. after a 429"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+# Response headers with the remaining requests of the day and of the minute
+DAILY_LIMIT_HEADER = "x-ratelimit-requests-limit"
+DAILY_REMAINING_HEADER = "x-ratelimit-requests-remaining"
+MINUTE_LIMIT_HEADER = "x-ratelimit-limit"
+MINUTE_REMAINING_HEADER = "x-ratelimit-remaining"
+
+# Retries of a request answered with 429, with exponential backoff in seconds
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2
+RETRY_MAX_DELAY = 60
+
+# A warning is logged once when fewer requests than this are left for the day
+LOW_DAILY_BUDGET = 100
+
+class RateLimitManager:
+    """
+    Tracks the request budget the API reports in its response headers
+    
+    Every response updates the remaining daily and per-minute requests. When the
+    minute budget is used up the token bucket is emptied until the next minute,
+    when the daily budget is used up no requests are made until midnight UTC,
+    when the API resets it. Requests answered with 429 are retried after
+    retry_delay(), the Retry-After header or a jittered exponential backoff, so
+    clients retrying at the same time do not hit the API together again.
+    
+    Listeners get the budget after every update, e.g. for the status bar.
+    """
+    
+    def __init__(self, bucket: Optional[TokenBucket] = None):
+        """
+        Args:
+            bucket: Token bucket of the client, paused when the minute budget is used up
+        """
+        self.bucket = bucket
+        
+        self.daily_limit = None
+        self.daily_remaining = None
+        self.minute_limit = None
+        self.minute_remaining = None
+        self.updated_at = None
+        
+        self._blocked_until = 0.0
+        self._paused_until = 0.0
+        self._low_budget_logged = False
+        self._listeners = []
+        self._lock = threading.Lock()
+        
+    def update(self, headers) -> Dict[str, Any]:
+        """
+        Read the budget from the headers of a response
+        
+        Args:
+            headers: Response headers, any mapping
+            
+        Returns:
+            dict: The budget, see get_budget
+        """
+        headers = {str(name).lower(): value for name, value in (headers or {}).items()}
+        
+        with self._lock:
+            self.daily_limit = _parse_int(headers.get(DAILY_LIMIT_HEADER), self.daily_limit)
+            self.daily_remaining = _parse_int(headers.get(DAILY_REMAINING_HEADER), self.daily_remaining)
+            self.minute_limit = _parse_int(headers.get(MINUTE_LIMIT_HEADER), self.minute_limit)
+            self.minute_remaining = _parse_int(headers.get(MINUTE_REMAINING_HEADER), self.minute_remaining)
+            self.updated_at = time.time()
+            
+            if self.daily_remaining is not None and self.daily_remaining <= 0:
+                # The daily budget resets at midnight UTC
+                self._blocked_until = (self.updated_at // 86400 + 1) * 86400
+            else:
+                self._blocked_until = 0.0
+                
+            # Pause once per minute, draining again would add up the waits
+            pause = (self.minute_remaining is not None and self.minute_remaining <= 0
+                     and self.updated_at >= self._paused_until)
+            if pause:
+                self._paused_until = (self.updated_at // 60 + 1) * 60
+                
+            low_budget = self.daily_remaining is not None and self.daily_remaining < LOW_DAILY_BUDGET
+            log_low_budget = low_budget and not self._low_budget_logged
+            self._low_budget_logged = low_budget
+            daily_remaining, daily_limit = self.daily_remaining, self.daily_limit
+            
+        if pause and self.bucket is not None:
+            self.bucket.drain(self._paused_until - time.time())
+            logger.info("Minute request budget used up, pausing requests until the next minute")
+            
+        if log_low_budget:
+            logger.warning(f"Only {daily_remaining} of {daily_limit} daily API requests left")
+            
+        budget = self.get_budget()
+        for listener in list(self._listeners):
+            try:
+                listener(budget)
+            except Exception as e:
+                logger.error(f"Error in rate limit listener: {str(e)}")
+                
+        return budget
+        
+    def can_request(self) -> bool:
+        """Check that the daily budget is not used up"""
+        return time.time() >= self._blocked_until
+        
+    def retry_delay(self, attempt: int, headers=None) -> float:
+        """
+        Get the seconds to wait before retrying a request answered with 429
+        
+        Args:
+            attempt: Number of retries made so far
+            headers: Headers of the 429 response, their Retry-After is used when present
+            
+        Returns:
+            float: Seconds to wait
+        """
+        retry_after = None
+        for name, value in (headers or {}).items():
+            if str(name).lower() == "retry-after":
+                retry_after = _parse_retry_after(value)
+                
+        if retry_after is not None:
+            # A little jitter, so waiting requests do not retry at the same moment
+            return min(retry_after, RETRY_MAX_DELAY) + random.uniform(0, 1)
+            
+        # Full jitter: anywhere between zero and the exponential backoff
+        return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+        
+    def get_budget(self) -> Dict[str, Any]:
+        """
+        Get the last known budget
+        
+        Returns:
+            dict: daily_limit, daily_remaining, minute_limit, minute_remaining (None
+                until a response reported them), updated_at and blocked
+        """
+        with self._lock:
+            return {
+                "daily_limit": self.daily_limit,
+                "daily_remaining": self.daily_remaining,
+                "minute_limit": self.minute_limit,
+                "minute_remaining": self.minute_remaining,
+                "updated_at": self.updated_at,
+                "blocked": time.time() < self._blocked_until
+            }
+            
+    def format_budget(self) -> str:
+        """Describe the budget in one line, empty before the first response"""
+        budget = self.get_budget()
+        parts = []
+        if budget["daily_remaining"] is not None:
+            parts.append(f"{budget['daily_remaining']}/{budget['daily_limit'] or '?'} today")
+        if budget["minute_remaining"] is not None:
+            parts.append(f"{budget['minute_remaining']}/{budget['minute_limit'] or '?'} this minute")
+        return ", ".join(parts)
+        
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call callback with the budget after every update, from the thread that made the request"""
+        self._listeners.append(callback)
+        
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Stop calling a listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+class RetryQueue:
+    """
+    Work items processed in order, with retries scheduled for later
+    
+    A retried item waits for its backoff while the items behind it go ahead, so
+    one rate limited request does not hold up a whole batch.
+    """
+    
+    def __init__(self, items: Iterable[Any]):
+        self._heap = [(0.0, index, 0, item) for index, item in enumerate(items)]
+        self._sequence = len(self._heap)
+        
+    def __len__(self) -> int:
+        return len(self._heap)
+        
+    def pop(self) -> Tuple[Any, int]:
+        """
+        Get the next item, waiting if only retries that are not due yet are left
+        
+        Returns:
+            tuple: (item, number of retries made so far)
+        """
+        due, sequence, attempt, item = heapq.heappop(self._heap)
+        wait = due - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        return item, attempt
+        
+    def retry(self, item: Any, attempt: int, delay: float):
+        """Schedule another attempt of an item after delay seconds"""
+        heapq.heappush(self._heap, (time.monotonic() + delay, self._sequence, attempt + 1, item))
+        self._sequence += 1
+
+def _parse_int(value, default: Optional[int]) -> Optional[int]:
+    """Parse an integer header, default if it is missing or invalid"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def _parse_retry_after(value) -> Optional[float]:
+    """Parse a Retry-After header, seconds or an HTTP date, None if invalid"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+        
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
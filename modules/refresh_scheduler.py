@@ -0,0 +1,288 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
+
+from modules.config import ALL_LEAGUES, FINISHED_STATUSES, MATCH_DURATION
+from modules.db_manager import get_fixture_timestamp
+from modules.league_names import LEAGUE_NAMES
+
+logger = logging.getLogger(__name__)
+
+# Data refreshed for every league, in this order. Form is computed from the
+# standings and fixtures refreshed right before it and needs no requests
+REFRESH_TOPICS = ("standings", "fixtures", "form")
+
+# Leagues with a kickoff within this many seconds are refreshed every interval
+IMMINENT_KICKOFF_WINDOW = 24 * 60 * 60
+
+# Other leagues are refreshed at most once in this many seconds
+IDLE_LEAGUE_INTERVAL = 6 * 60 * 60
+
+class RefreshScheduler:
+    """
+    Refreshes standings, fixtures and form data in a background thread
+    
+    Every refresh interval the scheduler plans a cycle: leagues with the nearest
+    kickoff (or a match in progress) come first, leagues without a match soon are
+    only refreshed every IDLE_LEAGUE_INTERVAL. The requests of a cycle are spread
+    evenly over the interval instead of being sent at once, so auto refresh stays
+    far below the API quota.
+    
+    Refreshed data is pushed to subscribers, once per league when all its topics
+    are refreshed and once per cycle to subscribers of ALL_LEAGUES. Callbacks are
+    called from the scheduler thread, Tk widgets have to hand them over to the
+    main thread, see BaseTab._subscribe_refresh.
+    """
+    
+    # Scheduler shared by the whole application, see shared()
+    _shared = None
+    
+    def __init__(self, api, form_length: int = 5):
+        self.api = api
+        self.form_length = form_length
+        
+        self.enabled = False
+        self.interval = 30 * 60
+        self.leagues = []
+        
+        self._subscriptions = []
+        self._next_kickoff = {}
+        self._last_refresh = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+        
+    @classmethod
+    def shared(cls, api) -> "RefreshScheduler":
+        """Get the application wide scheduler, created on first use"""
+        if cls._shared is None:
+            cls._shared = cls(api)
+        return cls._shared
+        
+    def configure(self, enabled: bool, interval_minutes: int, leagues: Optional[Iterable[int]] = None,
+                  form_length: Optional[int] = None):
+        """
+        Apply the auto refresh settings, a running cycle is planned again
+        
+        Args:
+            enabled: Whether data is refreshed automatically
+            interval_minutes: Length of a refresh cycle
+            leagues: Leagues refreshed in addition to the ones subscribers show
+            form_length: Number of recent matches used for the form
+        """
+        with self._lock:
+            previous = (self.enabled, self.interval, self.leagues)
+            self.enabled = bool(enabled)
+            self.interval = max(1, int(interval_minutes)) * 60
+            if leagues is not None:
+                self.leagues = list(leagues)
+            if form_length is not None:
+                self.form_length = form_length
+            changed = previous != (self.enabled, self.interval, self.leagues)
+            
+        # Saving unrelated settings must not start a new cycle
+        if changed:
+            self._wake.set()
+            logger.info(f"Auto refresh {'enabled' if self.enabled else 'disabled'}, every {self.interval // 60} minutes")
+            
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="RefreshScheduler", daemon=True)
+            self._thread.start()
+            
+    def subscribe(self, callback: Callable[[int, Dict[Any, Any]], None], topics: Iterable[str] = REFRESH_TOPICS,
+                  league_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get refreshed data pushed to a callback
+        
+        Args:
+            callback: Called with (league_id, data) from the scheduler thread, once per
+                refreshed league with data mapping the subscribed topics to their data.
+                Subscribers of ALL_LEAGUES are called once per cycle with ALL_LEAGUES
+                and data mapping every refreshed league id to its topics
+            topics: Topics to receive, see REFRESH_TOPICS
+            league_id: League the subscriber shows, it is refreshed too. Can be changed
+                later through the "league_id" key of the returned subscription, None
+                receives every league separately, ALL_LEAGUES refreshes all known leagues
+                
+        Returns:
+            dict: The subscription, pass it to unsubscribe
+        """
+        subscription = {"callback": callback, "topics": set(topics), "league_id": league_id}
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+        
+    def unsubscribe(self, subscription: Dict[str, Any]):
+        """Stop pushing data to a subscription"""
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+                
+    def stop(self):
+        """Stop the scheduler thread after the current request"""
+        self._stopped = True
+        self._wake.set()
+        
+    def get_leagues(self) -> List[int]:
+        """Get the configured leagues and the leagues subscribers show, ALL_LEAGUES stands for all known leagues"""
+        with self._lock:
+            leagues = list(self.leagues)
+            leagues.extend(subscription["league_id"] for subscription in self._subscriptions)
+            
+        if ALL_LEAGUES in leagues:
+            leagues.extend(league_id for league_id in LEAGUE_NAMES if isinstance(league_id, int))
+            
+        return [league_id for league_id in dict.fromkeys(leagues)
+                if league_id is not None and league_id != ALL_LEAGUES]
+                
+    def plan_cycle(self, now: Optional[float] = None) -> List[Tuple[str, int]]:
+        """
+        Plan the refreshes of one cycle
+        
+        Returns:
+            list: (topic, league_id) jobs, the leagues with the nearest kickoff first
+        """
+        now = time.time() if now is None else now
+        due = []
+        
+        for league_id in self.get_leagues():
+            kickoff = self._next_kickoff.get(league_id)
+            last_refresh = self._last_refresh.get(league_id)
+            
+            # Leagues without a match soon do not change, skip them for a while
+            imminent = kickoff is not None and kickoff - now < IMMINENT_KICKOFF_WINDOW
+            if last_refresh is not None and not imminent and now - last_refresh < IDLE_LEAGUE_INTERVAL:
+                continue
+                
+            # Leagues never refreshed first, then by kickoff, matches in progress have passed kickoffs
+            if last_refresh is None:
+                priority = float("-inf")
+            elif kickoff is None:
+                priority = float("inf")
+            else:
+                priority = kickoff - now
+            due.append((priority, league_id))
+            
+        due.sort(key=lambda item: item[0])
+        
+        return [(topic, league_id) for priority, league_id in due for topic in REFRESH_TOPICS]
+        
+    def _run(self):
+        """Run refresh cycles until stopped"""
+        while not self._stopped:
+            if not self.enabled:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+                
+            self._wake.clear()
+            cycle_start = time.monotonic()
+            jobs = self.plan_cycle()
+            spacing = self.interval / max(len(jobs), 1)
+            
+            if jobs:
+                logger.info(f"Auto refresh of {len(jobs) // len(REFRESH_TOPICS)} leagues, "
+                            f"one refresh every {spacing:.0f} s")
+                            
+            replan = False
+            refreshed = {}
+            for index, (topic, league_id) in enumerate(jobs):
+                league_data = refreshed.setdefault(league_id, {})
+                self._run_job(topic, league_id, league_data)
+                
+                # Subscribers reload once per league, after its last topic
+                if topic == REFRESH_TOPICS[-1] and league_data:
+                    self._publish(league_id, league_data)
+                    
+                # Wait for the slot of the next job, settings changes plan again
+                if self._wake.wait(max(0, cycle_start + (index + 1) * spacing - time.monotonic())):
+                    replan = True
+                    break
+                    
+            self._publish_all_leagues({league_id: data for league_id, data in refreshed.items() if data})
+            
+            if not jobs and not replan:
+                self._wake.wait(self.interval)
+                
+    def _run_job(self, topic: str, league_id: int, league_data: Dict[str, Any]):
+        """Refresh one topic of a league, the data is added to league_data unless it failed"""
+        try:
+            if topic == "standings":
+                self.api.expire_league(league_id, ("standings",))
+                data = self.api.fetch_standings(league_id)
+            elif topic == "fixtures":
+                self.api.expire_league(league_id, ("fixtures",))
+                data = self.api.fetch_fixtures(league_id)
+                self._next_kickoff[league_id] = self._get_next_kickoff(data or [])
+            else:
+                data = self.api.fetch_all_teams({league_id: {"name": "", "flag": ""}}, self.form_length)
+                self._last_refresh[league_id] = time.time()
+                
+        except Exception as e:
+            logger.error(f"Error refreshing {topic} of league {league_id}: {str(e)}")
+            return
+            
+        league_data[topic] = data
+        
+    def _get_next_kickoff(self, fixtures: List[Dict[str, Any]]) -> Optional[int]:
+        """Get the kickoff of the next or running unfinished fixture, None if there is none"""
+        earliest = time.time() - MATCH_DURATION
+        kickoffs = []
+        
+        for fixture in fixtures:
+            try:
+                if fixture['fixture']['status']['short'] in FINISHED_STATUSES:
+                    continue
+            except (KeyError, TypeError):
+                continue
+                
+            kickoff = get_fixture_timestamp(fixture)
+            if kickoff is not None and kickoff >= earliest:
+                kickoffs.append(kickoff)
+                
+        return min(kickoffs) if kickoffs else None
+        
+    def _publish(self, league_id: int, league_data: Dict[str, Any]):
+        """Push the refreshed topics of a league to its subscribers"""
+        with self._lock:
+            subscriptions = [
+                subscription for subscription in self._subscriptions
+                if subscription["league_id"] in (None, league_id)
+            ]
+            
+        for subscription in subscriptions:
+            data = {topic: value for topic, value in league_data.items() if topic in subscription["topics"]}
+            if data:
+                self._notify(subscription, league_id, data)
+                
+    def _publish_all_leagues(self, refreshed: Dict[int, Dict[str, Any]]):
+        """Push the leagues refreshed in a cycle to the subscribers of ALL_LEAGUES"""
+        with self._lock:
+            subscriptions = [
+                subscription for subscription in self._subscriptions
+                if subscription["league_id"] == ALL_LEAGUES
+            ]
+            
+        if not subscriptions or not refreshed:
+            return
+            
+        # The combined entries are rebuilt from the refreshed leagues on the next fetch
+        self.api.expire_league(ALL_LEAGUES)
+        
+        for subscription in subscriptions:
+            data = {}
+            for league_id, league_data in refreshed.items():
+                topics = {topic: value for topic, value in league_data.items() if topic in subscription["topics"]}
+                if topics:
+                    data[league_id] = topics
+            if data:
+                self._notify(subscription, ALL_LEAGUES, data)
+                
+    def _notify(self, subscription: Dict[str, Any], league_id: int, data: Dict[Any, Any]):
+        """Call a subscriber, its errors do not stop the scheduler"""
+        try:
+            subscription["callback"](league_id, data)
+        except Exception as e:
+            logger.error(f"Error in refresh subscriber: {str(e)}")
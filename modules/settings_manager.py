@@ -2,7 +2,6 @@ import json
 import os
 import logging
 from typing import Dict, List, Any, Optional
-import customtkinter as ctk
 
 from modules.config import DEFAULT_SETTINGS, THEMES
 
@@ -68,6 +67,22 @@ class SettingsManager:
         """Get refresh interval in minutes"""
         return self.settings.get("refresh_interval", DEFAULT_SETTINGS.get("refresh_interval"))
         
+    def get_warm_up_tabs(self) -> bool:
+        """Get whether unopened tabs are built in the background after startup"""
+        return self.settings.get("warm_up_tabs", DEFAULT_SETTINGS.get("warm_up_tabs"))
+        
+    def get_log_buffer_capacity(self) -> int:
+        """Get the number of log records kept for the logs tab"""
+        return self.settings.get("log_buffer_capacity", DEFAULT_SETTINGS.get("log_buffer_capacity"))
+        
+    def get_log_to_file(self) -> bool:
+        """Get whether log records are written to a rotating log file"""
+        return self.settings.get("log_to_file", DEFAULT_SETTINGS.get("log_to_file"))
+        
+    def get_log_file_path(self) -> str:
+        """Get the path of the rotating log file"""
+        return self.settings.get("log_file_path", DEFAULT_SETTINGS.get("log_file_path"))
+        
     def get_appearance_mode(self) -> str:
         """Get appearance mode"""
         return self.settings.get("appearance_mode", DEFAULT_SETTINGS.get("appearance_mode"))
@@ -96,6 +111,9 @@ class SettingsManager:
         
     def apply_appearance_settings(self):
         """Apply appearance settings to CustomTkinter"""
+        # Imported here so the settings can be read without a display, e.g. by batch_predict.py
+        import customtkinter as ctk
+        
         # Set appearance mode
         appearance_mode = self.get_appearance_mode()
         ctk.set_appearance_mode(appearance_mode)
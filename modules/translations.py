@@ -176,6 +176,10 @@ EN_TO_SK = {
     "Refresh Failed": "Obnovenie zlyhalo",
     "Export": "Export",
     "Exported to": "Exportované do",
+    "Exporting": "Exportuje sa",
+    "Export Failed": "Export zlyhal",
+    "rows": "riadkov",
+    "scroll for more": "posuňte pre ďalšie",
     "Error": "Chyba",
     "Country": "Krajina",
     "Logo URL": "URL loga",
@@ -193,6 +197,10 @@ EN_TO_SK = {
     "Coming Soon": "Čoskoro",
     "Ready": "Pripravené",
     "Settings updated at": "Nastavenia aktualizované o",
+    "API requests left": "Zostávajúce API požiadavky",
+    "today": "dnes",
+    "this minute": "túto minútu",
+    "API request limit reached": "Limit API požiadaviek vyčerpaný",
     "Football Statistics Analyzer": "Analyzátor futbalových štatistík"
 }
 
@@ -0,0 +1,248 @@
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Environment variable with the path of the cache database, all workers using the
+# same path share their cache. Empty disables the shared cache
+CACHE_PATH_ENV = "FOOTBALL_CACHE_PATH"
+DEFAULT_CACHE_PATH = os.path.join("cache", "football_cache.db")
+
+# Expired entries are deleted every this many writes
+PURGE_EVERY = 500
+
+class SharedCache:
+    """
+    Cache shared by processes through a SQLite database in WAL mode
+    
+    Gunicorn workers of the Dash server each have their own FootballAPI. With this
+    cache a response fetched by one worker is a cache hit for all others. Every
+    write is a single INSERT OR REPLACE, so readers see either the old or the new
+    entry. WAL mode lets workers read while another one writes.
+    
+    Values are pickled, so cached dicts keep their integer keys. The database is a
+    local cache file, never point it at data from untrusted sources.
+    
+    The workers and the cache warmer also publish snapshots of their API request
+    counters here (see ApiMetrics), so /metrics can report all processes. Locks
+    let one of the workers run a job, e.g. the cache warmer.
+    """
+    
+    def __init__(self, path: str, max_age: float = 24 * 60 * 60):
+        """
+        Args:
+            path: Path of the cache database, created if missing
+            max_age: Seconds after which entries of every tier are deleted
+        """
+        self.path = path
+        self.max_age = max_age
+        
+        self._local = threading.local()
+        self._writes = 0
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                tier TEXT NOT NULL,
+                value BLOB NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS metrics (
+                process TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS locks (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        conn.commit()
+        
+    @classmethod
+    def from_env(cls, max_age: float = 24 * 60 * 60) -> Optional["SharedCache"]:
+        """Create the cache configured by FOOTBALL_CACHE_PATH, None if it is disabled or fails"""
+        path = os.environ.get(CACHE_PATH_ENV, DEFAULT_CACHE_PATH)
+        if not path:
+            return None
+            
+        try:
+            return cls(path, max_age)
+        except Exception as e:
+            logger.error(f"Error opening shared cache {path}, using the process cache: {str(e)}")
+            return None
+            
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection of the current thread"""
+        conn = getattr(self._local, "conn", None)
+        
+        # A connection inherited from the gunicorn master must not be used after the fork
+        if conn is None or self._local.pid != os.getpid():
+            # Writers wait for each other instead of failing while another worker writes
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+        
+    def get(self, key: str, tier: str, max_age: float) -> Optional[Tuple[Any, float]]:
+        """
+        Get an entry that is younger than max_age
+        
+        Args:
+            key: Cache key
+            tier: Cache tier the entry was stored in
+            max_age: Maximum age in seconds
+            
+        Returns:
+            tuple: (value, stored_at), None if missing or expired
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT value, stored_at FROM cache WHERE key = ? AND tier = ? AND stored_at > ?",
+                (key, tier, time.time() - max_age)
+            ).fetchone()
+            if row is None:
+                return None
+            return pickle.loads(row[0]), row[1]
+            
+        except Exception as e:
+            logger.error(f"Error reading shared cache entry {key}: {str(e)}")
+            return None
+            
+    def get_stored_at(self, key: str, tier: str) -> Optional[float]:
+        """Get the time an entry was stored without loading it, None if missing"""
+        try:
+            row = self._connect().execute(
+                "SELECT stored_at FROM cache WHERE key = ? AND tier = ?", (key, tier)
+            ).fetchone()
+            return row[0] if row is not None else None
+            
+        except Exception as e:
+            logger.error(f"Error reading shared cache entry {key}: {str(e)}")
+            return None
+            
+    def set(self, key: str, tier: str, value: Any) -> Optional[float]:
+        """Store an entry, returns the time it was stored or None on failure"""
+        stored_at = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, tier, value, stored_at) VALUES (?, ?, ?, ?)",
+                    (key, tier, sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)), stored_at)
+                )
+                
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                self.purge()
+                
+            return stored_at
+            
+        except Exception as e:
+            logger.error(f"Error writing shared cache entry {key}: {str(e)}")
+            return None
+            
+    def delete(self, key: str):
+        """Delete an entry"""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        except Exception as e:
+            logger.error(f"Error deleting shared cache entry {key}: {str(e)}")
+            
+    def set_metrics(self, process: str, snapshot: Dict[str, Any]) -> bool:
+        """Store the metrics snapshot of a process, replacing its previous one"""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO metrics (process, value, updated_at) VALUES (?, ?, ?)",
+                    (process, sqlite3.Binary(pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL)), time.time())
+                )
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error writing metrics of {process}: {str(e)}")
+            return False
+            
+    def get_metrics(self, max_age: float) -> List[Dict[str, Any]]:
+        """Get the metrics snapshots of all processes updated within max_age seconds"""
+        try:
+            rows = self._connect().execute(
+                "SELECT value FROM metrics WHERE updated_at > ? ORDER BY process",
+                (time.time() - max_age,)
+            ).fetchall()
+            return [pickle.loads(row[0]) for row in rows]
+            
+        except Exception as e:
+            logger.error(f"Error reading metrics: {str(e)}")
+            return []
+            
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        Take a lock or renew it, held by at most one owner at a time
+        
+        Args:
+            name: Lock name
+            owner: Unique id of the process taking it, e.g. its pid
+            ttl: Seconds after which the lock is free again unless renewed
+            
+        Returns:
+            bool: Whether owner holds the lock
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO locks (name, owner, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                    "WHERE locks.owner = excluded.owner OR locks.expires_at < ?",
+                    (name, owner, now + ttl, now)
+                )
+                row = conn.execute("SELECT owner FROM locks WHERE name = ?", (name,)).fetchone()
+            return row is not None and row[0] == owner
+            
+        except Exception as e:
+            logger.error(f"Error taking lock {name}: {str(e)}")
+            return False
+            
+    def release_lock(self, name: str, owner: str):
+        """Release a lock if owner holds it"""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM locks WHERE name = ? AND owner = ?", (name, owner))
+        except Exception as e:
+            logger.error(f"Error releasing lock {name}: {str(e)}")
+            
+    def purge(self) -> int:
+        """Delete entries older than max_age, returns the number of deleted entries"""
+        try:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute("DELETE FROM cache WHERE stored_at < ?", (time.time() - self.max_age,))
+                conn.execute("DELETE FROM metrics WHERE updated_at < ?", (time.time() - self.max_age,))
+            return cursor.rowcount
+            
+        except Exception as e:
+            logger.error(f"Error purging shared cache: {str(e)}")
+            return 0
@@ -7,6 +7,8 @@ from typing import Dict, List, Any, Optional, Callable
 from modules.api_client import FootballAPI
 from modules.db_manager import DatabaseManager
 from modules.settings_manager import SettingsManager
+from modules.background import BackgroundRunner
+from modules.refresh_scheduler import RefreshScheduler
 from modules.translations import translate
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,9 @@ logger = logging.getLogger(__name__)
 class BaseTab:
     """Base class for all tabs with common functionality"""
     
+    # Worker pool shared by all tabs, created on first use
+    _runner = None
+    
     def __init__(self, parent, api: FootballAPI, db_manager: DatabaseManager, settings_manager: SettingsManager):
         self.parent = parent
         self.api = api
@@ -55,8 +60,14 @@ class BaseTab:
         self.loading_indicator_label.pack(pady=10, padx=20)
         # Don't pack the frame initially - it will be shown when needed
         
-    def _create_table(self, parent, columns, height=400):
-        """Create a table with the given columns and increased font size"""
+    def _create_table(self, parent, columns, height=400, on_scroll_end=None, virtual=False):
+        """Create a table with the given columns and increased font size
+        
+        If on_scroll_end is given it is called whenever the table is scrolled
+        to its last row, which lets callers load more rows on demand.
+        If virtual is True a VirtualTable is returned, which only keeps the
+        visible rows in the Treeview and is filled with set_rows.
+        """
         # Create frame for table
         frame = ctk.CTkFrame(parent)
         frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -81,6 +92,16 @@ class BaseTab:
         hsb = ttk.Scrollbar(frame, orient="horizontal", command=table.xview)
         table.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
         
+        if virtual:
+            table = VirtualTable(table, vsb)
+        elif on_scroll_end:
+            def _on_yscroll(first, last):
+                vsb.set(first, last)
+                if float(last) >= 1.0:
+                    on_scroll_end()
+                    
+            table.configure(yscrollcommand=_on_yscroll)
+        
         # Grid layout
         table.grid(column=0, row=0, sticky="nsew")
         vsb.grid(column=1, row=0, sticky="ns")
@@ -190,6 +211,124 @@ class BaseTab:
         else:
             button.configure(text=translate(original_text), state="normal")
             
+    def _run_in_background(self, func, *args, on_success=None, on_error=None, key="load", **kwargs):
+        """
+        Run blocking work (API requests, database reads, analysis) in a worker thread
+        
+        func must not touch widgets or Tk variables, read them before starting the task.
+        Starting a task with the same key again drops the result of the previous one,
+        so a slow load for an old selection never overwrites a newer one.
+        
+        Args:
+            func: Function to run in the worker thread
+            *args, **kwargs: Arguments for func
+            on_success: Called on the main thread with the return value of func
+            on_error: Called on the main thread with the exception raised by func
+            key: Task key, unique within this tab
+            
+        Returns:
+            Future: The future of the task
+        """
+        self._ensure_runner()
+        
+        return BaseTab._runner.run(
+            (id(self), key), func, *args,
+            on_success=on_success, on_error=on_error, **kwargs
+        )
+        
+    def _ensure_runner(self):
+        """Create the shared worker pool, must be called on the main thread"""
+        if BaseTab._runner is None:
+            BaseTab._runner = BackgroundRunner.shared(self.parent.winfo_toplevel())
+            
+    def _post_to_ui(self, callback, *args):
+        """Run a callback on the main thread, used by background tasks to report progress"""
+        if BaseTab._runner is not None:
+            BaseTab._runner.post(callback, *args)
+            
+    def _cancel_background(self, key="load"):
+        """Cancel a background task of this tab and drop its result"""
+        if BaseTab._runner is not None:
+            BaseTab._runner.cancel((id(self), key))
+            
+    def _task_cancelled(self):
+        """Check from inside a background task if it was cancelled or superseded"""
+        return BaseTab._runner is not None and BaseTab._runner.task_cancelled()
+        
+    def _subscribe_refresh(self, topics):
+        """
+        Reload the tab when auto refresh has new data for the selected league
+        
+        The tab needs a selected_league variable and a _refresh_data method. The
+        league the tab shows is refreshed by the scheduler too, with "All leagues"
+        every known league. The scheduler notifies the tab once per league and
+        cycle, after it refreshed the API cache, so the reload needs no requests.
+        
+        Args:
+            topics: Scheduler topics that trigger a reload, see REFRESH_TOPICS
+        """
+        self._ensure_runner()
+        self._last_refreshed = None
+        
+        # Scheduler callbacks run in its thread, hand them over to the main thread
+        self._refresh_subscription = RefreshScheduler.shared(self.api).subscribe(
+            lambda league_id, data: self._post_to_ui(self._on_scheduled_refresh, league_id, data),
+            topics,
+            self.selected_league.get()
+        )
+        self.selected_league.trace_add("write", lambda *args: self._on_refresh_league_changed())
+        
+    def _on_refresh_league_changed(self):
+        """Let the scheduler refresh the newly selected league"""
+        try:
+            self._refresh_subscription["league_id"] = self.selected_league.get()
+        except tk.TclError:
+            pass
+            
+    def _on_scheduled_refresh(self, league_id, data):
+        """Reload the tab from the refreshed cache when its data changed (runs on the main thread)"""
+        if self.selected_league.get() != league_id:
+            return
+            
+        # Nothing the tab shows changed since the last refresh
+        if data == self._last_refreshed:
+            return
+        self._last_refreshed = data
+        
+        logger.debug(f"Auto refresh of {self.__class__.__name__} for league {league_id}")
+        self._refresh_data()
+            
+    def _when_done(self, futures, callback, interval=50):
+        """
+        Call callback on the Tk main thread once background futures are done
+        
+        Args:
+            futures: A Future or a list of Futures, e.g. from db_manager.writer.submit
+            callback: Called with (result, error). For a list, result is the list of
+                results and error is the first error raised, if any
+            interval: Polling interval in milliseconds
+        """
+        single = not isinstance(futures, (list, tuple))
+        pending = [futures] if single else list(futures)
+        
+        def check():
+            if not all(future.done() for future in pending):
+                self.parent.after(interval, check)
+                return
+                
+            results = []
+            error = None
+            for future in pending:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(None)
+                    error = error or e
+                    
+            callback(results[0] if single else results, error)
+            
+        check()
+        
     def update_settings(self):
         """Update settings from settings manager"""
         # Update theme
@@ -204,6 +343,286 @@ class BaseTab:
         # This method should be overridden by subclasses to update specific UI elements
         pass
 
+class VirtualTable:
+    """
+    Treeview that only holds the rows currently in view
+    
+    All rows are kept in a list, the model. Sorting and filtering run on the model
+    and the Treeview only gets the window of rows that fits on screen, so tables with
+    thousands of rows stay fast to fill, sort and scroll. Other Treeview methods like
+    heading, column, tag_configure and bind are passed through to the Treeview.
+    """
+    
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        
+        self.rows = []  # (values, tags) of all rows
+        self.view = []  # Indexes of the filtered and sorted rows
+        self.first = 0  # Position in view of the first visible row
+        self.sort_column = None
+        self.sort_reverse = False
+        self._filter = None
+        self._selected = set()
+        
+        # The scrollbar scrolls the model, not the Treeview
+        self.scrollbar.configure(command=self.yview)
+        self.tree.configure(yscrollcommand=lambda first, last: None)
+        
+        self.tree.bind("<Configure>", lambda event: self.refresh())
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda event: self._on_arrow_key(-1))
+        self.tree.bind("<Down>", lambda event: self._on_arrow_key(1))
+        self.tree.bind("<Prior>", lambda event: self._scroll_by(-self._visible_count()))
+        self.tree.bind("<Next>", lambda event: self._scroll_by(self._visible_count()))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        
+    def __getattr__(self, name):
+        return getattr(self.tree, name)
+        
+    def __getitem__(self, key):
+        return self.tree[key]
+        
+    def set_rows(self, rows: List[tuple], keep_position: bool = False):
+        """
+        Replace the rows of the table
+        
+        Args:
+            rows: List of (values, tags) tuples
+            keep_position: Keep the scroll position instead of going back to the top
+        """
+        self.rows = list(rows)
+        self._selected = set()
+        if not keep_position:
+            self.first = 0
+        self._apply()
+        
+    def set_filter(self, predicate: Optional[Callable[[tuple], bool]]):
+        """Only show rows whose values match the predicate, None shows all rows"""
+        self._filter = predicate
+        self.first = 0
+        self._apply()
+        
+    def sort(self, column: int, reverse: Optional[bool] = None):
+        """Sort the rows by a column, sorting by the same column again reverses the order"""
+        if reverse is None:
+            reverse = not self.sort_reverse if column == self.sort_column else False
+            
+        self.sort_column = column
+        self.sort_reverse = reverse
+        self.first = 0
+        self._apply()
+        self._update_headings()
+        
+    def clear_sort(self):
+        """Show the rows in their original order"""
+        self.sort_column = None
+        self.sort_reverse = False
+        self._apply()
+        self._update_headings()
+        
+    def enable_sorting(self):
+        """Sort the table when a column heading is clicked"""
+        for i, col in enumerate(self.tree["columns"]):
+            self.tree.heading(col, command=lambda c=i: self.sort(c))
+            
+    def get_row(self, item: str) -> Optional[tuple]:
+        """Get the values of a row from its Treeview item id"""
+        try:
+            return self.rows[int(item)][0]
+        except (ValueError, IndexError):
+            return None
+            
+    def selected_rows(self) -> List[tuple]:
+        """Get the values of all selected rows, including rows scrolled out of view"""
+        return [self.rows[index][0] for index in sorted(self._selected)]
+        
+    def refresh(self):
+        """Show the rows at the current scroll position"""
+        count = self._visible_count()
+        total = len(self.view)
+        self.first = max(0, min(self.first, total - count))
+        
+        # Item ids are model indexes, so rows that stay in view are not redrawn
+        sync_treeview(self.tree, [
+            (index, self.rows[index][0], self.rows[index][1])
+            for index in self.view[self.first:self.first + count]
+        ])
+        
+        visible_selected = [str(index) for index in self.view[self.first:self.first + count] if index in self._selected]
+        if visible_selected:
+            self.tree.selection_set(visible_selected)
+            
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + count) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            
+    def yview(self, *args):
+        """Scrollbar command, moves the visible window over the model"""
+        if not args:
+            return
+            
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.view))
+            self.refresh()
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._visible_count()
+            self._scroll_by(step)
+            
+    def _apply(self):
+        """Filter and sort the model and show the result"""
+        view = [
+            index for index, (values, tags) in enumerate(self.rows)
+            if self._filter is None or self._filter(values)
+        ]
+        
+        if self.sort_column is not None:
+            column = self.sort_column
+            view.sort(
+                key=lambda index: _sort_key(self.rows[index][0][column] if column < len(self.rows[index][0]) else ""),
+                reverse=self.sort_reverse
+            )
+            
+        self.view = view
+        self.refresh()
+        
+    def _update_headings(self):
+        """Show the sort direction in the column headings"""
+        for i, col in enumerate(self.tree["columns"]):
+            text = self.tree.heading(col)["text"].rstrip("▲▼ ")
+            if i == self.sort_column:
+                arrow = "▼" if self.sort_reverse else "▲"
+                self.tree.heading(col, text=f"{text} {arrow}")
+            else:
+                self.tree.heading(col, text=text)
+                
+    def _visible_count(self) -> int:
+        """Number of rows that fit in the Treeview"""
+        try:
+            row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        except (ValueError, tk.TclError):
+            row_height = 20
+            
+        height = self.tree.winfo_height()
+        if height <= 1:
+            # Not drawn yet, show a first screen of rows until the size is known
+            return 50
+        return max(1, height // row_height)
+        
+    def _scroll_by(self, step: int):
+        """Scroll the visible window by a number of rows"""
+        self.first += step
+        self.refresh()
+        return "break"
+        
+    def _on_mousewheel(self, event):
+        """Scroll with the mouse wheel"""
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+        
+    def _on_arrow_key(self, step: int):
+        """Move the selection with the arrow keys, scrolling at the edges of the window"""
+        children = self.tree.get_children()
+        focus = self.tree.focus()
+        if not children or focus not in children:
+            return None
+            
+        position = children.index(focus) + step
+        if 0 <= position < len(children):
+            # Let the Treeview move the selection inside the window
+            return None
+            
+        self._scroll_by(step)
+        
+        children = self.tree.get_children()
+        item = children[0] if step < 0 else children[-1]
+        self.tree.focus(item)
+        self.tree.selection_set(item)
+        return "break"
+        
+    def _on_select(self, event=None):
+        """Remember the selection so it survives scrolling"""
+        visible = {int(item) for item in self.tree.get_children()}
+        self._selected = {index for index in self._selected if index not in visible}
+        self._selected.update(int(item) for item in self.tree.selection())
+
+def sync_treeview(tree: ttk.Treeview, rows: List[tuple], parent: str = "") -> Dict[str, int]:
+    """
+    Make the rows under parent match a new list of rows with as few changes as possible
+    
+    Rows are matched by item id. Rows that are gone are deleted, new rows are inserted,
+    rows with changed values or tags are updated and rows out of place are moved.
+    Unchanged rows are not touched, so refreshing a table that barely changed is cheap.
+    
+    Args:
+        tree: Treeview to update
+        rows: List of (item id, values, tags) tuples in display order
+        parent: Parent item of the rows, "" for top level rows
+        
+    Returns:
+        dict: Number of inserted, updated, deleted and moved rows
+    """
+    counts = {"inserted": 0, "updated": 0, "deleted": 0, "moved": 0}
+    
+    new_ids = {str(row[0]) for row in rows}
+    order = []
+    stale = []
+    for item in tree.get_children(parent):
+        if item in new_ids:
+            order.append(item)
+        else:
+            stale.append(item)
+            
+    if stale:
+        tree.delete(*stale)
+        counts["deleted"] = len(stale)
+        
+    current = set(order)
+    
+    for index, (item, values, tags) in enumerate(rows):
+        item = str(item)
+        values = tuple(values)
+        tags = tuple(tags)
+        
+        if item not in current and not tree.exists(item):
+            tree.insert(parent, index, iid=item, values=values, tags=tags)
+            order.insert(index, item)
+            current.add(item)
+            counts["inserted"] += 1
+            continue
+            
+        # Tk hands values back as strings or numbers, so compare their text
+        old = tree.item(item)
+        if (tuple(str(value) for value in old["values"] or ()) != tuple(str(value) for value in values)
+                or tuple(str(tag) for tag in old["tags"] or ()) != tuple(str(tag) for tag in tags)):
+            tree.item(item, values=values, tags=tags)
+            counts["updated"] += 1
+            
+        if item not in current:
+            # Row exists under another parent
+            tree.move(item, parent, index)
+            order.insert(index, item)
+            current.add(item)
+            counts["moved"] += 1
+        elif index >= len(order) or order[index] != item:
+            tree.move(item, parent, index)
+            order.remove(item)
+            order.insert(index, item)
+            counts["moved"] += 1
+            
+    return counts
+
+def _sort_key(value):
+    """Sort numbers numerically and everything else as text"""
+    try:
+        return (0, float(value), "")
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value).lower())
+
 class ToolTip:
     """Custom tooltip implementation"""
     def __init__(self, widget, text):
@@ -2,8 +2,6 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, filedialog
 import logging
-import csv
-import json
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Callable
 
@@ -12,9 +10,18 @@ from modules.api_client import FootballAPI
 from modules.db_manager import DatabaseManager
 from modules.settings_manager import SettingsManager
 from modules.league_names import get_league_options, get_league_display_name
+from modules.exporter import detect_format, export_rows
 
 logger = logging.getLogger(__name__)
 
+# Export columns for each collected data type
+EXPORT_COLUMNS = {
+    "Fixtures": ["id", "home_team", "away_team", "date", "status", "score"],
+    "Teams": ["id", "name", "country", "founded", "stadium", "capacity"],
+    "Players": ["id", "name", "team", "position", "age", "nationality"],
+    "Standings": ["position", "team", "played", "wins", "draws", "losses", "goals_for", "goals_against", "points"]
+}
+
 class DataCollectionTab(BaseTab):
     def __init__(self, parent, api: FootballAPI, db_manager: DatabaseManager, settings_manager: SettingsManager):
         super().__init__(parent, api, db_manager, settings_manager)
@@ -116,6 +123,15 @@ class DataCollectionTab(BaseTab):
         self.data_frame = ctk.CTkFrame(self.content_frame)
         self.data_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
+        # Filter for the table rows
+        self.filter_entry = ctk.CTkEntry(
+            self.data_frame,
+            placeholder_text="Filter rows...",
+            font=ctk.CTkFont(size=12)
+        )
+        self.filter_entry.pack(fill="x", padx=10, pady=(10, 0))
+        self.filter_entry.bind("<KeyRelease>", lambda event: self._apply_filter())
+        
         # Create data table
         self.data_table = self._create_table(
             self.data_frame,
@@ -126,8 +142,10 @@ class DataCollectionTab(BaseTab):
                 {"text": "Date", "width": 100},
                 {"text": "Status", "width": 100},
                 {"text": "Details", "width": 300}
-            ]
+            ],
+            virtual=True
         )
+        self.data_table.enable_sorting()
         
         # Create export section
         self.export_frame = ctk.CTkFrame(self.content_frame)
@@ -230,8 +248,7 @@ class DataCollectionTab(BaseTab):
             ]
             
         # Recreate table with new columns
-        for item in self.data_table.get_children():
-            self.data_table.delete(item)
+        self.data_table.set_rows([])
             
         # Update table columns
         for i, col in enumerate(self.data_table["columns"]):
@@ -242,53 +259,57 @@ class DataCollectionTab(BaseTab):
             if i < len(self.data_table["columns"]):
                 self.data_table.heading(f"col{i}", text=col["text"])
                 self.data_table.column(f"col{i}", width=col["width"])
+                
+        self.data_table.clear_sort()
         
     def _fetch_data(self):
         """Fetch data from API"""
         # Show loading animation
         self._show_loading_animation(self.fetch_button, "Fetch Data")
         
-        # Get data in a separate thread
-        self.parent.after(100, self._fetch_data_thread)
+        # Read the selection on the main thread, fetch in a worker thread
+        self._run_in_background(
+            self._fetch_data_thread,
+            self.selected_league.get(),
+            self.selected_data_type.get(),
+            self.season_dropdown.get(),
+            on_success=self._on_data_loaded,
+            on_error=self._on_fetch_error
+        )
         
-    def _fetch_data_thread(self):
-        """Fetch data from API in a separate thread"""
-        try:
-            # Get parameters
-            league_id = self.selected_league.get()
-            data_type = self.selected_data_type.get()
-            season = self.season_dropdown.get()
-            
-            # Fetch data based on type
-            if data_type == "Fixtures":
-                data = self.api.fetch_fixtures(league_id, season=season)
-            elif data_type == "Teams":
-                data = self.api.fetch_teams(league_id, season=season)
-            elif data_type == "Players":
-                data = self.api.fetch_players(league_id, season=season)
-            else:  # Standings
-                data = self.api.fetch_standings(league_id, season=season)
-                
-            # Store data
-            self.collected_data = data
-            
-            # Update table
-            self._update_data_table()
-            
-            # Reset fetch button
-            self.fetch_button.configure(text="Fetch Data", state="normal")
-            
-        except Exception as e:
-            logger.error(f"Error fetching data: {str(e)}")
-            self.fetch_button.configure(text="Fetch Failed", state="normal")
-            self.parent.after(2000, lambda: self.fetch_button.configure(text="Fetch Data"))
+    def _fetch_data_thread(self, league_id, data_type, season):
+        """Fetch data from API (runs in a worker thread)"""
+        # Fetch data based on type
+        if data_type == "Fixtures":
+            return self.api.fetch_fixtures(league_id, season=season)
+        elif data_type == "Teams":
+            return self.api.fetch_teams(league_id, season=season)
+        elif data_type == "Players":
+            return self.api.fetch_players(league_id, season=season)
+        else:  # Standings
+            return self.api.fetch_standings(league_id, season=season)
             
+    def _on_data_loaded(self, data):
+        """Show fetched data (runs on the main thread)"""
+        # Store data
+        self.collected_data = data
+        
+        # Update table
+        self._update_data_table()
+        
+        # Reset fetch button
+        self.fetch_button.configure(text="Fetch Data", state="normal")
+        
+    def _on_fetch_error(self, error):
+        """Handle a failed fetch (runs on the main thread)"""
+        logger.error(f"Error fetching data: {str(error)}")
+        self.fetch_button.configure(text="Fetch Failed", state="normal")
+        self.parent.after(2000, lambda: self.fetch_button.configure(text="Fetch Data"))
+        
     def _update_data_table(self):
         """Update the data table with fetched data"""
-        # Clear table
-        for item in self.data_table.get_children():
-            self.data_table.delete(item)
-            
+        rows = []
+        
         # Get data type
         data_type = self.selected_data_type.get()
         
@@ -309,17 +330,17 @@ class DataCollectionTab(BaseTab):
                     score = "vs"
                     
                 # Add row
-                self.data_table.insert(
-                    "", "end",
-                    values=(
+                rows.append((
+                    (
                         fixture_id,
                         home_team,
                         away_team,
                         date,
                         status,
                         score
-                    )
-                )
+                    ),
+                    ()
+                ))
         elif data_type == "Teams":
             for team in self.collected_data:
                 # Get team data (placeholder)
@@ -331,17 +352,17 @@ class DataCollectionTab(BaseTab):
                 capacity = "50000"  # Placeholder
                 
                 # Add row
-                self.data_table.insert(
-                    "", "end",
-                    values=(
+                rows.append((
+                    (
                         team_id,
                         name,
                         country,
                         founded,
                         stadium,
                         capacity
-                    )
-                )
+                    ),
+                    ()
+                ))
         elif data_type == "Players":
             for player in self.collected_data:
                 # Get player data (placeholder)
@@ -353,17 +374,17 @@ class DataCollectionTab(BaseTab):
                 nationality = "England"  # Placeholder
                 
                 # Add row
-                self.data_table.insert(
-                    "", "end",
-                    values=(
+                rows.append((
+                    (
                         player_id,
                         name,
                         team,
                         position,
                         age,
                         nationality
-                    )
-                )
+                    ),
+                    ()
+                ))
         else:  # Standings
             for team in self.collected_data:
                 # Get team data
@@ -378,9 +399,8 @@ class DataCollectionTab(BaseTab):
                 points = team['points']
                 
                 # Add row
-                self.data_table.insert(
-                    "", "end",
-                    values=(
+                rows.append((
+                    (
                         position,
                         team_name,
                         played,
@@ -390,9 +410,24 @@ class DataCollectionTab(BaseTab):
                         goals_for,
                         goals_against,
                         points
-                    )
-                )
+                    ),
+                    ()
+                ))
                 
+        # Only the visible rows are put into the table
+        self.data_table.set_rows(rows)
+        
+    def _apply_filter(self):
+        """Show only the rows containing the filter text"""
+        text = self.filter_entry.get().strip().lower()
+        if not text:
+            self.data_table.set_filter(None)
+            return
+            
+        self.data_table.set_filter(
+            lambda values: any(text in str(value).lower() for value in values)
+        )
+        
     def _export_data(self):
         """Export data to file"""
         if not self.collected_data:
@@ -402,7 +437,10 @@ class DataCollectionTab(BaseTab):
         export_format = self.export_format_var.get()
         
         # Get file path
-        file_types = [("CSV files", "*.csv")] if export_format == "CSV" else [("JSON files", "*.json")]
+        if export_format == "CSV":
+            file_types = [("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz")]
+        else:
+            file_types = [("JSON files", "*.json"), ("NDJSON files", "*.ndjson"), ("Compressed files", "*.gz")]
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv" if export_format == "CSV" else ".json",
             filetypes=file_types
@@ -412,11 +450,28 @@ class DataCollectionTab(BaseTab):
             return
             
         try:
-            # Export based on format
-            if export_format == "CSV":
-                self._export_to_csv(file_path)
-            else:
-                self._export_to_json(file_path)
+            # Export based on format, an explicit .ndjson/.json/.csv extension wins
+            export_format = detect_format(file_path, default=export_format.lower())
+            data_type = self.selected_data_type.get()
+            
+            metadata = None
+            if export_format == "json":
+                metadata = {
+                    "data_type": data_type,
+                    "league_id": self.selected_league.get(),
+                    "league_name": get_league_display_name(self.selected_league.get()),
+                    "season": self.season_dropdown.get(),
+                    "export_date": datetime.now().isoformat()
+                }
+                
+            export_rows(
+                self._iter_export_rows(data_type),
+                file_path,
+                export_format=export_format,
+                columns=EXPORT_COLUMNS[data_type],
+                metadata=metadata,
+                total=len(self.collected_data)
+            )
                 
             # Show success message
             self.export_button.configure(text="Export Successful")
@@ -427,101 +482,61 @@ class DataCollectionTab(BaseTab):
             self.export_button.configure(text="Export Failed")
             self.parent.after(2000, lambda: self.export_button.configure(text="Export Data"))
             
-    def _export_to_csv(self, file_path):
-        """Export data to CSV file"""
-        # Get data type
-        data_type = self.selected_data_type.get()
-        
-        # Define headers based on data type
-        if data_type == "Fixtures":
-            headers = ["ID", "Home", "Away", "Date", "Status", "Score"]
-        elif data_type == "Teams":
-            headers = ["ID", "Name", "Country", "Founded", "Stadium", "Capacity"]
-        elif data_type == "Players":
-            headers = ["ID", "Name", "Team", "Position", "Age", "Nationality"]
-        else:  # Standings
-            headers = ["Position", "Team", "Played", "Wins", "Draws", "Losses", "Goals For", "Goals Against", "Points"]
-            
-        # Write to CSV
-        with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            
-            # Write headers
-            writer.writerow(headers)
-            
-            # Write data
-            for item in self.data_table.get_children():
-                values = self.data_table.item(item, "values")
-                writer.writerow(values)
-                
-    def _export_to_json(self, file_path):
-        """Export data to JSON file"""
-        # Get data type
-        data_type = self.selected_data_type.get()
-        
-        # Create JSON data
-        json_data = {
-            "data_type": data_type,
-            "league_id": self.selected_league.get(),
-            "league_name": get_league_display_name(self.selected_league.get()),
-            "season": self.season_dropdown.get(),
-            "export_date": datetime.now().isoformat(),
-            "items": []
-        }
-        
-        # Add items based on data type
-        if data_type == "Fixtures":
-            for item in self.data_table.get_children():
-                values = self.data_table.item(item, "values")
-                json_data["items"].append({
-                    "id": values[0],
-                    "home_team": values[1],
-                    "away_team": values[2],
-                    "date": values[3],
-                    "status": values[4],
-                    "score": values[5]
-                })
-        elif data_type == "Teams":
-            for item in self.data_table.get_children():
-                values = self.data_table.item(item, "values")
-                json_data["items"].append({
-                    "id": values[0],
-                    "name": values[1],
-                    "country": values[2],
-                    "founded": values[3],
-                    "stadium": values[4],
-                    "capacity": values[5]
-                })
-        elif data_type == "Players":
-            for item in self.data_table.get_children():
-                values = self.data_table.item(item, "values")
-                json_data["items"].append({
-                    "id": values[0],
-                    "name": values[1],
-                    "team": values[2],
-                    "position": values[3],
-                    "age": values[4],
-                    "nationality": values[5]
-                })
-        else:  # Standings
-            for item in self.data_table.get_children():
-                values = self.data_table.item(item, "values")
-                json_data["items"].append({
-                    "position": values[0],
-                    "team": values[1],
-                    "played": values[2],
-                    "wins": values[3],
-                    "draws": values[4],
-                    "losses": values[5],
-                    "goals_for": values[6],
-                    "goals_against": values[7],
-                    "points": values[8]
-                })
+    def _iter_export_rows(self, data_type):
+        """Yield export rows built from the collected API data one at a time"""
+        for item in self.collected_data:
+            try:
+                if data_type == "Fixtures":
+                    if item['fixture']['status']['short'] == 'FT':
+                        score = f"{item['goals']['home']} - {item['goals']['away']}"
+                    else:
+                        score = "vs"
+                        
+                    yield {
+                        "id": item['fixture']['id'],
+                        "home_team": item['teams']['home']['name'],
+                        "away_team": item['teams']['away']['name'],
+                        "date": item['fixture']['date'].split('T')[0],
+                        "status": item['fixture']['status']['long'],
+                        "score": score
+                    }
+                elif data_type == "Teams":
+                    team = item.get('team', {})
+                    venue = item.get('venue', {})
+                    yield {
+                        "id": team.get('id'),
+                        "name": team.get('name'),
+                        "country": team.get('country'),
+                        "founded": team.get('founded'),
+                        "stadium": venue.get('name'),
+                        "capacity": venue.get('capacity')
+                    }
+                elif data_type == "Players":
+                    player = item.get('player', {})
+                    statistics = (item.get('statistics') or [{}])[0]
+                    yield {
+                        "id": player.get('id'),
+                        "name": player.get('name'),
+                        "team": statistics.get('team', {}).get('name'),
+                        "position": statistics.get('games', {}).get('position'),
+                        "age": player.get('age'),
+                        "nationality": player.get('nationality')
+                    }
+                else:  # Standings
+                    yield {
+                        "position": item['rank'],
+                        "team": item['team']['name'],
+                        "played": item['all']['played'],
+                        "wins": item['all']['win'],
+                        "draws": item['all']['draw'],
+                        "losses": item['all']['lose'],
+                        "goals_for": item['all']['goals']['for'],
+                        "goals_against": item['all']['goals']['against'],
+                        "points": item['points']
+                    }
+            except (KeyError, TypeError) as e:
+                logger.error(f"Error exporting {data_type} item: {str(e)}")
                 
-        # Write to JSON file
-        with open(file_path, 'w', encoding='utf-8') as jsonfile:
-            json.dump(json_data, jsonfile, indent=4, ensure_ascii=False)
-            
     def _save_to_database(self):
         """Save data to database"""
         if not self.collected_data:
@@ -531,25 +546,40 @@ class DataCollectionTab(BaseTab):
             # Get data type
             data_type = self.selected_data_type.get()
             
-            # Save based on data type
+            # Queue the save on the database writer thread
+            writer = self.db_manager.writer
             if data_type == "Fixtures":
-                saved_count = self.db_manager.save_fixtures(self.collected_data)
+                future = writer.submit("save_fixtures", self.collected_data)
             elif data_type == "Teams":
-                saved_count = self.db_manager.save_teams(self.collected_data)
+                future = writer.submit("save_teams", self.collected_data)
             elif data_type == "Players":
-                saved_count = self.db_manager.save_players(self.collected_data)
+                future = writer.submit("save_players", self.collected_data)
             else:  # Standings
-                saved_count = self.db_manager.save_standings(self.collected_data)
+                future = writer.submit(
+                    "save_standings",
+                    self.collected_data,
+                    league_id=self.selected_league.get(),
+                    season=int(self.season_dropdown.get())
+                )
                 
-            # Show success message
-            self.save_button.configure(text=f"Saved {saved_count} Items")
-            self.parent.after(2000, lambda: self.save_button.configure(text="Save to Database"))
+            self.save_button.configure(text="Saving...", state="disabled")
+            self._when_done(future, self._on_data_saved)
             
         except Exception as e:
             logger.error(f"Error saving to database: {str(e)}")
             self.save_button.configure(text="Save Failed")
             self.parent.after(2000, lambda: self.save_button.configure(text="Save to Database"))
     
+    def _on_data_saved(self, saved_count, error):
+        """Show the result of a queued save"""
+        if error:
+            logger.error(f"Error saving to database: {str(error)}")
+            self.save_button.configure(text="Save Failed", state="normal")
+        else:
+            # Show success message
+            self.save_button.configure(text=f"Saved {saved_count} Items", state="normal")
+        self.parent.after(2000, lambda: self.save_button.configure(text="Save to Database"))
+        
     def update_settings(self):
         """Update settings from settings manager"""
         # Update theme from parent class
@@ -4,12 +4,11 @@ from tkinter import ttk
 import logging
 from typing import Dict, List, Any, Optional, Callable
 import sqlite3
-import pandas as pd
 from datetime import datetime
 
 from tabs.base_tab import BaseTab
 from modules.api_client import FootballAPI
-from modules.db_manager import DatabaseManager
+from modules.db_manager import DatabaseManager, PAGE_SIZE
 from modules.settings_manager import SettingsManager
 from modules.translations import translate
 
@@ -23,6 +22,18 @@ class DbViewTab(BaseTab):
         self.current_table = tk.StringVar(value="predictions")
         self.tables = ["predictions", "fixtures", "teams", "leagues", "form_changes"]
         
+        # Tables that are read page by page with keyset cursors
+        self.paged_tables = ["predictions", "fixtures", "teams"]
+        
+        # Paging and sorting state of the current table
+        self.sort_column = None
+        self.sort_descending = True
+        self.sort_headings = {}
+        self.next_cursor = None
+        self.has_more_rows = False
+        self.page_loading = False
+        self.loaded_rows = 0
+        
         # Create UI elements
         self._create_ui()
         
@@ -130,7 +141,8 @@ class DbViewTab(BaseTab):
                 {"text": translate("Status"), "width": 100},
                 {"text": translate("Result"), "width": 100},
                 {"text": translate("Correct"), "width": 100}
-            ]
+            ],
+            on_scroll_end=self._load_next_page
         )
         
         # Stats View Tab
@@ -192,6 +204,9 @@ class DbViewTab(BaseTab):
             if translate(table) == selection:
                 self.current_table.set(table)
                 break
+                
+        # Use the default sort order of the new table
+        self.sort_column = None
         
         # Show/hide prediction filter based on selected table
         if self.current_table.get() == "predictions":
@@ -214,7 +229,7 @@ class DbViewTab(BaseTab):
         # Show loading indicator overlay
         self.show_loading_indicator()
         
-        # Get data in a separate thread
+        # Load data once the loading indicator has been drawn
         self.parent.after(100, self._fetch_data)
         
     def _fetch_data(self):
@@ -239,7 +254,8 @@ class DbViewTab(BaseTab):
                 self._configure_form_changes_table()
                 
             # Update status
-            self.status_label.configure(text=f"{translate('Data loaded at')} {datetime.now().strftime('%H:%M:%S')}")
+            if table not in self.paged_tables:
+                self.status_label.configure(text=f"{translate('Data loaded at')} {datetime.now().strftime('%H:%M:%S')}")
             
             # Reset refresh button
             self.refresh_button.configure(text=translate("Refresh Data"), state="normal")
@@ -265,7 +281,7 @@ class DbViewTab(BaseTab):
         
         # Clear existing columns
         for col in self.data_table["columns"]:
-            self.data_table.heading(col, text="")
+            self.data_table.heading(col, text="", command="")
             self.data_table.column(col, width=0)
             
         # Set new column headings
@@ -292,48 +308,20 @@ class DbViewTab(BaseTab):
         self.data_table.column("result", width=100)
         self.data_table.column("correct", width=100)
         
-        # Get predictions
-        predictions = self.db_manager.get_predictions()
-        
-        # Apply filter
-        filter_value = self.prediction_filter_var.get()
-        
-        if filter_value == translate("Correct"):
-            predictions = [p for p in predictions if p["correct"] == 1]
-        elif filter_value == translate("Incorrect"):
-            predictions = [p for p in predictions if p["correct"] == 0 and p["status"] == "COMPLETED"]
-        elif filter_value == translate("WAITING"):
-            predictions = [p for p in predictions if p["status"] == "WAITING"]
-        elif filter_value == translate("COMPLETED"):
-            predictions = [p for p in predictions if p["status"] == "COMPLETED"]
-        
-        # Add data to table
-        for prediction in predictions:
-            # Determine tag
-            if prediction["status"] == "WAITING":
-                tag = "waiting"
-            elif prediction["correct"] == 1:
-                tag = "correct"
-            else:
-                tag = "incorrect"
-                
-            # Add row
-            self.data_table.insert(
-                "", "end",
-                values=(
-                    prediction["id"],
-                    prediction["team_name"],
-                    prediction["league_name"],
-                    prediction["opponent_name"],
-                    prediction["match_date"],
-                    translate(prediction["prediction"]),
-                    prediction["performance_diff"],
-                    translate(prediction["status"]),
-                    prediction["result"] or "",
-                    translate("Yes") if prediction["correct"] == 1 else translate("No") if prediction["status"] == "COMPLETED" else ""
-                ),
-                tags=(tag,)
-            )
+        # Map sortable columns to database sort columns
+        self._set_sort_headings({
+            "id": "id",
+            "team": "team_name",
+            "league": "league_name",
+            "opponent": "opponent_name",
+            "date": "match_date",
+            "prediction": "prediction",
+            "performance_diff": "performance_diff",
+            "result": "result"
+        }, default="date")
+        
+        # Load the first page, further pages are loaded on scroll
+        self._load_first_page()
             
         # Configure tags
         self.data_table.tag_configure("correct", foreground="green")
@@ -348,6 +336,34 @@ class DbViewTab(BaseTab):
         self.correct_card["value"].configure(text=str(stats["correct"]))
         self.accuracy_card["value"].configure(text=f"{stats['accuracy']:.1f}%")
         
+    def _insert_prediction_row(self, prediction):
+        """Insert a prediction row into the table"""
+        # Determine tag
+        if prediction["status"] == "WAITING":
+            tag = "waiting"
+        elif prediction["correct"] == 1:
+            tag = "correct"
+        else:
+            tag = "incorrect"
+            
+        # Add row
+        self.data_table.insert(
+            "", "end",
+            values=(
+                prediction["id"],
+                prediction["team_name"],
+                prediction["league_name"],
+                prediction["opponent_name"],
+                prediction["match_date"],
+                translate(prediction["prediction"]),
+                prediction["performance_diff"],
+                translate(prediction["status"]),
+                prediction["result"] or "",
+                translate("Yes") if prediction["correct"] == 1 else translate("No") if prediction["status"] == "COMPLETED" else ""
+            ),
+            tags=(tag,)
+        )
+        
     def _configure_fixtures_table(self):
         """Configure and load fixtures table"""
         # Configure columns
@@ -357,7 +373,7 @@ class DbViewTab(BaseTab):
         
         # Clear existing columns
         for col in self.data_table["columns"]:
-            self.data_table.heading(col, text="")
+            self.data_table.heading(col, text="", command="")
             self.data_table.column(col, width=0)
             
         # Set new column headings
@@ -378,41 +394,51 @@ class DbViewTab(BaseTab):
         self.data_table.column("status", width=100)
         self.data_table.column("score", width=100)
         
-        # Get fixtures
-        fixtures = self.db_manager.get_fixtures()
-        
-        # Add data to table
-        for fixture in fixtures:
-            try:
-                # Create score string
-                score = "-"
-                if fixture.get("home_score") is not None and fixture.get("away_score") is not None:
-                    score = f"{fixture['home_score']}-{fixture['away_score']}"
-                
-                self.data_table.insert(
-                    "", "end",
-                    values=(
-                        fixture["id"],
-                        fixture.get("league_name", ""),
-                        fixture["home_team_name"],
-                        fixture["away_team_name"],
-                        fixture["match_date"],
-                        fixture["status"],
-                        score
-                    )
-                )
-            except Exception as e:
-                logger.error(f"Error adding fixture to table: {str(e)}")
+        # Map sortable columns to database sort columns
+        self._set_sort_headings({
+            "id": "id",
+            "league": "league_name",
+            "home_team": "home_team_name",
+            "away_team": "away_team_name",
+            "date": "match_date",
+            "status": "status"
+        }, default="date")
+        
+        # Load the first page, further pages are loaded on scroll
+        self._load_first_page()
             
         # Update stats
-        total = len(fixtures)
-        completed = sum(1 for f in fixtures if f["status"] == "COMPLETED")
+        total = self.db_manager.count_rows("fixtures")
+        completed = self.db_manager.count_rows("fixtures", {"status": "COMPLETED"})
         
         self.total_card["value"].configure(text=str(total))
         self.completed_card["value"].configure(text=str(completed))
         self.correct_card["value"].configure(text="-")
         self.accuracy_card["value"].configure(text="-")
         
+    def _insert_fixture_row(self, fixture):
+        """Insert a fixture row into the table"""
+        try:
+            # Create score string
+            score = "-"
+            if fixture.get("home_score") is not None and fixture.get("away_score") is not None:
+                score = f"{fixture['home_score']}-{fixture['away_score']}"
+                
+            self.data_table.insert(
+                "", "end",
+                values=(
+                    fixture["id"],
+                    fixture.get("league_name", ""),
+                    fixture["home_team_name"],
+                    fixture["away_team_name"],
+                    fixture["match_date"],
+                    fixture["status"],
+                    score
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error adding fixture to table: {str(e)}")
+            
     def _configure_teams_table(self):
         """Configure and load teams table"""
         # Configure columns
@@ -422,7 +448,7 @@ class DbViewTab(BaseTab):
         
         # Clear existing columns
         for col in self.data_table["columns"]:
-            self.data_table.heading(col, text="")
+            self.data_table.heading(col, text="", command="")
             self.data_table.column(col, width=0)
             
         # Set new column headings
@@ -437,32 +463,137 @@ class DbViewTab(BaseTab):
         self.data_table.column("league", width=200)
         self.data_table.column("country", width=150)
         
-        # Get teams
-        teams = self.db_manager.get_teams()
+        # Map sortable columns to database sort columns
+        self._set_sort_headings({
+            "id": "id",
+            "name": "name",
+            "league": "league_name",
+            "country": "country"
+        }, default="name", descending=False)
         
-        # Add data to table
-        for team in teams:
-            try:
-                self.data_table.insert(
-                    "", "end",
-                    values=(
-                        team["id"],
-                        team["name"],
-                        team.get("league_name", ""),
-                        team.get("country", "")
-                    )
-                )
-            except Exception as e:
-                logger.error(f"Error adding team to table: {str(e)}")
+        # Load the first page, further pages are loaded on scroll
+        self._load_first_page()
             
         # Update stats
-        total = len(teams)
+        total = self.db_manager.count_rows("teams")
         
         self.total_card["value"].configure(text=str(total))
         self.completed_card["value"].configure(text="-")
         self.correct_card["value"].configure(text="-")
         self.accuracy_card["value"].configure(text="-")
         
+    def _insert_team_row(self, team):
+        """Insert a team row into the table"""
+        try:
+            self.data_table.insert(
+                "", "end",
+                values=(
+                    team["id"],
+                    team["name"],
+                    team.get("league_name", ""),
+                    team.get("country", "")
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error adding team to table: {str(e)}")
+            
+    def _set_sort_headings(self, headings, default, descending=True):
+        """Make the given table columns sortable
+        
+        Args:
+            headings: Dictionary of table column IDs and database sort columns
+            default: Table column used when the user has not chosen a sort column
+            descending: Default sort direction
+        """
+        self.sort_headings = headings
+        
+        if self.sort_column not in headings:
+            self.sort_column = default
+            self.sort_descending = descending
+            
+        for col in headings:
+            text = self.data_table.heading(col)["text"].rstrip("▲▼ ")
+            if col == self.sort_column:
+                text = f"{text} {'▼' if self.sort_descending else '▲'}"
+            self.data_table.heading(col, text=text, command=lambda c=col: self._on_sort_heading(c))
+            
+    def _on_sort_heading(self, col):
+        """Sort the current table by the clicked column in the database"""
+        if col == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = col
+            self.sort_descending = False
+            
+        self._load_data()
+        
+    def _get_page_filters(self):
+        """Get the database filters for the current table"""
+        if self.current_table.get() != "predictions":
+            return {}
+            
+        filter_value = self.prediction_filter_var.get()
+        
+        if filter_value == translate("Correct"):
+            return {"status": "CORRECT"}
+        elif filter_value == translate("Incorrect"):
+            return {"status": "INCORRECT"}
+        elif filter_value == translate("WAITING"):
+            return {"status": "WAITING"}
+        elif filter_value == translate("COMPLETED"):
+            return {"status": "COMPLETED"}
+        return {}
+        
+    def _load_first_page(self):
+        """Reset paging and load the first page of the current table"""
+        self.next_cursor = None
+        self.has_more_rows = True
+        self.page_loading = False
+        self.loaded_rows = 0
+        self._load_next_page()
+        
+    def _load_next_page(self):
+        """Load the next page of the current table and append it to the view"""
+        table = self.current_table.get()
+        if table not in self.paged_tables or not self.has_more_rows or self.page_loading:
+            return
+            
+        self.page_loading = True
+        try:
+            page = self.db_manager.get_page(
+                table,
+                cursor=self.next_cursor,
+                limit=PAGE_SIZE,
+                sort_by=self.sort_headings.get(self.sort_column),
+                descending=self.sort_descending,
+                filters=self._get_page_filters()
+            )
+            
+            insert_row = {
+                "predictions": self._insert_prediction_row,
+                "fixtures": self._insert_fixture_row,
+                "teams": self._insert_team_row
+            }[table]
+            
+            for row in page["rows"]:
+                insert_row(row)
+                
+            self.loaded_rows += len(page["rows"])
+            self.next_cursor = page["next_cursor"]
+            self.has_more_rows = self.next_cursor is not None
+            
+            # Update status
+            more = f" ({translate('scroll for more')})" if self.has_more_rows else ""
+            self.status_label.configure(
+                text=f"{translate('Data loaded at')} {datetime.now().strftime('%H:%M:%S')} - {self.loaded_rows} {translate('rows')}{more}"
+            )
+            
+        except Exception as e:
+            logger.error(f"Error loading page: {str(e)}")
+            self.has_more_rows = False
+        finally:
+            self.page_loading = False
+            
     def _configure_leagues_table(self):
         """Configure and load leagues table"""
         # Configure columns
@@ -472,7 +603,7 @@ class DbViewTab(BaseTab):
         
         # Clear existing columns
         for col in self.data_table["columns"]:
-            self.data_table.heading(col, text="")
+            self.data_table.heading(col, text="", command="")
             self.data_table.column(col, width=0)
             
         # Set new column headings
@@ -522,7 +653,7 @@ class DbViewTab(BaseTab):
         
         # Clear existing columns
         for col in self.data_table["columns"]:
-            self.data_table.heading(col, text="")
+            self.data_table.heading(col, text="", command="")
             self.data_table.column(col, width=0)
             
         # Set new column headings
@@ -567,55 +698,57 @@ class DbViewTab(BaseTab):
         self.accuracy_card["value"].configure(text="-")
         
     def _export_data(self):
-        """Export current table data to CSV"""
+        """Export current table data to CSV, NDJSON or JSON"""
         try:
             from tkinter import filedialog
             
             # Get file path
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".csv",
-                filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")],
+                filetypes=[
+                    ("CSV Files", "*.csv"),
+                    ("NDJSON Files", "*.ndjson"),
+                    ("JSON Files", "*.json"),
+                    ("Compressed Files", "*.gz"),
+                    ("All Files", "*.*")
+                ],
                 title=f"{translate('Export')} {self.current_table.get()}"
             )
             
             if not file_path:
                 return
                 
-            # Get data
             table = self.current_table.get()
             
-            if table == "predictions":
-                data = self.db_manager.get_predictions()
-                if self.prediction_filter_var.get() == translate("Correct"):
-                    data = [p for p in data if p["correct"] == 1]
-                elif self.prediction_filter_var.get() == translate("Incorrect"):
-                    data = [p for p in data if p["correct"] == 0 and p["status"] == "COMPLETED"]
-                elif self.prediction_filter_var.get() == translate("WAITING"):
-                    data = [p for p in data if p["status"] == "WAITING"]
-                elif self.prediction_filter_var.get() == translate("COMPLETED"):
-                    data = [p for p in data if p["status"] == "COMPLETED"]
-            elif table == "fixtures":
-                data = self.db_manager.get_fixtures()
-            elif table == "teams":
-                data = self.db_manager.get_teams()
-            elif table == "leagues":
-                data = self.db_manager.get_leagues()
-            elif table == "form_changes":
-                data = self.db_manager.get_form_changes()
-                
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
-            
-            # Export to CSV
-            df.to_csv(file_path, index=False)
+            # Stream the table in the order and with the filter shown in the view
+            count = self.db_manager.export_table(
+                table,
+                file_path,
+                sort_by=self.sort_headings.get(self.sort_column) if table in self.paged_tables else None,
+                descending=self.sort_descending,
+                filters=self._get_page_filters(),
+                progress_callback=self._on_export_progress
+            )
             
+            if count < 0:
+                raise RuntimeError(translate("Export Failed"))
+                
             # Update status
-            self.status_label.configure(text=f"{translate('Exported to')} {file_path}")
+            self.status_label.configure(text=f"{translate('Exported to')} {file_path} ({count} {translate('rows')})")
             
         except Exception as e:
             logger.error(f"Error exporting data: {str(e)}")
             self.status_label.configure(text=f"{translate('Error')}: {str(e)}")
             
+    def _on_export_progress(self, count, total):
+        """Show export progress in the status bar"""
+        if total:
+            text = f"{translate('Exporting')}... {count}/{total}"
+        else:
+            text = f"{translate('Exporting')}... {count}"
+        self.status_label.configure(text=text)
+        self.status_label.update_idletasks()
+        
     def update_settings(self):
         """Update settings from settings manager"""
         # Update theme from parent class
@@ -6,11 +6,12 @@ from typing import Dict, List, Any, Optional, Callable
 import json
 from datetime import datetime
 
-from tabs.base_tab import BaseTab
+from tabs.base_tab import BaseTab, sync_treeview
 from modules.api_client import FootballAPI
 from modules.db_manager import DatabaseManager
 from modules.settings_manager import SettingsManager
 from modules.league_names import get_league_options, get_league_display_name
+from modules.prediction_pipeline import generate_prediction, evaluate_prediction
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +39,9 @@ class FirebaseTab(BaseTab):
         # Create UI elements
         self._create_ui()
         
+        # Reload when auto refresh has new data
+        self._subscribe_refresh(("form",))
+        
     def _create_ui(self):
         """Create the firebase tab UI elements"""
         # Title
@@ -220,66 +224,78 @@ class FirebaseTab(BaseTab):
         # Show loading animation
         self._show_loading_animation(self.refresh_button, "Refresh Data")
         
-        # Get data in a separate thread
-        self.parent.after(100, self._fetch_data)
-            
-    def _fetch_data(self):
-        """Fetch data from API"""
-        try:
-            # Get league ID
-            league_id = self.selected_league.get()
-            
-            # Get threshold
-            threshold = self.threshold.get()
-            
-            # Fetch form data
-            form_data = self.api.fetch_all_teams({league_id: {"name": "", "flag": ""}}, 5)
-            
-            # Filter teams with significant form changes
-            self.form_changes_data = []
+        # Read the selection on the main thread, fetch in a worker thread
+        self._run_in_background(
+            self._fetch_data,
+            self.selected_league.get(),
+            self.threshold.get(),
+            on_success=self._on_data_loaded,
+            on_error=self._on_fetch_error
+        )
             
-            for team_data in form_data:
-                if abs(team_data.get('performance_diff', 0)) >= threshold:
-                    # Get upcoming matches
+    def _fetch_data(self, league_id, threshold):
+        """Fetch form changes from API and saved predictions from the database (runs in a worker thread)"""
+        # Fetch form data
+        form_data = self.api.fetch_all_teams({league_id: {"name": "", "flag": ""}}, 5)
+        
+        # Filter teams with significant form changes
+        form_changes_data = []
+        fixtures = None
+        
+        for team_data in form_data:
+            if abs(team_data.get('performance_diff', 0)) >= threshold:
+                # Get upcoming matches
+                if fixtures is None:
                     fixtures = self.api.fetch_fixtures(league_id)
-                    upcoming_matches = self._get_upcoming_matches(fixtures, team_data['team_id'])
-                    
-                    if upcoming_matches:
-                        for match in upcoming_matches:
-                            # Create prediction
-                            prediction, prediction_level = self._generate_prediction(team_data['performance_diff'])
-                            
-                            # Add to form changes data
-                            self.form_changes_data.append({
-                                'team_id': team_data['team_id'],
-                                'team': team_data['team'],
-                                'league_id': league_id,
-                                'league_name': get_league_display_name(league_id),
-                                'performance_diff': team_data['performance_diff'],
-                                'prediction': prediction,
-                                'prediction_level': prediction_level,
-                                'opponent_id': match['opponent_id'],
-                                'opponent': match['opponent'],
-                                'fixture_id': match['fixture_id'],
-                                'date': match['date'],
-                                'time': match['time'],
-                                'venue': match['venue'],
-                                'status': match['status']
-                            })
-            
-            # Update tables
-            self._update_form_changes_table()
-            self._update_fixtures_table()
-            self._update_results_table()
-            
-            # Reset refresh button
-            self.refresh_button.configure(text="Refresh Data", state="normal")
-            
-        except Exception as e:
-            logger.error(f"Error fetching data: {str(e)}")
-            self.refresh_button.configure(text="Refresh Failed", state="normal")
-            self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data"))
-            
+                upcoming_matches = self._get_upcoming_matches(fixtures, team_data['team_id'])
+                
+                if upcoming_matches:
+                    for match in upcoming_matches:
+                        # Create prediction
+                        prediction, prediction_level = self._generate_prediction(team_data['performance_diff'])
+                        
+                        # Add to form changes data
+                        form_changes_data.append({
+                            'team_id': team_data['team_id'],
+                            'team': team_data['team'],
+                            'league_id': league_id,
+                            'league_name': get_league_display_name(league_id),
+                            'performance_diff': team_data['performance_diff'],
+                            'prediction': prediction,
+                            'prediction_level': prediction_level,
+                            'opponent_id': match['opponent_id'],
+                            'opponent': match['opponent'],
+                            'fixture_id': match['fixture_id'],
+                            'date': match['date'],
+                            'time': match['time'],
+                            'venue': match['venue'],
+                            'status': match['status']
+                        })
+                        
+        # Read saved predictions here too, so the main thread does not wait on SQLite
+        upcoming = self.db_manager.get_upcoming_fixtures()
+        results = self.db_manager.get_completed_predictions()
+        
+        return form_changes_data, upcoming, results
+        
+    def _on_data_loaded(self, data):
+        """Show fetched data (runs on the main thread)"""
+        self.form_changes_data, upcoming, results = data
+        
+        # Update tables
+        self._update_form_changes_table()
+        self._update_fixtures_table(upcoming)
+        self._update_results_table(results)
+        
+        # Reset refresh button
+        self.refresh_button.configure(text="Refresh Data", state="normal")
+        
+    def _on_fetch_error(self, error):
+        """Handle a failed fetch (runs on the main thread)"""
+        logger.error(f"Error fetching data: {str(error)}")
+        self.refresh_button.configure(text="Refresh Failed", state="normal")
+        self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data"))
+        
     def _get_upcoming_matches(self, fixtures, team_id, top_n=1):
         """Get upcoming matches for a team"""
         from modules.form_analyzer import FormAnalyzer
@@ -287,16 +303,12 @@ class FirebaseTab(BaseTab):
             
     def _update_form_changes_table(self):
         """Update the form changes table"""
-        # Clear table
-        for item in self.form_changes_table.get_children():
-            self.form_changes_table.delete(item)
-            
-        # Add data
-        for i, team in enumerate(self.form_changes_data):
-            # Add row
-            self.form_changes_table.insert(
-                "", "end",
-                values=(
+        rows = []
+        for team in self.form_changes_data:
+            # Add row, keyed by team and fixture so unchanged rows are left alone
+            rows.append((
+                f"{team.get('team_id')}-{team.get('fixture_id')}",
+                (
                     team.get('team', ''),
                     team.get('league_name', ''),
                     team.get('performance_diff', ''),
@@ -306,28 +318,27 @@ class FirebaseTab(BaseTab):
                     team.get('time', ''),
                     team.get('venue', '')
                 ),
-                tags=('positive' if team.get('performance_diff', 0) > 0 else 'negative',)
-            )
+                ('positive' if team.get('performance_diff', 0) > 0 else 'negative',)
+            ))
             
+        sync_treeview(self.form_changes_table, rows)
+        
         # Configure tags
         self.form_changes_table.tag_configure('positive', foreground='green')
         self.form_changes_table.tag_configure('negative', foreground='red')
             
-    def _update_fixtures_table(self):
+    def _update_fixtures_table(self, fixtures=None):
         """Update the upcoming fixtures table"""
-        # Clear table
-        for item in self.fixtures_table.get_children():
-            self.fixtures_table.delete(item)
-            
         # Get fixtures from database
-        fixtures = self.db_manager.get_upcoming_fixtures()
+        if fixtures is None:
+            fixtures = self.db_manager.get_upcoming_fixtures()
         
-        # Add data
+        # Add data, keyed by prediction so unchanged rows are left alone
+        rows = []
         for fixture in fixtures:
-            # Add row
-            self.fixtures_table.insert(
-                "", "end",
-                values=(
+            rows.append((
+                fixture.get('id'),
+                (
                     fixture.get('team_name', ''),
                     fixture.get('performance_diff', ''),
                     fixture.get('prediction', ''),
@@ -337,28 +348,27 @@ class FirebaseTab(BaseTab):
                     fixture.get('venue', ''),
                     fixture.get('status', '')
                 ),
-                tags=('positive' if fixture.get('performance_diff', 0) > 0 else 'negative',)
-            )
+                ('positive' if fixture.get('performance_diff', 0) > 0 else 'negative',)
+            ))
             
+        sync_treeview(self.fixtures_table, rows)
+        
         # Configure tags
         self.fixtures_table.tag_configure('positive', foreground='green')
         self.fixtures_table.tag_configure('negative', foreground='red')
             
-    def _update_results_table(self):
+    def _update_results_table(self, results=None):
         """Update the results table"""
-        # Clear table
-        for item in self.results_table.get_children():
-            self.results_table.delete(item)
-            
         # Get results from database
-        results = self.db_manager.get_completed_predictions()
+        if results is None:
+            results = self.db_manager.get_completed_predictions()
         
-        # Add data
+        # Add data, keyed by prediction so unchanged rows are left alone
+        rows = []
         for result in results:
-            # Add row
-            self.results_table.insert(
-                "", "end",
-                values=(
+            rows.append((
+                result.get('id'),
+                (
                     result.get('team_name', ''),
                     result.get('performance_diff', ''),
                     result.get('prediction', ''),
@@ -367,39 +377,23 @@ class FirebaseTab(BaseTab):
                     result.get('result', ''),
                     "Yes" if result.get('correct', 0) == 1 else "No"
                 ),
-                tags=('correct' if result.get('correct', 0) == 1 else 'incorrect',)
-            )
+                ('correct' if result.get('correct', 0) == 1 else 'incorrect',)
+            ))
             
+        sync_treeview(self.results_table, rows)
+        
         # Configure tags
         self.results_table.tag_configure('correct', foreground='green')
         self.results_table.tag_configure('incorrect', foreground='red')
     
     def _generate_prediction(self, performance_diff):
         """Generate prediction based on performance difference"""
-        from modules.config import PREDICTION_THRESHOLD_LEVEL1, PREDICTION_THRESHOLD_LEVEL2
-        
-        prediction_level = 1
-        
-        if abs(performance_diff) >= PREDICTION_THRESHOLD_LEVEL2:
-            prediction_level = 2
-            
-        if performance_diff > 0:
-            if prediction_level == 2:
-                prediction = "BIG WIN"
-            else:
-                prediction = "WIN"
-        else:
-            if prediction_level == 2:
-                prediction = "BIG LOSS"
-            else:
-                prediction = "LOSS"
-                
-        return prediction, prediction_level
+        return generate_prediction(performance_diff)
     
     def _save_to_database(self):
         """Save form changes to database"""
         try:
-            saved_count = 0
+            futures = []
             
             for fixture in self.form_changes_data:
                 # Create prediction data
@@ -418,111 +412,114 @@ class FirebaseTab(BaseTab):
                     'prediction_level': fixture['prediction_level']
                 }
                 
-                # Save to database
-                prediction_id = self.db_manager.save_prediction(prediction_data)
-                if prediction_id > 0:
-                    saved_count += 1
-            
-            # Show success message
-            if saved_count > 0:
-                self.save_button.configure(text=f"Saved {saved_count} Predictions")
-                self.parent.after(2000, lambda: self.save_button.configure(text="Save to Database"))
-            else:
-                self.save_button.configure(text="No New Predictions")
-                self.parent.after(2000, lambda: self.save_button.configure(text="Save to Database"))
+                # Queue the save on the database writer thread
+                futures.append(self.db_manager.writer.submit("save_prediction", prediction_data))
                 
-            # Update fixtures table
-            self._update_fixtures_table()
+            self.save_button.configure(text="Saving...", state="disabled")
+            self._when_done(futures, self._on_predictions_saved)
                 
         except Exception as e:
             logger.error(f"Error saving predictions: {str(e)}")
             self.save_button.configure(text="Save Failed")
             self.parent.after(2000, lambda: self.save_button.configure(text="Save to Database"))
             
+    def _on_predictions_saved(self, prediction_ids, error):
+        """Show the result of queued prediction saves"""
+        if error:
+            logger.error(f"Error saving predictions: {str(error)}")
+            
+        saved_count = sum(1 for prediction_id in prediction_ids if prediction_id)
+        
+        # Show success message
+        if saved_count > 0:
+            self.save_button.configure(text=f"Saved {saved_count} Predictions", state="normal")
+        elif error:
+            self.save_button.configure(text="Save Failed", state="normal")
+        else:
+            self.save_button.configure(text="No New Predictions", state="normal")
+        self.parent.after(2000, lambda: self.save_button.configure(text="Save to Database"))
+        
+        # Update fixtures table
+        self._update_fixtures_table()
+            
     def _check_results(self):
         """Check results of predictions"""
         try:
             # Show loading animation
             self._show_loading_animation(self.check_button, "Check Results")
             
-            # Check results in a separate thread
-            self.parent.after(100, self._check_results_thread)
+            # Check results in a worker thread
+            self._run_in_background(
+                self._check_results_thread,
+                on_success=self._on_results_checked,
+                on_error=self._on_check_error,
+                key="check_results"
+            )
                 
         except Exception as e:
-            logger.error(f"Error checking results: {str(e)}")
-            self.check_button.configure(text="Check Failed", state="normal")
-            self.parent.after(2000, lambda: self.check_button.configure(text="Check Results"))
+            self._on_check_error(e)
             
     def _check_results_thread(self):
-        """Check results in a separate thread"""
-        try:
-            # Get predictions from database
-            predictions = self.db_manager.get_predictions_to_check()
-            
-            checked_count = 0
-            correct_count = 0
-            
-            for prediction in predictions:
-                # Get fixture result
-                fixture_id = prediction['fixture_id']
-                fixture = self.api.fetch_fixture(fixture_id)
+        """Check results of saved predictions against finished fixtures (runs in a worker thread)"""
+        # Get predictions from database
+        predictions = self.db_manager.get_predictions_to_check()
+        
+        checked_count = 0
+        correct_count = 0
+        futures = []
+        
+        for prediction in predictions:
+            if self._task_cancelled():
+                break
                 
-                if fixture and fixture['fixture']['status']['short'] == 'FT':
-                    # Get result
-                    home_score = fixture['goals']['home']
-                    away_score = fixture['goals']['away']
-                    
-                    # Determine winner
-                    if home_score > away_score:
-                        result = "HOME_WIN"
-                    elif away_score > home_score:
-                        result = "AWAY_WIN"
-                    else:
-                        result = "DRAW"
-                        
-                    # Check if prediction was correct
-                    team_id = prediction['team_id']
-                    is_home = fixture['teams']['home']['id'] == team_id
-                    
-                    prediction_correct = False
-                    
-                    if prediction['prediction'] in ["WIN", "BIG WIN"]:
-                        if (is_home and result == "HOME_WIN") or (not is_home and result == "AWAY_WIN"):
-                            prediction_correct = True
-                    elif prediction['prediction'] in ["LOSS", "BIG LOSS"]:
-                        if (is_home and result == "AWAY_WIN") or (not is_home and result == "HOME_WIN"):
-                            prediction_correct = True
-                            
-                    # Update prediction in database
-                    self.db_manager.update_prediction_result(
-                        prediction['id'],
-                        result,
-                        1 if prediction_correct else 0
-                    )
-                    
-                    checked_count += 1
-                    if prediction_correct:
-                        correct_count += 1
+            # Get fixture result
+            fixture_id = prediction['fixture_id']
+            fixture = self.api.fetch_fixture(fixture_id)
+            
+            evaluation = evaluate_prediction(prediction, fixture)
             
-            # Show success message
-            if checked_count > 0:
-                self.check_button.configure(
-                    text=f"Checked {checked_count} ({correct_count} correct)",
-                    state="normal"
-                )
-                self.parent.after(3000, lambda: self.check_button.configure(text="Check Results"))
-            else:
-                self.check_button.configure(text="No New Results", state="normal")
-                self.parent.after(2000, lambda: self.check_button.configure(text="Check Results"))
+            if evaluation is not None:
+                result, correct = evaluation
+                prediction_correct = correct == 1
                 
-            # Update results table
-            self._update_results_table()
+                # Queue the result update on the database writer thread
+                futures.append(self.db_manager.writer.submit(
+                    "update_prediction_result",
+                    prediction['id'],
+                    result,
+                    1 if prediction_correct else 0
+                ))
                 
-        except Exception as e:
-            logger.error(f"Error checking results: {str(e)}")
-            self.check_button.configure(text="Check Failed", state="normal")
+                checked_count += 1
+                if prediction_correct:
+                    correct_count += 1
+                    
+        return checked_count, correct_count, futures
+        
+    def _on_results_checked(self, data):
+        """Show the result check summary (runs on the main thread)"""
+        checked_count, correct_count, futures = data
+        
+        # Show success message
+        if checked_count > 0:
+            self.check_button.configure(
+                text=f"Checked {checked_count} ({correct_count} correct)",
+                state="normal"
+            )
+            self.parent.after(3000, lambda: self.check_button.configure(text="Check Results"))
+        else:
+            self.check_button.configure(text="No New Results", state="normal")
             self.parent.after(2000, lambda: self.check_button.configure(text="Check Results"))
-    
+            
+        # Update results table once the updates are committed
+        self._when_done(futures, lambda results, error: self._update_results_table())
+        
+    def _on_check_error(self, error):
+        """Handle a failed result check (runs on the main thread)"""
+        logger.error(f"Error checking results: {str(error)}")
+        self.check_button.configure(text="Check Failed", state="normal")
+        self.parent.after(2000, lambda: self.check_button.configure(text="Check Results"))
+        
     def update_settings(self):
         """Update settings from settings manager"""
         # Update theme from parent class
@@ -5,7 +5,7 @@ from datetime import datetime
 import logging
 from typing import Dict, List, Any, Optional, Callable
 
-from tabs.base_tab import BaseTab
+from tabs.base_tab import BaseTab, sync_treeview
 from modules.api_client import FootballAPI
 from modules.db_manager import DatabaseManager
 from modules.settings_manager import SettingsManager
@@ -39,6 +39,9 @@ class FormTab(BaseTab):
         # Create UI elements
         self._create_ui()
         
+        # Reload when auto refresh has new data
+        self._subscribe_refresh(("form",))
+        
     def _create_ui(self):
         """Create the form tab UI elements"""
         # Title
@@ -122,8 +125,12 @@ class FormTab(BaseTab):
                 {"text": "Form Points", "width": 100},
                 {"text": "Form PPG", "width": 80},
                 {"text": "Perf. Diff", "width": 80}
-            ]
+            ],
+            virtual=True
         )
+        self.form_analysis_table.enable_sorting()
+        self.form_analysis_table.tag_configure('positive', foreground='green')
+        self.form_analysis_table.tag_configure('negative', foreground='red')
         
         # Upcoming Fixtures Tab
         self.fixtures_frame = ctk.CTkFrame(self.notebook)
@@ -197,104 +204,98 @@ class FormTab(BaseTab):
         # Show loading indicator overlay
         self.show_loading_indicator()
         
-        # Get data in a separate thread
-        self.parent.after(100, self._fetch_data)
-            
-    def _fetch_data(self):
-        """Fetch data from API"""
-        try:
-            # Get form data
-            league_id = self.selected_league.get()
-            form_length = self.form_length.get()
-            
-            try:
-                # Fetch data from API with timeout handling
-                self.form_data = self.api.fetch_all_teams({league_id: {"name": "", "flag": ""}}, form_length)
-                
-                if not self.form_data:
-                    logger.warning(f"No form data returned for league {league_id}")
-                    self.refresh_button.configure(text="No Data Found", state="normal")
-                    self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
-                    return
-            except KeyboardInterrupt:
-                logger.warning("Team data fetch interrupted by user")
-                self.refresh_button.configure(text="Fetch Interrupted", state="normal")
-                self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
-                return
-            except Exception as e:
-                logger.error(f"Error fetching team data: {str(e)}")
-                self.refresh_button.configure(text="Team Data Error", state="normal")
-                self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
-                return
-            
-            # Update status
-            self.refresh_button.configure(text="Fetching fixtures...", state="disabled")
-            
-            # Get upcoming fixtures for teams with significant form changes
-            self.upcoming_fixtures_data = []
-            threshold = self.settings_manager.get_threshold()
-            
-            try:
-                # Fetch fixtures once for the league
-                fixtures = self.api.fetch_fixtures(league_id)
-                
-                for team_data in self.form_data:
-                    if abs(team_data.get('performance_diff', 0)) >= threshold:
-                        # Get upcoming matches
-                        upcoming_matches = self._get_upcoming_matches(fixtures, team_data['team_id'])
-                        
-                        if upcoming_matches:
-                            for match in upcoming_matches:
-                                # Create prediction
-                                prediction, prediction_level = self._generate_prediction(team_data['performance_diff'])
-                                
-                                # Add to upcoming fixtures data
-                                self.upcoming_fixtures_data.append({
-                                    'team_id': team_data['team_id'],
-                                    'team': team_data['team'],
-                                    'league_id': league_id,
-                                    'league_name': get_league_display_name(league_id),
-                                    'performance_diff': team_data['performance_diff'],
-                                    'prediction': prediction,
-                                    'prediction_level': prediction_level,
-                                    'opponent_id': match['opponent_id'],
-                                    'opponent': match['opponent'],
-                                    'fixture_id': match['fixture_id'],
-                                    'date': match['date'],
-                                    'time': match['time'],
-                                    'venue': match['venue'],
-                                    'status': match['status']
-                                })
-            except KeyboardInterrupt:
-                logger.warning("Fixtures fetch interrupted by user")
-                # Continue with whatever data we have
-            except Exception as e:
-                logger.error(f"Error fetching fixtures: {str(e)}")
-                # Continue with whatever data we have
+        # Read the selection on the main thread, fetch in a worker thread
+        self._run_in_background(
+            self._fetch_data,
+            self.selected_league.get(),
+            self.form_length.get(),
+            self.settings_manager.get_threshold(),
+            on_success=self._on_data_loaded,
+            on_error=self._on_fetch_error
+        )
             
-            # Update tables
-            self._update_form_table()
-            self._update_fixtures_table()
+    def _fetch_data(self, league_id, form_length, threshold):
+        """Fetch form data and upcoming fixtures from API (runs in a worker thread)"""
+        # Fetch data from API
+        form_data = self.api.fetch_all_teams({league_id: {"name": "", "flag": ""}}, form_length)
+        
+        if not form_data:
+            logger.warning(f"No form data returned for league {league_id}")
+            return None
             
-            # Reset refresh button
-            self.refresh_button.configure(text="Refresh Data", state="normal")
+        if self._task_cancelled():
+            return None
             
-            # Hide loading indicator
-            self.hide_loading_indicator()
+        # Update status
+        self._post_to_ui(lambda: self.refresh_button.configure(text="Fetching fixtures...", state="disabled"))
+        
+        # Get upcoming fixtures for teams with significant form changes
+        upcoming_fixtures_data = []
+        
+        try:
+            # Fetch fixtures once for the league
+            fixtures = self.api.fetch_fixtures(league_id)
             
-        except KeyboardInterrupt:
-            logger.warning("Data fetch interrupted by user")
-            self.refresh_button.configure(text="Interrupted", state="normal")
-            self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
-            # Hide loading indicator
-            self.hide_loading_indicator()
+            for team_data in form_data:
+                if abs(team_data.get('performance_diff', 0)) >= threshold:
+                    # Get upcoming matches
+                    upcoming_matches = self._get_upcoming_matches(fixtures, team_data['team_id'])
+                    
+                    if upcoming_matches:
+                        for match in upcoming_matches:
+                            # Create prediction
+                            prediction, prediction_level = self._generate_prediction(team_data['performance_diff'])
+                            
+                            # Add to upcoming fixtures data
+                            upcoming_fixtures_data.append({
+                                'team_id': team_data['team_id'],
+                                'team': team_data['team'],
+                                'league_id': league_id,
+                                'league_name': get_league_display_name(league_id),
+                                'performance_diff': team_data['performance_diff'],
+                                'prediction': prediction,
+                                'prediction_level': prediction_level,
+                                'opponent_id': match['opponent_id'],
+                                'opponent': match['opponent'],
+                                'fixture_id': match['fixture_id'],
+                                'date': match['date'],
+                                'time': match['time'],
+                                'venue': match['venue'],
+                                'status': match['status']
+                            })
         except Exception as e:
-            logger.error(f"Error fetching data: {str(e)}")
-            self.refresh_button.configure(text="Refresh Failed", state="normal")
+            logger.error(f"Error fetching fixtures: {str(e)}")
+            # Continue with whatever data we have
+            
+        return form_data, upcoming_fixtures_data
+        
+    def _on_data_loaded(self, data):
+        """Show fetched data (runs on the main thread)"""
+        # Hide loading indicator
+        self.hide_loading_indicator()
+        
+        if data is None:
+            self.refresh_button.configure(text="No Data Found", state="normal")
             self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
-            # Hide loading indicator
-            self.hide_loading_indicator()
+            return
             
+        self.form_data, self.upcoming_fixtures_data = data
+        
+        # Update tables
+        self._update_form_table()
+        self._update_fixtures_table()
+        
+        # Reset refresh button
+        self.refresh_button.configure(text="Refresh Data", state="normal")
+        
+    def _on_fetch_error(self, error):
+        """Handle a failed fetch (runs on the main thread)"""
+        logger.error(f"Error fetching data: {str(error)}")
+        self.refresh_button.configure(text="Refresh Failed", state="normal")
+        self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
+        # Hide loading indicator
+        self.hide_loading_indicator()
+        
     def _get_upcoming_matches(self, fixtures, team_id, top_n=1):
         """Get upcoming matches for a team"""
         from modules.form_analyzer import FormAnalyzer
@@ -302,19 +303,14 @@ class FormTab(BaseTab):
             
     def _update_form_table(self):
         """Update the form analysis table"""
-        # Clear table
-        for item in self.form_analysis_table.get_children():
-            self.form_analysis_table.delete(item)
-            
-        # Add data
-        for i, team in enumerate(self.form_data):
+        rows = []
+        for team in self.form_data:
             # Format form string
             form_str = self._format_form_string(team.get('form', ''))
             
             # Add row
-            self.form_analysis_table.insert(
-                "", "end",
-                values=(
+            rows.append((
+                (
                     team.get('team', ''),
                     team.get('league', ''),
                     team.get('current_position', ''),
@@ -325,19 +321,14 @@ class FormTab(BaseTab):
                     team.get('form_ppg', ''),
                     team.get('performance_diff', '')
                 ),
-                tags=('positive' if team.get('performance_diff', 0) > 0 else 'negative',)
-            )
+                ('positive' if team.get('performance_diff', 0) > 0 else 'negative',)
+            ))
             
-        # Configure tags
-        self.form_analysis_table.tag_configure('positive', foreground='green')
-        self.form_analysis_table.tag_configure('negative', foreground='red')
+        # Only the visible rows are put into the table
+        self.form_analysis_table.set_rows(rows, keep_position=True)
             
     def _update_fixtures_table(self):
         """Update the upcoming fixtures table"""
-        # Clear table
-        for item in self.fixtures_table.get_children():
-            self.fixtures_table.delete(item)
-            
         # Filter out past matches
         try:
             current_date = datetime.now().strftime('%Y-%m-%d')
@@ -397,24 +388,29 @@ class FormTab(BaseTab):
                 fixtures_by_date[original_date] = []
             fixtures_by_date[original_date].append(fixture)
         
-        # Add data with date separators
+        # Add date separators, only rows that changed are touched
+        separators = []
         for date, fixtures in fixtures_by_date.items():
             # Get formatted date for display (from the first fixture in this group)
             formatted_date = fixtures[0].get('formatted_date', date) if fixtures else date
             
-            # Add date separator
-            separator_id = self.fixtures_table.insert(
-                "", "end",
-                values=("", "", "", "", f"--- {formatted_date} ---", "", "", ""),
-                tags=('date_separator',)
-            )
+            separators.append((
+                f"date-{date}",
+                ("", "", "", "", f"--- {formatted_date} ---", "", "", ""),
+                ('date_separator',)
+            ))
             
-            # Add fixtures for this date
+        new_separators = [row[0] for row in separators if not self.fixtures_table.exists(row[0])]
+        sync_treeview(self.fixtures_table, separators)
+        
+        # Add fixtures for each date as children of the date separator
+        for date, fixtures in fixtures_by_date.items():
+            separator_id = f"date-{date}"
+            rows = []
             for fixture in fixtures:
-                # Add row as child of date separator
-                self.fixtures_table.insert(
-                    separator_id, "end",
-                    values=(
+                rows.append((
+                    f"{fixture.get('team_id')}-{fixture.get('fixture_id')}",
+                    (
                         fixture.get('team', ''),
                         fixture.get('performance_diff', ''),
                         fixture.get('prediction', ''),
@@ -424,10 +420,13 @@ class FormTab(BaseTab):
                         fixture.get('venue', ''),
                         fixture.get('status', '')
                     ),
-                    tags=('positive' if fixture.get('performance_diff', 0) > 0 else 'negative',)
-                )
+                    ('positive' if fixture.get('performance_diff', 0) > 0 else 'negative',)
+                ))
+                
+            sync_treeview(self.fixtures_table, rows, separator_id)
             
-            # Expand the date separator by default
+        # Expand new date separators by default
+        for separator_id in new_separators:
             self.fixtures_table.item(separator_id, open=True)
             
         # Configure tags
@@ -464,7 +463,7 @@ class FormTab(BaseTab):
     def _save_predictions(self):
         """Save predictions to database"""
         try:
-            saved_count = 0
+            futures = []
             
             for fixture in self.upcoming_fixtures_data:
                 # Create prediction data
@@ -483,23 +482,32 @@ class FormTab(BaseTab):
                     'prediction_level': fixture['prediction_level']
                 }
                 
-                # Save to database
-                prediction_id = self.db_manager.save_prediction(prediction_data)
-                if prediction_id > 0:
-                    saved_count += 1
-            
-            # Show success message
-            if saved_count > 0:
-                self.save_button.configure(text=f"Saved {saved_count} Predictions")
-                self.parent.after(2000, lambda: self.save_button.configure(text="Save Predictions to Database"))
-            else:
-                self.save_button.configure(text="No New Predictions")
-                self.parent.after(2000, lambda: self.save_button.configure(text="Save Predictions to Database"))
+                # Queue the save on the database writer thread
+                futures.append(self.db_manager.writer.submit("save_prediction", prediction_data))
+                
+            self.save_button.configure(text="Saving...", state="disabled")
+            self._when_done(futures, self._on_predictions_saved)
                 
         except Exception as e:
             logger.error(f"Error saving predictions: {str(e)}")
             self.save_button.configure(text="Save Failed")
             self.parent.after(2000, lambda: self.save_button.configure(text="Save Predictions to Database"))
+            
+    def _on_predictions_saved(self, prediction_ids, error):
+        """Show the result of queued prediction saves"""
+        if error:
+            logger.error(f"Error saving predictions: {str(error)}")
+            
+        saved_count = sum(1 for prediction_id in prediction_ids if prediction_id)
+        
+        # Show success message
+        if saved_count > 0:
+            self.save_button.configure(text=f"Saved {saved_count} Predictions", state="normal")
+        elif error:
+            self.save_button.configure(text="Save Failed", state="normal")
+        else:
+            self.save_button.configure(text="No New Predictions", state="normal")
+        self.parent.after(2000, lambda: self.save_button.configure(text="Save Predictions to Database"))
     
     def _sort_fixtures_table(self, col_idx):
         """Sort the fixtures table by the specified column"""
@@ -3,14 +3,13 @@ import tkinter as tk
 from tkinter import ttk
 import logging
 from typing import Dict, List, Any, Optional, Callable
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-from tabs.base_tab import BaseTab
+from tabs.base_tab import BaseTab, sync_treeview
 from modules.api_client import FootballAPI
 from modules.db_manager import DatabaseManager
 from modules.settings_manager import SettingsManager
 from modules.league_names import get_league_options, get_league_display_name
+from modules.chart_renderer import ChartRenderer, get_widget_size, to_photo_image
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +35,9 @@ class LeagueStatsTab(BaseTab):
         # Create UI elements
         self._create_ui()
         
+        # Reload when auto refresh has new data
+        self._subscribe_refresh(("standings",))
+        
     def _create_ui(self):
         """Create the league stats tab UI elements"""
         # Title
@@ -139,10 +141,15 @@ class LeagueStatsTab(BaseTab):
         self.charts_container = ctk.CTkFrame(self.charts_frame)
         self.charts_container.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Create matplotlib figure for chart
-        self.chart_fig = plt.Figure(figsize=(10, 6), dpi=100)
-        self.chart_canvas = FigureCanvasTkAgg(self.chart_fig, master=self.charts_container)
-        self.chart_canvas.get_tk_widget().pack(fill="both", expand=True)
+        # Chart image, charts are rendered in the background and cached
+        self.chart_renderer = ChartRenderer()
+        self.chart_photo = None
+        self.chart_size = None
+        self.chart_resize_job = None
+        
+        self.chart_label = tk.Label(self.charts_container, bg="white", bd=0, highlightthickness=0)
+        self.chart_label.pack(fill="both", expand=True)
+        self.chart_label.bind("<Configure>", self._on_chart_resized)
         
         # Stats Tab
         self.stats_frame = ctk.CTkFrame(self.notebook)
@@ -219,25 +226,38 @@ class LeagueStatsTab(BaseTab):
         # Show loading animation
         self._show_loading_animation(self.refresh_button, "Refresh Data")
         
-        # Get data in a separate thread
-        self.parent.after(100, self._fetch_data)
-            
-    def _fetch_data(self):
-        """Fetch data from API"""
-        try:
-            # Get league ID
-            league_id = self.selected_league.get()
-            
-            # Fetch standings
-            standings = self.api.fetch_standings(league_id)
+        # Read the selection on the main thread, fetch in a worker thread
+        self._run_in_background(
+            self._fetch_data,
+            self.selected_league.get(),
+            on_success=self._on_data_loaded,
+            on_error=self._on_fetch_error
+        )
             
-            if not standings or not standings.get('response'):
-                logger.warning(f"No standings for league {league_id}")
-                self.refresh_button.configure(text="Refresh Data", state="normal")
-                return
-                
-            standings_data = standings['response'][0]['league']['standings'][0]
+    def _fetch_data(self, league_id):
+        """Fetch standings from API (runs in a worker thread)"""
+        # Fetch standings
+        standings = self.api.fetch_standings(league_id)
+        
+        if not standings or not standings.get('response'):
+            logger.warning(f"No standings for league {league_id}")
+            return None
             
+        standings_data = standings['response'][0]['league']['standings'][0]
+        
+        # Record a standings snapshot in the background, unchanged rows are skipped
+        self.db_manager.writer.submit(
+            "save_standings",
+            standings_data,
+            league_id=league_id,
+            season=standings['response'][0]['league'].get('season')
+        )
+        
+        return standings_data
+        
+    def _on_data_loaded(self, standings_data):
+        """Show fetched standings (runs on the main thread)"""
+        if standings_data is not None:
             # Store standings data
             self.standings_data = standings_data
             
@@ -250,21 +270,18 @@ class LeagueStatsTab(BaseTab):
             # Update stats
             self._update_stats()
             
-            # Reset refresh button
-            self.refresh_button.configure(text="Refresh Data", state="normal")
-            
-        except Exception as e:
-            logger.error(f"Error fetching data: {str(e)}")
-            self.refresh_button.configure(text="Refresh Failed", state="normal")
-            self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data"))
-            
+        # Reset refresh button
+        self.refresh_button.configure(text="Refresh Data", state="normal")
+        
+    def _on_fetch_error(self, error):
+        """Handle a failed fetch (runs on the main thread)"""
+        logger.error(f"Error fetching data: {str(error)}")
+        self.refresh_button.configure(text="Refresh Failed", state="normal")
+        self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data"))
+        
     def _update_standings_table(self):
         """Update the standings table"""
-        # Clear table
-        for item in self.standings_table.get_children():
-            self.standings_table.delete(item)
-            
-        # Add data
+        rows = []
         for team in self.standings_data:
             # Get team data
             position = team['rank']
@@ -279,10 +296,10 @@ class LeagueStatsTab(BaseTab):
             points = team['points']
             form = team.get('form', '')
             
-            # Add row
-            self.standings_table.insert(
-                "", "end",
-                values=(
+            # Add row, keyed by team so unchanged rows are left alone
+            rows.append((
+                team['team']['id'],
+                (
                     position,
                     team_name,
                     played,
@@ -295,9 +312,11 @@ class LeagueStatsTab(BaseTab):
                     points,
                     form
                 ),
-                tags=(position,)
-            )
+                (position,)
+            ))
             
+        sync_treeview(self.standings_table, rows)
+        
         # Configure tags for top, middle, and bottom teams
         num_teams = len(self.standings_data)
         if num_teams > 0:
@@ -309,21 +328,10 @@ class LeagueStatsTab(BaseTab):
             for i in range(max(1, num_teams - 2), num_teams + 1):
                 self.standings_table.tag_configure(i, background='#FFCCCC')
             
-    def _update_chart(self):
-        """Update the chart based on selected stat type"""
-        # Clear figure
-        self.chart_fig.clear()
-        
-        # Get stat type
-        stat_type = self.stat_var.get()
-        
-        # Create subplot
-        ax = self.chart_fig.add_subplot(111)
-        
+    def _get_chart_spec(self, stat_type):
+        """Get the chart spec of a stat type from the standings data"""
         if not self.standings_data:
-            ax.text(0.5, 0.5, "No data available", ha='center', va='center')
-            self.chart_canvas.draw()
-            return
+            return {"type": "message", "text": "No data available"}
             
         # Prepare data
         team_names = [team['team']['name'] for team in self.standings_data]
@@ -351,25 +359,65 @@ class LeagueStatsTab(BaseTab):
             title = "Recent Form Points by Team"
             color = 'orange'
             
-        # Create horizontal bar chart
-        bars = ax.barh(team_names, values, color=color)
+        return {
+            "type": "barh",
+            "labels": team_names,
+            "values": values,
+            "title": title,
+            "color": color,
+            "xlabel": "Value",
+            "ylabel": "Team"
+        }
         
-        # Add value labels
-        for bar in bars:
-            width = bar.get_width()
-            ax.text(width + 0.5, bar.get_y() + bar.get_height()/2, f'{width}',
-                    ha='left', va='center')
+    def _update_chart(self):
+        """Update the chart based on selected stat type"""
+        size = get_widget_size(self.chart_label)
+        self.chart_size = size
         
-        # Set title and labels
-        ax.set_title(title)
-        ax.set_xlabel('Value')
-        ax.set_ylabel('Team')
+        # Get stat type
+        stat_type = self.stat_var.get()
+        specs = {stat: self._get_chart_spec(stat) for stat in ("Points", "Goals", "Form")}
         
-        # Adjust layout
-        self.chart_fig.tight_layout()
+        # Show a cached chart right away, otherwise render it in the background
+        image = self.chart_renderer.get_cached("standings", specs[stat_type], size)
+        if image is not None:
+            self._show_chart(image)
+        else:
+            self._run_in_background(
+                self.chart_renderer.render, "standings", specs[stat_type], size,
+                on_success=self._show_chart,
+                key="chart"
+            )
+            
+        # Render the other stats too, so switching between them is instant
+        other_specs = [spec for stat, spec in specs.items() if stat != stat_type]
+        self._run_in_background(self._prerender_charts, other_specs, size, key="prerender")
+        
+    def _prerender_charts(self, specs, size):
+        """Render charts into the cache (runs in a worker thread)"""
+        for spec in specs:
+            if self._task_cancelled():
+                return
+            self.chart_renderer.render("standings", spec, size)
+            
+    def _show_chart(self, image):
+        """Show a rendered chart (runs on the main thread)"""
+        self.chart_photo = to_photo_image(image)
+        self.chart_label.configure(image=self.chart_photo)
+        
+    def _on_chart_resized(self, event):
+        """Render the chart again for the new size once resizing stops"""
+        if (event.width, event.height) == self.chart_size:
+            return
+            
+        if self.chart_resize_job is not None:
+            self.parent.after_cancel(self.chart_resize_job)
+        self.chart_resize_job = self.parent.after(200, self._on_chart_resize_done)
         
-        # Draw canvas
-        self.chart_canvas.draw()
+    def _on_chart_resize_done(self):
+        """Update the chart after a resize"""
+        self.chart_resize_job = None
+        self._update_chart()
         
     def _update_stats(self):
         """Update the league stats"""
@@ -3,30 +3,168 @@ import tkinter as tk
 from tkinter import ttk
 import logging
 from typing import Dict, List, Any, Optional, Callable
+import os
 import queue
 import threading
 import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
 
-from tabs.base_tab import BaseTab
+from tabs.base_tab import BaseTab, VirtualTable
 from modules.api_client import FootballAPI
 from modules.db_manager import DatabaseManager
 from modules.settings_manager import SettingsManager
 from modules.translations import translate
+from modules.config import DEFAULT_SETTINGS
 
 # Create a custom logger for this tab
 logger = logging.getLogger(__name__)
 
-# Create a queue for log messages
-log_queue = queue.Queue()
+# Maximum number of records waiting for the consumer, the oldest are dropped when it is full
+LOG_QUEUE_SIZE = 10000
+
+# Maximum number of records handled in one batch
+LOG_BATCH_SIZE = 500
+
+# Seconds the consumer collects records before handing a batch on
+LOG_BATCH_INTERVAL = 0.2
+
+# Size of one rotating log file and number of old files kept
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 3
+
+# Create a bounded queue for log messages
+log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
 
 # Create a custom handler that puts logs into the queue
 class QueueHandler(logging.Handler):
     def __init__(self, log_queue):
         super().__init__()
         self.log_queue = log_queue
+        self.dropped = 0
         
     def emit(self, record):
-        self.log_queue.put(record)
+        # Never block the logging thread, make room by dropping the oldest record
+        while True:
+            try:
+                self.log_queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.log_queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+class LogBuffer:
+    """
+    Ring buffer of log entries filled by a background consumer thread
+    
+    The consumer blocks on the log queue and takes records in batches. Each batch is
+    formatted, optionally written to a rotating log file and added to the buffer, then
+    the listener is called once for the whole batch.
+    """
+    
+    def __init__(self, log_queue, capacity: int):
+        self.log_queue = log_queue
+        self.entries = deque(maxlen=capacity)
+        self.file_handler = None
+        self.listener = None
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        
+        self._thread = threading.Thread(target=self._consume, name="LogConsumer", daemon=True)
+        self._thread.start()
+        
+    def snapshot(self) -> List[tuple]:
+        """Get a copy of the buffered entries, oldest first"""
+        with self._lock:
+            return list(self.entries)
+            
+    def clear(self):
+        """Remove all buffered entries"""
+        with self._lock:
+            self.entries.clear()
+            
+    def set_capacity(self, capacity: int):
+        """Change the number of kept entries, keeping the newest ones"""
+        with self._lock:
+            if capacity != self.entries.maxlen:
+                self.entries = deque(self.entries, maxlen=capacity)
+                
+    def set_log_file(self, file_path: Optional[str]):
+        """Write records to a rotating log file, None stops writing to a file"""
+        with self._file_lock:
+            current = self.file_handler
+            if current is not None and file_path and current.baseFilename == os.path.abspath(file_path):
+                return
+                
+            self.file_handler = None
+            if current is not None:
+                current.close()
+                
+            if not file_path:
+                return
+                
+            try:
+                directory = os.path.dirname(file_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self.file_handler = RotatingFileHandler(
+                    file_path,
+                    maxBytes=LOG_FILE_MAX_BYTES,
+                    backupCount=LOG_FILE_BACKUP_COUNT,
+                    encoding="utf-8"
+                )
+                self.file_handler.setFormatter(formatter)
+            except Exception as e:
+                logger.error(f"Error opening log file {file_path}: {str(e)}")
+                
+    def _consume(self):
+        """Consumer thread: take records from the queue in batches"""
+        while True:
+            batch = [self.log_queue.get()]
+            deadline = time.monotonic() + LOG_BATCH_INTERVAL
+            
+            # Collect more records until the batch is full or the time limit passes
+            while len(batch) < LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.log_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                    
+            try:
+                self._handle_batch(batch)
+            except Exception as e:
+                # Logging here could feed the queue again, so only print
+                print(f"Error in log consumer: {str(e)}")
+                
+    def _handle_batch(self, batch: List[logging.LogRecord]):
+        """Format a batch of records, write them to the log file and buffer them"""
+        entries = []
+        for record in batch:
+            entries.append((
+                time.strftime("%H:%M:%S", time.localtime(record.created)),
+                record.levelname,
+                record.name,
+                record.getMessage()
+            ))
+            
+        # File writes happen here, off the threads that log and off the UI thread
+        with self._file_lock:
+            if self.file_handler is not None:
+                for record in batch:
+                    self.file_handler.handle(record)
+                    
+        with self._lock:
+            self.entries.extend(entries)
+            
+        listener = self.listener
+        if listener is not None:
+            listener()
 
 # Add the queue handler to the root logger
 root_logger = logging.getLogger()
@@ -36,6 +174,14 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 queue_handler.setFormatter(formatter)
 root_logger.addHandler(queue_handler)
 
+# Start consuming records right away, so the queue never fills up before the tab is opened
+log_buffer = LogBuffer(log_queue, DEFAULT_SETTINGS["log_buffer_capacity"])
+
+def apply_log_settings(settings_manager: SettingsManager):
+    """Apply the buffer capacity and log file settings"""
+    log_buffer.set_capacity(settings_manager.get_log_buffer_capacity())
+    log_buffer.set_log_file(settings_manager.get_log_file_path() if settings_manager.get_log_to_file() else None)
+
 class LogsTab(BaseTab):
     def __init__(self, parent, api: FootballAPI, db_manager: DatabaseManager, settings_manager: SettingsManager):
         super().__init__(parent, api, db_manager, settings_manager)
@@ -43,11 +189,12 @@ class LogsTab(BaseTab):
         # Create UI elements
         self._create_ui()
         
-        # Start log consumer thread
-        self.running = True
-        self.log_thread = threading.Thread(target=self._consume_logs)
-        self.log_thread.daemon = True
-        self.log_thread.start()
+        # Show buffered records, then get notified once per batch of new records
+        self._ensure_runner()
+        self._flush_lock = threading.Lock()
+        self._flush_scheduled = False
+        self._show_logs()
+        log_buffer.listener = self._on_new_logs
         
     def _create_ui(self):
         """Create the logs tab UI elements"""
@@ -122,6 +269,9 @@ class LogsTab(BaseTab):
         hsb = ttk.Scrollbar(self.log_frame, orient="horizontal", command=self.log_tree.xview)
         self.log_tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
         
+        # Only the visible log rows are kept in the treeview
+        self.log_table = VirtualTable(self.log_tree, vsb)
+        
         # Grid layout
         self.log_tree.grid(column=0, row=0, sticky="nsew")
         vsb.grid(column=1, row=0, sticky="ns")
@@ -162,63 +312,44 @@ class LogsTab(BaseTab):
         
     def _clear_logs(self):
         """Clear all logs from the display"""
-        for item in self.log_tree.get_children():
-            self.log_tree.delete(item)
-            
+        log_buffer.clear()
+        self._show_logs()
+        
         # Update status
         self.status_label.configure(text=translate("Logs cleared"))
         
         # Log the action
         logger.info("Logs cleared")
         
-    def _consume_logs(self):
-        """Consume logs from the queue and add them to the treeview"""
-        while self.running:
-            try:
-                # Check if there are any logs in the queue
-                if not log_queue.empty():
-                    # Get the log record
-                    record = log_queue.get(block=False)
-                    
-                    # Format the time
-                    time_str = time.strftime("%H:%M:%S", time.localtime(record.created))
-                    
-                    try:
-                        # Add to treeview - use try/except to handle case where main thread is not ready
-                        self.parent.after(0, self._add_log_to_tree, time_str, record)
-                    except RuntimeError:
-                        # If main thread is not in main loop yet, just discard the log
-                        pass
-                    
-                # Sleep a bit to avoid high CPU usage
-                time.sleep(0.1)
-            except queue.Empty:
-                # Queue is empty, just continue
-                time.sleep(0.1)
-            except Exception as e:
-                # Catch and print other exceptions but don't crash the thread
-                print(f"Error in log consumer: {str(e)}")
-                time.sleep(1.0)  # Sleep longer on error to avoid spamming
-                
-    def _add_log_to_tree(self, time_str, record):
-        """Add a log record to the treeview (called from main thread)"""
+    def _on_new_logs(self):
+        """Schedule one display update for new records (called from the consumer thread)"""
+        with self._flush_lock:
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+            
+        self._post_to_ui(self._show_logs)
+        
+    def _show_logs(self):
+        """Show the buffered records, newest first (called from main thread)"""
+        with self._flush_lock:
+            self._flush_scheduled = False
+            
         try:
-            # Insert at the beginning
-            self.log_tree.insert(
-                "", 0,
-                values=(
-                    time_str,
-                    record.levelname,
-                    record.name,
-                    record.getMessage()
-                ),
-                tags=(record.levelname,)
+            entries = log_buffer.snapshot()
+            self.log_table.set_rows(
+                [(entry, (entry[1],)) for entry in reversed(entries)],
+                keep_position=True
             )
             
             # Update status
-            self.status_label.configure(text=f"{translate('Last log')}: {time_str}")
+            if entries:
+                status = f"{translate('Last log')}: {entries[-1][0]}"
+                if queue_handler.dropped:
+                    status += f" ({queue_handler.dropped} dropped)"
+                self.status_label.configure(text=status)
         except Exception as e:
-            print(f"Error adding log to tree: {e}")
+            print(f"Error showing logs: {e}")
             
     def update_settings(self):
         """Update settings from settings manager"""
@@ -231,8 +362,9 @@ class LogsTab(BaseTab):
             hover_color=self.theme["primary"]
         )
         
+        # The buffer capacity may have changed
+        self._show_logs()
+        
     def on_close(self):
         """Called when the tab is closed or the application is exiting"""
-        self.running = False
-        if self.log_thread.is_alive():
-            self.log_thread.join(1.0)  # Wait for thread to finish with timeout
+        log_buffer.listener = None
@@ -4,7 +4,7 @@ from tkinter import ttk
 import logging
 from typing import Dict, List, Any, Optional, Callable
 
-from tabs.base_tab import BaseTab
+from tabs.base_tab import BaseTab, sync_treeview
 from modules.api_client import FootballAPI
 from modules.db_manager import DatabaseManager
 from modules.settings_manager import SettingsManager
@@ -18,6 +18,7 @@ class NextRoundTab(BaseTab):
         
         # Initialize variables
         self.fixtures_data = []
+        self.team_stats = {}
         
         # Get leagues from settings, use default if empty
         leagues = self.settings_manager.get_leagues()
@@ -34,6 +35,9 @@ class NextRoundTab(BaseTab):
         # Create UI elements
         self._create_ui()
         
+        # Reload when auto refresh has new data
+        self._subscribe_refresh(("fixtures",))
+        
     def _create_ui(self):
         """Create the next round tab UI elements"""
         # Title
@@ -152,77 +156,74 @@ class NextRoundTab(BaseTab):
         # Show loading indicator overlay
         self.show_loading_indicator()
         
-        # Get data in a separate thread
-        self.parent.after(100, self._fetch_data)
-            
-    def _fetch_data(self):
-        """Fetch data from API"""
-        try:
-            # Get league ID
-            league_id = self.selected_league.get()
-            
-            # Show status message
-            self.refresh_button.configure(text="Fetching fixtures...", state="disabled")
-            
-            try:
-                # Fetch next fixtures with timeout handling
-                fixtures = self.api.fetch_next_fixtures(league_id)
-                
-                if not fixtures:
-                    logger.warning(f"No fixtures for league {league_id}")
-                    self.refresh_button.configure(text="No Fixtures Found", state="normal")
-                    self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
-                    return
-            except KeyboardInterrupt:
-                logger.warning("Fixtures fetch interrupted by user")
-                self.refresh_button.configure(text="Fetch Interrupted", state="normal")
-                self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
-                return
-            except Exception as e:
-                logger.error(f"Error fetching fixtures: {str(e)}")
-                self.refresh_button.configure(text="Fixtures Error", state="normal")
-                self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
-                return
-                
-            # Store fixtures data
-            self.fixtures_data = fixtures
-            
-            # Get round info
-            round_name = fixtures[0]['league']['round'] if fixtures else "Unknown"
-            self.round_label.configure(text=f"Round: {round_name}")
-            
-            # Update status
-            self.refresh_button.configure(text="Updating table...", state="disabled")
-            
-            # Update fixtures table
-            self._update_fixtures_table()
+        # Show status message
+        self.refresh_button.configure(text="Fetching fixtures...", state="disabled")
+        
+        # Read the selection on the main thread, fetch in a worker thread
+        self._run_in_background(
+            self._fetch_data,
+            self.selected_league.get(),
+            on_success=self._on_data_loaded,
+            on_error=self._on_fetch_error
+        )
             
-            # Reset refresh button
-            self.refresh_button.configure(text="Refresh Data", state="normal")
+    def _fetch_data(self, league_id):
+        """Fetch next fixtures and team statistics from API (runs in a worker thread)"""
+        # Fetch next fixtures
+        fixtures = self.api.fetch_next_fixtures(league_id)
+        
+        if not fixtures:
+            logger.warning(f"No fixtures for league {league_id}")
+            return None
             
-            # Hide loading indicator
-            self.hide_loading_indicator()
+        # Prefetch team statistics for both teams of every fixture concurrently
+        pairs = [
+            (fixture['league']['id'], fixture['teams'][side]['id'])
+            for fixture in fixtures
+            for side in ('home', 'away')
+        ]
+        stats = self.api.prefetch_team_statistics(pairs, cancelled=self._task_cancelled)
+        
+        if self._task_cancelled():
+            return None
             
-        except KeyboardInterrupt:
-            logger.warning("Data fetch interrupted by user")
-            self.refresh_button.configure(text="Interrupted", state="normal")
-            self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
-            # Hide loading indicator
-            self.hide_loading_indicator()
-        except Exception as e:
-            logger.error(f"Error fetching data: {str(e)}")
-            self.refresh_button.configure(text="Refresh Failed", state="normal")
+        team_stats = {team_id: team_data for (league, team_id), team_data in stats.items()}
+        return fixtures, team_stats
+        
+    def _on_data_loaded(self, data):
+        """Show fetched data (runs on the main thread)"""
+        # Hide loading indicator
+        self.hide_loading_indicator()
+        
+        if data is None:
+            self.refresh_button.configure(text="No Fixtures Found", state="normal")
             self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
-            # Hide loading indicator
-            self.hide_loading_indicator()
+            return
             
+        # Store fixtures data
+        self.fixtures_data, self.team_stats = data
+        
+        # Get round info
+        round_name = self.fixtures_data[0]['league']['round'] if self.fixtures_data else "Unknown"
+        self.round_label.configure(text=f"Round: {round_name}")
+        
+        # Update fixtures table
+        self._update_fixtures_table()
+        
+        # Reset refresh button
+        self.refresh_button.configure(text="Refresh Data", state="normal")
+        
+    def _on_fetch_error(self, error):
+        """Handle a failed fetch (runs on the main thread)"""
+        logger.error(f"Error fetching data: {str(error)}")
+        self.refresh_button.configure(text="Refresh Failed", state="normal")
+        self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data", state="normal"))
+        # Hide loading indicator
+        self.hide_loading_indicator()
+        
     def _update_fixtures_table(self):
         """Update the fixtures table"""
-        # Clear table
-        for item in self.fixtures_table.get_children():
-            self.fixtures_table.delete(item)
-            
-        # Add data
+        rows = []
         for fixture in self.fixtures_data:
             try:
                 # Get fixture data
@@ -243,9 +244,9 @@ class NextRoundTab(BaseTab):
                 prediction = "Unknown"
                 
                 try:
-                    # Fetch team statistics with error handling
-                    home_stats = self.api.fetch_team_statistics(league_id, home_team_id)
-                    away_stats = self.api.fetch_team_statistics(league_id, away_team_id)
+                    # Team statistics were fetched in the background
+                    home_stats = self.team_stats.get(home_team_id, {})
+                    away_stats = self.team_stats.get(away_team_id, {})
                     
                     # Extract form data
                     home_form = home_stats.get('form', 'N/A')
@@ -261,17 +262,14 @@ class NextRoundTab(BaseTab):
                         prediction = "Away Win"
                     else:
                         prediction = "Draw"
-                except KeyboardInterrupt:
-                    logger.warning("Team statistics fetch interrupted by user")
-                    # Use default values
                 except Exception as e:
                     logger.error(f"Error fetching team statistics: {str(e)}")
                     # Use default values
                 
-                # Add row
-                self.fixtures_table.insert(
-                    "", "end",
-                    values=(
+                # Add row, keyed by fixture so unchanged rows are left alone
+                rows.append((
+                    fixture['fixture']['id'],
+                    (
                         date,
                         time,
                         home_team,
@@ -281,11 +279,13 @@ class NextRoundTab(BaseTab):
                         away_form,
                         prediction
                     ),
-                    tags=(fixture['fixture']['id'],)
-                )
+                    (fixture['fixture']['id'],)
+                ))
             except Exception as e:
                 logger.error(f"Error processing fixture: {str(e)}")
                 continue
+                
+        sync_treeview(self.fixtures_table, rows)
             
     def _on_fixture_selected(self, event):
         """Handle fixture selection"""
@@ -316,10 +316,10 @@ class NextRoundTab(BaseTab):
         away_team_id = fixture_data['teams']['away']['id']
         league_id = fixture_data['league']['id']
         
-        # Fetch team statistics
+        # Use the team statistics fetched in the background
         try:
-            home_stats = self.api.fetch_team_statistics(league_id, home_team_id)
-            away_stats = self.api.fetch_team_statistics(league_id, away_team_id)
+            home_stats = self.team_stats.get(home_team_id, {})
+            away_stats = self.team_stats.get(away_team_id, {})
             
             # Extract form data
             home_form = home_stats.get('form', 'N/A')
@@ -387,6 +387,75 @@ class SettingsTab:
             )
         )
         
+        # Startup
+        self.startup_frame = ctk.CTkFrame(self.data_frame)
+        self.startup_frame.pack(fill="x", padx=20, pady=20)
+        
+        self.startup_label = ctk.CTkLabel(
+            self.startup_frame,
+            text="Startup:",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        self.startup_label.pack(anchor="w", padx=10, pady=(10, 5))
+        
+        self.warm_up_tabs_var = tk.BooleanVar(value=self.settings_manager.get_warm_up_tabs())
+        
+        self.warm_up_tabs_switch = ctk.CTkSwitch(
+            self.startup_frame,
+            text="Prepare all tabs in the background after start",
+            variable=self.warm_up_tabs_var,
+            onvalue=True,
+            offvalue=False
+        )
+        self.warm_up_tabs_switch.pack(anchor="w", padx=10, pady=5)
+        
+        # Logging
+        self.logging_frame = ctk.CTkFrame(self.data_frame)
+        self.logging_frame.pack(fill="x", padx=20, pady=20)
+        
+        self.logging_label = ctk.CTkLabel(
+            self.logging_frame,
+            text="Logging:",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        self.logging_label.pack(anchor="w", padx=10, pady=(10, 5))
+        
+        self.log_to_file_var = tk.BooleanVar(value=self.settings_manager.get_log_to_file())
+        
+        self.log_to_file_switch = ctk.CTkSwitch(
+            self.logging_frame,
+            text=f"Write logs to {self.settings_manager.get_log_file_path()}",
+            variable=self.log_to_file_var,
+            onvalue=True,
+            offvalue=False
+        )
+        self.log_to_file_switch.pack(anchor="w", padx=10, pady=5)
+        
+        self.log_capacity_var = tk.IntVar(value=self.settings_manager.get_log_buffer_capacity())
+        
+        self.log_capacity_slider = ctk.CTkSlider(
+            self.logging_frame,
+            from_=1000,
+            to=50000,
+            number_of_steps=49,
+            variable=self.log_capacity_var
+        )
+        self.log_capacity_slider.pack(fill="x", padx=10, pady=5)
+        
+        self.log_capacity_value_label = ctk.CTkLabel(
+            self.logging_frame,
+            text=f"Log records kept: {self.log_capacity_var.get()}",
+            font=ctk.CTkFont(size=10)
+        )
+        self.log_capacity_value_label.pack(anchor="w", padx=10, pady=5)
+        
+        # Update label when slider changes
+        self.log_capacity_slider.configure(
+            command=lambda value: self.log_capacity_value_label.configure(
+                text=f"Log records kept: {int(value)}"
+            )
+        )
+        
     def _create_leagues_settings(self):
         """Create leagues settings UI"""
         # Leagues Selection
@@ -654,6 +723,9 @@ class SettingsTab:
             self.settings_manager.set_setting("threshold", float(self.threshold_var.get()))
             self.settings_manager.set_setting("auto_refresh", bool(self.auto_refresh_var.get()))
             self.settings_manager.set_setting("refresh_interval", int(self.refresh_interval_var.get()))
+            self.settings_manager.set_setting("warm_up_tabs", bool(self.warm_up_tabs_var.get()))
+            self.settings_manager.set_setting("log_to_file", bool(self.log_to_file_var.get()))
+            self.settings_manager.set_setting("log_buffer_capacity", int(self.log_capacity_var.get()))
             
             # Leagues settings
             selected_leagues = [
@@ -698,6 +770,9 @@ class SettingsTab:
             self.threshold_var.set(self.settings_manager.get_threshold())
             self.auto_refresh_var.set(self.settings_manager.get_auto_refresh())
             self.refresh_interval_var.set(self.settings_manager.get_refresh_interval())
+            self.warm_up_tabs_var.set(self.settings_manager.get_warm_up_tabs())
+            self.log_to_file_var.set(self.settings_manager.get_log_to_file())
+            self.log_capacity_var.set(self.settings_manager.get_log_buffer_capacity())
             
             # Update league checkboxes
             selected_leagues = self.settings_manager.get_leagues()
@@ -713,6 +788,7 @@ class SettingsTab:
             self.form_length_value_label.configure(text=f"Current value: {self.form_length_var.get()} matches")
             self.threshold_value_label.configure(text=f"Current value: {self.threshold_var.get():.2f}")
             self.refresh_interval_value_label.configure(text=f"Current value: {self.refresh_interval_var.get()} minutes")
+            self.log_capacity_value_label.configure(text=f"Log records kept: {self.log_capacity_var.get()}")
             self.level1_value_label.configure(text=f"Current value: {self.level1_var.get():.2f}")
             self.level2_value_label.configure(text=f"Current value: {self.level2_var.get():.2f}")
             
@@ -3,12 +3,11 @@ import tkinter as tk
 from tkinter import ttk
 import logging
 from typing import Dict, List, Any, Optional, Callable
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
 
 from modules.db_manager import DatabaseManager
 from modules.settings_manager import SettingsManager
+from modules.background import BackgroundRunner
+from modules.chart_renderer import ChartRenderer, get_widget_size, to_photo_image
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +68,13 @@ class StatsTab:
         # Create predictions table
         self._create_predictions_table()
         
+        # Charts are rendered in the background and cached
+        self.chart_renderer = ChartRenderer()
+        self.chart_photos = {}
+        self.chart_sizes = {}
+        self.chart_resize_job = None
+        self.stats = None
+        
         # Create charts
         self._create_charts()
         
@@ -292,10 +298,8 @@ class StatsTab:
         )
         self.accuracy_chart_label.pack(pady=10)
         
-        # Create matplotlib figure for accuracy chart
-        self.accuracy_fig = plt.Figure(figsize=(4, 3), dpi=100)
-        self.accuracy_canvas = FigureCanvasTkAgg(self.accuracy_fig, master=self.accuracy_chart_frame)
-        self.accuracy_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        # Create image for accuracy chart
+        self.accuracy_image = self._create_chart_image(self.accuracy_chart_frame)
         
         # Predictions by Level Chart
         self.level_chart_frame = ctk.CTkFrame(self.charts_container)
@@ -308,10 +312,8 @@ class StatsTab:
         )
         self.level_chart_label.pack(pady=10)
         
-        # Create matplotlib figure for level chart
-        self.level_fig = plt.Figure(figsize=(4, 3), dpi=100)
-        self.level_canvas = FigureCanvasTkAgg(self.level_fig, master=self.level_chart_frame)
-        self.level_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        # Create image for level chart
+        self.level_image = self._create_chart_image(self.level_chart_frame)
         
         # Accuracy Over Time Chart
         self.time_chart_frame = ctk.CTkFrame(self.charts_container)
@@ -324,10 +326,15 @@ class StatsTab:
         )
         self.time_chart_label.pack(pady=10)
         
-        # Create matplotlib figure for time chart
-        self.time_fig = plt.Figure(figsize=(8, 3), dpi=100)
-        self.time_canvas = FigureCanvasTkAgg(self.time_fig, master=self.time_chart_frame)
-        self.time_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        # Create image for time chart
+        self.time_image = self._create_chart_image(self.time_chart_frame)
+        
+    def _create_chart_image(self, parent):
+        """Create a label that shows a rendered chart"""
+        label = tk.Label(parent, bg="white", bd=0, highlightthickness=0)
+        label.pack(fill="both", expand=True, padx=10, pady=10)
+        label.bind("<Configure>", self._on_chart_resized)
+        return label
         
     def _load_data(self):
         """Load data from database"""
@@ -407,66 +414,99 @@ class StatsTab:
         
     def _update_charts(self, stats):
         """Update charts with stats data"""
-        # Accuracy Pie Chart
-        self.accuracy_fig.clear()
-        ax = self.accuracy_fig.add_subplot(111)
+        self.stats = stats
         
+        # Accuracy Pie Chart
         if stats["completed"] > 0:
             correct = stats["correct"]
-            incorrect = stats["completed"] - correct
-            
-            ax.pie(
-                [correct, incorrect],
-                labels=["Correct", "Incorrect"],
-                autopct='%1.1f%%',
-                startangle=90,
-                colors=['#4CAF50', '#F44336']
-            )
-            ax.axis('equal')
+            accuracy_spec = {
+                "type": "pie",
+                "labels": ["Correct", "Incorrect"],
+                "values": [correct, stats["completed"] - correct],
+                "colors": ['#4CAF50', '#F44336']
+            }
         else:
-            ax.text(0.5, 0.5, "No completed predictions", ha='center', va='center')
-            ax.axis('off')
+            accuracy_spec = {"type": "message", "text": "No completed predictions"}
             
-        self.accuracy_canvas.draw()
-        
         # Predictions by Level Chart
-        self.level_fig.clear()
-        ax = self.level_fig.add_subplot(111)
-        
         if stats["total"] > 0:
-            levels = stats["by_level"]["counts"]
-            level_labels = [f"Level {level}" for level in sorted(levels.keys())]
-            level_counts = [levels[level] for level in sorted(levels.keys())]
-            
-            ax.bar(level_labels, level_counts, color='#3498DB')
-            ax.set_ylabel('Count')
-            ax.set_title('Predictions by Level')
+            levels = sorted(stats["by_level"]["counts"].keys())
             
-            # Add accuracy as text on bars
-            for i, level in enumerate(sorted(levels.keys())):
+            # Show accuracy as text on bars
+            accuracy_texts = []
+            for level in levels:
                 accuracy = stats["by_level"]["accuracy"].get(level, 0)
-                if accuracy > 0:
-                    ax.text(
-                        i, level_counts[i] + 0.1,
-                        f"{accuracy:.1f}%",
-                        ha='center', va='bottom'
-                    )
+                accuracy_texts.append(f"{accuracy:.1f}%" if accuracy > 0 else "")
+                
+            level_spec = {
+                "type": "bar",
+                "labels": [f"Level {level}" for level in levels],
+                "values": [stats["by_level"]["counts"][level] for level in levels],
+                "value_texts": accuracy_texts,
+                "title": "Predictions by Level",
+                "ylabel": "Count",
+                "color": '#3498DB'
+            }
         else:
-            ax.text(0.5, 0.5, "No predictions", ha='center', va='center')
-            ax.axis('off')
+            level_spec = {"type": "message", "text": "No predictions"}
             
-        self.level_canvas.draw()
-        
         # Accuracy Over Time Chart (placeholder)
-        self.time_fig.clear()
-        ax = self.time_fig.add_subplot(111)
-        
         # This would require more complex data processing
-        # For now, just show a placeholder
-        ax.text(0.5, 0.5, "Accuracy Over Time (Coming Soon)", ha='center', va='center')
-        ax.axis('off')
+        time_spec = {"type": "message", "text": "Accuracy Over Time (Coming Soon)"}
+        
+        charts = [
+            ("accuracy", self.accuracy_image, accuracy_spec, (400, 300)),
+            ("level", self.level_image, level_spec, (400, 300)),
+            ("time", self.time_image, time_spec, (800, 300))
+        ]
+        
+        # Show cached charts right away, render the others in the background
+        pending = []
+        for slot, widget, spec, default_size in charts:
+            size = get_widget_size(widget, default_size)
+            self.chart_sizes[slot] = size
+            image = self.chart_renderer.get_cached(slot, spec, size)
+            if image is not None:
+                self._show_chart(slot, image)
+            else:
+                pending.append((slot, spec, size))
+                
+        if pending:
+            BackgroundRunner.shared(self.parent.winfo_toplevel()).run(
+                (id(self), "charts"),
+                self._render_charts,
+                pending,
+                on_success=self._show_charts
+            )
+            
+    def _render_charts(self, pending):
+        """Render charts (runs in a worker thread)"""
+        return [(slot, self.chart_renderer.render(slot, spec, size)) for slot, spec, size in pending]
+        
+    def _show_charts(self, images):
+        """Show rendered charts (runs on the main thread)"""
+        for slot, image in images:
+            self._show_chart(slot, image)
+            
+    def _show_chart(self, slot, image):
+        """Show one rendered chart"""
+        widgets = {"accuracy": self.accuracy_image, "level": self.level_image, "time": self.time_image}
+        self.chart_photos[slot] = to_photo_image(image)
+        widgets[slot].configure(image=self.chart_photos[slot])
+        
+    def _on_chart_resized(self, event):
+        """Render the charts again for the new size once resizing stops"""
+        if (event.width, event.height) in self.chart_sizes.values() or self.stats is None:
+            return
             
-        self.time_canvas.draw()
+        if self.chart_resize_job is not None:
+            self.parent.after_cancel(self.chart_resize_job)
+        self.chart_resize_job = self.parent.after(200, self._on_chart_resize_done)
+        
+    def _on_chart_resize_done(self):
+        """Update the charts after a resize"""
+        self.chart_resize_job = None
+        self._update_charts(self.stats)
         
     def update_settings(self):
         """Update settings when they are changed"""
@@ -37,6 +37,9 @@ class TeamTab(BaseTab):
         # Create UI elements
         self._create_ui()
         
+        # Reload when auto refresh has new data
+        self._subscribe_refresh(("fixtures",))
+        
     def _create_ui(self):
         """Create the team tab UI elements"""
         # Title
@@ -230,106 +233,119 @@ class TeamTab(BaseTab):
         # Show loading animation
         self._show_loading_animation(self.refresh_button, "Refresh Data")
         
-        # Get data in a separate thread
-        self.parent.after(100, self._fetch_league_data)
-            
-    def _fetch_league_data(self):
-        """Fetch league data from API"""
-        try:
-            # Get league ID
-            league_id = self.selected_league.get()
-            
-            # Fetch standings
-            standings = self.api.fetch_standings(league_id)
-            
-            if not standings or not standings.get('response'):
-                logger.warning(f"No standings for league {league_id}")
-                self.refresh_button.configure(text="Refresh Data", state="normal")
-                return
-                
-            standings_data = standings['response'][0]['league']['standings'][0]
-            
-            # Get team names
-            team_names = [team['team']['name'] for team in standings_data]
-            
-            # Update team dropdown
-            self.team_dropdown.configure(values=team_names)
+        # Fetch league standings in a worker thread
+        self._run_in_background(
+            self._fetch_league_data,
+            self.selected_league.get(),
+            on_success=self._on_league_data_loaded,
+            on_error=self._on_fetch_error
+        )
             
-            # If no team is selected, select the first one
-            if not self.selected_team.get() or self.selected_team.get() not in team_names:
-                self.selected_team.set(team_names[0])
-                self.team_dropdown.set(team_names[0])
+    def _fetch_league_data(self, league_id):
+        """Fetch league standings from API (runs in a worker thread)"""
+        # Fetch standings
+        standings = self.api.fetch_standings(league_id)
+        
+        if not standings or not standings.get('response'):
+            logger.warning(f"No standings for league {league_id}")
+            return None
             
-            # Fetch team data
-            self._fetch_team_data()
+        return standings['response'][0]['league']['standings'][0]
+        
+    def _on_league_data_loaded(self, standings_data):
+        """Update the team list from the fetched standings (runs on the main thread)"""
+        if not standings_data:
+            self.refresh_button.configure(text="Refresh Data", state="normal")
+            return
             
-        except Exception as e:
-            logger.error(f"Error fetching league data: {str(e)}")
-            self.refresh_button.configure(text="Refresh Failed", state="normal")
-            self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data"))
+        # Get team names
+        team_names = [team['team']['name'] for team in standings_data]
+        
+        # Update team dropdown
+        self.team_dropdown.configure(values=team_names)
+        
+        # If no team is selected, select the first one
+        if not self.selected_team.get() or self.selected_team.get() not in team_names:
+            self.selected_team.set(team_names[0])
+            self.team_dropdown.set(team_names[0])
             
+        # Fetch team data
+        self._fetch_team_data()
+        
     def _fetch_team_data(self):
-        """Fetch team data from API"""
-        try:
-            # Get league ID
-            league_id = self.selected_league.get()
-            
-            # Get team name
-            team_name = self.selected_team.get()
-            
-            # Fetch standings
-            standings = self.api.fetch_standings(league_id)
-            
-            if not standings or not standings.get('response'):
-                logger.warning(f"No standings for league {league_id}")
-                self.refresh_button.configure(text="Refresh Data", state="normal")
-                return
-                
-            standings_data = standings['response'][0]['league']['standings'][0]
+        """Fetch team data from API in a worker thread"""
+        self._run_in_background(
+            self._fetch_team_data_worker,
+            self.selected_league.get(),
+            self.selected_team.get(),
+            on_success=self._on_team_data_loaded,
+            on_error=self._on_fetch_error,
+            key="team"
+        )
+        
+    def _fetch_team_data_worker(self, league_id, team_name):
+        """Fetch standings and fixtures of a team from API (runs in a worker thread)"""
+        # Fetch standings
+        standings = self.api.fetch_standings(league_id)
+        
+        if not standings or not standings.get('response'):
+            logger.warning(f"No standings for league {league_id}")
+            return None
             
-            # Find team data
-            team_data = None
-            for team in standings_data:
-                if team['team']['name'] == team_name:
-                    team_data = team
-                    break
-                    
-            if not team_data:
-                logger.warning(f"Team {team_name} not found in standings")
-                self.refresh_button.configure(text="Refresh Data", state="normal")
-                return
+        standings_data = standings['response'][0]['league']['standings'][0]
+        
+        # Find team data
+        team_data = None
+        for team in standings_data:
+            if team['team']['name'] == team_name:
+                team_data = team
+                break
                 
-            # Update team info
-            self.team_name_label.configure(text=f"Team: {team_data['team']['name']}")
-            
-            # Update team stats
-            self.position_label["value"].configure(text=str(team_data['rank']))
-            self.points_label["value"].configure(text=str(team_data['points']))
-            self.wins_label["value"].configure(text=str(team_data['all']['win']))
-            self.draws_label["value"].configure(text=str(team_data['all']['draw']))
-            self.losses_label["value"].configure(text=str(team_data['all']['lose']))
-            self.goals_for_label["value"].configure(text=str(team_data['all']['goals']['for']))
-            self.goals_against_label["value"].configure(text=str(team_data['all']['goals']['against']))
-            self.goal_diff_label["value"].configure(text=str(team_data['goalsDiff']))
+        if not team_data:
+            logger.warning(f"Team {team_name} not found in standings")
+            return None
             
-            # Fetch fixtures
-            team_id = team_data['team']['id']
-            fixtures = self.api.fetch_fixtures(league_id, team_id=team_id)
-            
-            # Update fixtures table
-            self._update_fixtures_table(fixtures)
-            
-            # Fetch squad (placeholder)
-            self._update_squad_table(team_id)
-            
-            # Reset refresh button
+        # Fetch fixtures
+        fixtures = self.api.fetch_fixtures(league_id, team_id=team_data['team']['id'])
+        
+        return team_data, fixtures
+        
+    def _on_team_data_loaded(self, data):
+        """Show fetched team data (runs on the main thread)"""
+        if data is None:
             self.refresh_button.configure(text="Refresh Data", state="normal")
+            return
             
-        except Exception as e:
-            logger.error(f"Error fetching team data: {str(e)}")
-            self.refresh_button.configure(text="Refresh Failed", state="normal")
-            self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data"))
-            
+        team_data, fixtures = data
+        
+        # Update team info
+        self.team_name_label.configure(text=f"Team: {team_data['team']['name']}")
+        
+        # Update team stats
+        self.position_label["value"].configure(text=str(team_data['rank']))
+        self.points_label["value"].configure(text=str(team_data['points']))
+        self.wins_label["value"].configure(text=str(team_data['all']['win']))
+        self.draws_label["value"].configure(text=str(team_data['all']['draw']))
+        self.losses_label["value"].configure(text=str(team_data['all']['lose']))
+        self.goals_for_label["value"].configure(text=str(team_data['all']['goals']['for']))
+        self.goals_against_label["value"].configure(text=str(team_data['all']['goals']['against']))
+        self.goal_diff_label["value"].configure(text=str(team_data['goalsDiff']))
+        
+        # Update fixtures table
+        self._update_fixtures_table(fixtures)
+        
+        # Fetch squad (placeholder)
+        self._update_squad_table(team_data['team']['id'])
+        
+        # Reset refresh button
+        self.refresh_button.configure(text="Refresh Data", state="normal")
+        
+    def _on_fetch_error(self, error):
+        """Handle a failed fetch (runs on the main thread)"""
+        logger.error(f"Error fetching team data: {str(error)}")
+        self.refresh_button.configure(text="Refresh Failed", state="normal")
+        self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data"))
+        
     def _update_fixtures_table(self, fixtures):
         """Update the fixtures table"""
         # Clear table
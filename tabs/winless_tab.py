@@ -4,7 +4,7 @@ from tkinter import ttk
 import logging
 from typing import Dict, List, Any, Optional, Callable
 
-from tabs.base_tab import BaseTab
+from tabs.base_tab import BaseTab, sync_treeview
 from modules.api_client import FootballAPI
 from modules.db_manager import DatabaseManager
 from modules.settings_manager import SettingsManager
@@ -34,6 +34,9 @@ class WinlessTab(BaseTab):
         # Create UI elements
         self._create_ui()
         
+        # Reload when auto refresh has new data
+        self._subscribe_refresh(("fixtures",))
+        
     def _create_ui(self):
         """Create the winless tab UI elements"""
         # Title
@@ -145,76 +148,78 @@ class WinlessTab(BaseTab):
         # Show loading animation
         self._show_loading_animation(self.refresh_button, "Refresh Data")
         
-        # Get data in a separate thread
-        self.parent.after(100, self._fetch_data)
-            
-    def _fetch_data(self):
-        """Fetch data from API"""
-        try:
-            # Get league ID
-            league_id = self.selected_league.get()
-            
-            # Get streak type
-            streak_type = self.streak_var.get()
-            
-            # Fetch standings
-            standings = self.api.fetch_standings(league_id)
+        # Read the selection on the main thread, fetch in a worker thread
+        self._run_in_background(
+            self._fetch_data,
+            self.selected_league.get(),
+            self.streak_var.get(),
+            on_success=self._on_data_loaded,
+            on_error=self._on_fetch_error
+        )
             
-            if not standings or not standings.get('response'):
-                logger.warning(f"No standings for league {league_id}")
-                self.refresh_button.configure(text="Refresh Data", state="normal")
-                return
-                
-            standings_data = standings['response'][0]['league']['standings'][0]
+    def _fetch_data(self, league_id, streak_type):
+        """Fetch data from API (runs in a worker thread)"""
+        # Fetch standings
+        standings = self.api.fetch_standings(league_id)
+        
+        if not standings or not standings.get('response'):
+            logger.warning(f"No standings for league {league_id}")
+            return None
             
-            # Fetch fixtures
-            fixtures = self.api.fetch_fixtures(league_id)
+        standings_data = standings['response'][0]['league']['standings'][0]
+        
+        # Fetch fixtures
+        fixtures = self.api.fetch_fixtures(league_id)
+        
+        # Process data (placeholder)
+        winless_data = []
+        
+        # In a real implementation, we would analyze the fixtures to find winless streaks
+        # For now, just use placeholder data
+        for i, team in enumerate(standings_data[:10]):
+            team_name = team['team']['name']
+            team_id = team['team']['id']
             
-            # Process data (placeholder)
-            self.winless_data = []
+            # Add placeholder data
+            winless_data.append({
+                'team': team_name,
+                'team_id': team_id,
+                'league': get_league_display_name(league_id),
+                'streak': i + 1,
+                'last_win': '2024-01-01',
+                'days_since_win': (i + 1) * 7,
+                'next_opponent': 'Opponent ' + str(i + 1),
+                'match_date': '2024-03-15',
+                'venue': 'Home' if i % 2 == 0 else 'Away'
+            })
             
-            # In a real implementation, we would analyze the fixtures to find winless streaks
-            # For now, just use placeholder data
-            for i, team in enumerate(standings_data[:10]):
-                team_name = team['team']['name']
-                team_id = team['team']['id']
-                
-                # Add placeholder data
-                self.winless_data.append({
-                    'team': team_name,
-                    'team_id': team_id,
-                    'league': get_league_display_name(league_id),
-                    'streak': i + 1,
-                    'last_win': '2024-01-01',
-                    'days_since_win': (i + 1) * 7,
-                    'next_opponent': 'Opponent ' + str(i + 1),
-                    'match_date': '2024-03-15',
-                    'venue': 'Home' if i % 2 == 0 else 'Away'
-                })
+        return winless_data
+        
+    def _on_data_loaded(self, winless_data):
+        """Show fetched data (runs on the main thread)"""
+        if winless_data is not None:
+            self.winless_data = winless_data
             
             # Update table
             self._update_table()
             
-            # Reset refresh button
-            self.refresh_button.configure(text="Refresh Data", state="normal")
-            
-        except Exception as e:
-            logger.error(f"Error fetching data: {str(e)}")
-            self.refresh_button.configure(text="Refresh Failed", state="normal")
-            self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data"))
-            
+        # Reset refresh button
+        self.refresh_button.configure(text="Refresh Data", state="normal")
+        
+    def _on_fetch_error(self, error):
+        """Handle a failed fetch (runs on the main thread)"""
+        logger.error(f"Error fetching data: {str(error)}")
+        self.refresh_button.configure(text="Refresh Failed", state="normal")
+        self.parent.after(2000, lambda: self.refresh_button.configure(text="Refresh Data"))
+        
     def _update_table(self):
         """Update the winless streaks table"""
-        # Clear table
-        for item in self.winless_table.get_children():
-            self.winless_table.delete(item)
-            
-        # Add data
-        for i, team in enumerate(self.winless_data):
-            # Add row
-            self.winless_table.insert(
-                "", "end",
-                values=(
+        rows = []
+        for team in self.winless_data:
+            # Add row, keyed by team so unchanged rows are left alone
+            rows.append((
+                team.get('team_id', team.get('team', '')),
+                (
                     team.get('team', ''),
                     team.get('league', ''),
                     team.get('streak', ''),
@@ -224,9 +229,11 @@ class WinlessTab(BaseTab):
                     team.get('match_date', ''),
                     team.get('venue', '')
                 ),
-                tags=('streak',)
-            )
+                ('streak',)
+            ))
             
+        sync_treeview(self.winless_table, rows)
+        
         # Configure tags
         self.winless_table.tag_configure('streak', foreground='red')
     
@@ -0,0 +1,28 @@
+from modules.api_metrics import ApiMetrics
+from shared_cache import SharedCache
+
+def test_metrics_of_all_processes_are_exported(tmp_path):
+    store = SharedCache(str(tmp_path / "shared_cache.db"))
+    budget = {"daily_remaining": 90, "daily_limit": 100, "updated_at": 1.0}
+    worker = ApiMetrics(log_interval=0, store=store, get_budget=lambda: budget)
+    warmer = ApiMetrics(log_interval=0, store=store, role="cache_warmer", get_budget=lambda: budget)
+    
+    worker.record_request("/fixtures", 200, 0.2, 1000)
+    warmer.record_request("/standings", 200, 0.3, 2000)
+    warmer.record_request("/standings", 429, 0.1)
+    warmer.publish(force=True)
+    
+    text = worker.to_prometheus()
+    
+    assert 'endpoint="/fixtures"' in text
+    assert 'process="worker"' in text
+    assert 'process="cache_warmer"' in text
+    assert text.count("football_api_requests_total{") == 3
+    assert 'football_api_budget_remaining{period="daily"} 90' in text
+
+def test_metrics_without_store(tmp_path):
+    metrics = ApiMetrics(log_interval=0)
+    metrics.record_request("/fixtures", 200, 0.2, 1000)
+    
+    assert metrics.collect()[0]["stats"]["requests"] == 1
+    assert 'process="worker"' in metrics.to_prometheus()
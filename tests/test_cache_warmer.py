@@ -0,0 +1,66 @@
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+# The Dash modules read their configuration through python-dotenv and requests
+pytest.importorskip("dotenv")
+pytest.importorskip("requests")
+
+from cache_warmer import CacheWarmer
+from shared_cache import SharedCache
+
+class FakeAPI:
+    """Client with the cache tiers of FootballAPI that records its fetches"""
+    
+    def __init__(self):
+        self.cache = {
+            'short': {'data': {}, 'duration': timedelta(minutes=15)},
+            'medium': {'data': {}, 'duration': timedelta(hours=6)},
+            'long': {'data': {}, 'duration': timedelta(hours=24)},
+        }
+        self.calls = []
+        self.rate_limits = SimpleNamespace(format_budget=lambda: None)
+        
+    def get_cache_age(self, key, cache_type='short'):
+        entry = self.cache[cache_type]['data'].get(key)
+        return None if entry is None else time.time() - entry[1].timestamp()
+        
+    def fetch_standings(self, league_id, refresh=False):
+        self.calls.append(("standings", league_id, refresh))
+        self.cache['medium']['data'][f"standings_{league_id}"] = ({}, datetime.now())
+        return {}
+        
+    def fetch_fixtures(self, league_id, refresh=False):
+        self.calls.append(("fixtures", league_id, refresh))
+        self.cache['long']['data'][f"fixtures_{league_id}_None_None"] = ([], datetime.now())
+        return []
+
+def test_refresh_only_fetches_expiring_entries():
+    api = FakeAPI()
+    warmer = CacheWarmer(api, [39, 140], refresh_minutes=60)
+    
+    assert warmer.warm_up() == 0
+    assert len(api.calls) == 4
+    
+    api.calls.clear()
+    assert warmer._fetch_league(39, refresh=True)
+    assert api.calls == []
+    
+    # Expires within the next hour, the fixtures are still fresh for a day
+    api.cache['medium']['data']['standings_39'] = ({}, datetime.now() - timedelta(hours=5, minutes=30))
+    warmer._fetch_league(39, refresh=True)
+    assert api.calls == [("standings", 39, True)]
+
+def test_only_the_lock_holder_warms(tmp_path):
+    store = SharedCache(str(tmp_path / "shared_cache.db"))
+    first = CacheWarmer(FakeAPI(), [39], lock_store=store)
+    second = CacheWarmer(FakeAPI(), [39], lock_store=store)
+    second._owner = "other worker"
+    
+    assert first._hold_lock()
+    assert not second._hold_lock()
+    
+    first.stop()
+    assert second._hold_lock()
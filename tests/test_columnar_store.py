@@ -0,0 +1,112 @@
+import os
+import sqlite3
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from modules import columnar_store
+from modules.db_manager import DatabaseManager
+
+# More rows than fit in one batch, all in one league and season
+PREDICTION_COUNT = 350
+SMALL_BATCH_SIZE = 100
+
+def create_predictions(count):
+    return [{
+        "team_id": i,
+        "team_name": f"Team {i % 7}",
+        "league_id": 39,
+        "league_name": "Premier League",
+        "fixture_id": 1000 + i,
+        "opponent_id": i + 1,
+        "opponent_name": f"Opponent {i % 5}",
+        "match_date": "2024-09-01",
+        "venue": "home",
+        "performance_diff": 1.0,
+        "prediction": "WIN",
+        "prediction_level": 1
+    } for i in range(count)]
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar_store, "BATCH_SIZE", SMALL_BATCH_SIZE)
+    db = DatabaseManager(str(tmp_path / "football_stats.db"))
+    db.save_predictions(create_predictions(PREDICTION_COUNT))
+    return db
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_export_partition_of_several_batches(db, tmp_path, file_format):
+    root_dir = str(tmp_path / "export")
+    
+    result = db.export_columnar("predictions", root_dir, file_format)
+    
+    assert "error" not in result
+    assert result["rows"] == PREDICTION_COUNT
+    assert len(result["files"]) == 1
+    
+    table = db.load_columnar("predictions", root_dir, league_id=39, season=2024)
+    assert table.num_rows == PREDICTION_COUNT
+    assert sorted(table.column("team_name").to_pylist()) == sorted(f"Team {i % 7}" for i in range(PREDICTION_COUNT))
+
+class FailingWriter:
+    """Writer that fails on its second batch, like a full disk"""
+    
+    def __init__(self, writer):
+        self.writer = writer
+        self.batches = 0
+        
+    def write_batch(self, batch):
+        self.batches += 1
+        if self.batches > 1:
+            raise OSError("disk full")
+        self.writer.write_batch(batch)
+        
+    def close(self):
+        self.writer.close()
+
+def test_failed_export_keeps_previous_export(db, tmp_path, monkeypatch):
+    root_dir = str(tmp_path / "export")
+    assert db.export_columnar("predictions", root_dir, "parquet")["rows"] == PREDICTION_COUNT
+    
+    open_writer = columnar_store._open_writer
+    monkeypatch.setattr(columnar_store, "_open_writer",
+                        lambda file_path, schema, file_format: FailingWriter(open_writer(file_path, schema, file_format)))
+                        
+    result = db.export_columnar("predictions", root_dir, "arrow")
+    
+    assert result["rows"] == 0
+    assert "disk full" in result["error"]
+    
+    partition_dir = columnar_store._partition_dir(root_dir, "predictions", 39, 2024)
+    assert os.listdir(partition_dir) == ["data.parquet"]
+    assert sorted(os.listdir(root_dir)) == ["predictions"]
+    assert db.load_columnar("predictions", root_dir).num_rows == PREDICTION_COUNT
+
+def test_export_in_both_formats_loads_rows_once(db, tmp_path):
+    root_dir = str(tmp_path / "export")
+    
+    db.export_columnar("predictions", root_dir, "parquet")
+    db.export_columnar("predictions", root_dir, "arrow")
+    
+    assert db.load_columnar("predictions", root_dir).num_rows == PREDICTION_COUNT
+    assert db.load_columnar("predictions", root_dir, file_format="arrow").num_rows == PREDICTION_COUNT
+    assert db.load_columnar("predictions", root_dir, file_format="parquet") is None
+
+def test_full_export_removes_deleted_partitions(db, tmp_path):
+    root_dir = str(tmp_path / "export")
+    predictions = create_predictions(10)
+    for prediction in predictions:
+        prediction.update(league_id=140, fixture_id=prediction["fixture_id"] + 5000)
+    db.save_predictions(predictions)
+    
+    db.export_columnar("predictions", root_dir, "parquet")
+    assert db.load_columnar("predictions", root_dir, league_id=140).num_rows == 10
+    
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("DELETE FROM predictions WHERE league_id = 140")
+        
+    db.export_columnar("predictions", root_dir, "parquet")
+    
+    assert db.load_columnar("predictions", root_dir, league_id=140) is None
+    assert db.load_columnar("predictions", root_dir).num_rows == PREDICTION_COUNT
@@ -0,0 +1,106 @@
+import pytest
+
+from modules.db_manager import DatabaseManager
+from modules.db_writer import DatabaseWriter
+
+# Long enough that a batch is only committed by flush() or close() during a test
+FLUSH_INTERVAL = 60
+FLUSH_TIMEOUT = 10
+
+def create_prediction(fixture_id, team_id=1):
+    return {
+        "team_id": team_id,
+        "team_name": f"Team {team_id}",
+        "league_id": 39,
+        "league_name": "Premier League",
+        "fixture_id": fixture_id,
+        "opponent_id": team_id + 1,
+        "opponent_name": f"Opponent {team_id}",
+        "match_date": "2024-09-01",
+        "venue": "home",
+        "performance_diff": 1.0,
+        "prediction": "WIN",
+        "prediction_level": 1
+    }
+
+def get_predictions(db):
+    return {prediction["fixture_id"]: prediction for prediction in db.get_predictions()}
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(str(tmp_path / "football_stats.db"))
+
+@pytest.fixture
+def writer(db):
+    writer = DatabaseWriter(db, flush_interval=FLUSH_INTERVAL)
+    yield writer
+    writer.close()
+
+def test_failed_write_rolls_back_only_its_savepoint(db, writer, monkeypatch):
+    db.save_prediction(create_prediction(1000))
+    prediction_id = get_predictions(db)[1000]["id"]
+    
+    update_prediction_result = db._update_prediction_result
+    
+    def update_then_fail(cursor, *args):
+        # Write first, so the rollback has something to undo
+        update_prediction_result(cursor, *args)
+        raise ValueError("invalid result")
+        
+    monkeypatch.setattr(db, "_update_prediction_result", update_then_fail)
+    
+    # All three writes go into the same batch and transaction
+    before = writer.submit("save_prediction", create_prediction(1001))
+    failed = writer.submit("update_prediction_result", prediction_id, "WIN", 1)
+    after = writer.submit("save_prediction", create_prediction(1002))
+    
+    assert writer.flush(FLUSH_TIMEOUT)
+    
+    assert before.result() == prediction_id + 1
+    assert after.result() == prediction_id + 2
+    with pytest.raises(ValueError):
+        failed.result()
+        
+    predictions = get_predictions(db)
+    assert set(predictions) == {1000, 1001, 1002}
+    assert predictions[1000]["result"] is None
+    assert predictions[1000]["correct"] is None
+
+def test_flush_waits_for_queued_writes(db, writer):
+    futures = [writer.submit("save_prediction", create_prediction(1000 + i, team_id=i))
+               for i in range(20)]
+               
+    # Nothing is committed before the batch is flushed
+    assert not any(future.done() for future in futures)
+    
+    assert writer.flush(FLUSH_TIMEOUT)
+    
+    assert all(future.done() for future in futures)
+    assert len(get_predictions(db)) == 20
+
+def test_close_commits_queued_writes(db):
+    writer = DatabaseWriter(db, flush_interval=FLUSH_INTERVAL)
+    future = writer.submit("save_prediction", create_prediction(1000))
+    
+    writer.close(FLUSH_TIMEOUT)
+    
+    assert future.result(0) == get_predictions(db)[1000]["id"]
+    assert set(get_predictions(db)) == {1000}
+    with pytest.raises(RuntimeError):
+        writer.submit("save_prediction", create_prediction(1001))
+
+def test_futures_return_results_and_exceptions(db, writer):
+    saved = writer.submit("save_predictions", [create_prediction(1000 + i, team_id=i) for i in range(3)])
+    duplicate = writer.submit("save_prediction", create_prediction(1000, team_id=0))
+    invalid = writer.submit("save_prediction", {"fixture_id": 1003})
+    
+    assert writer.flush(FLUSH_TIMEOUT)
+    
+    assert saved.result() == 3
+    assert duplicate.result() == 0
+    assert isinstance(invalid.exception(), KeyError)
+    assert len(get_predictions(db)) == 3
+
+def test_submit_rejects_unknown_operation(writer):
+    with pytest.raises(ValueError):
+        writer.submit("drop_predictions")
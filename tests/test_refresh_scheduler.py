@@ -0,0 +1,68 @@
+import threading
+import time
+
+from modules.config import ALL_LEAGUES
+from modules.refresh_scheduler import RefreshScheduler, REFRESH_TOPICS
+
+class FakeAPI:
+    """Client that returns one standings, fixtures and form entry per league"""
+    
+    def __init__(self):
+        self.expired = []
+        
+    def expire_league(self, league_id, kinds=("standings", "fixtures")):
+        self.expired.append(league_id)
+        
+    def fetch_standings(self, league_id):
+        return {"league": league_id}
+        
+    def fetch_fixtures(self, league_id):
+        return []
+        
+    def fetch_all_teams(self, league_names, matches_count=3):
+        return [{"league_id": league_id} for league_id in league_names]
+
+def run_cycle(scheduler):
+    """Run one refresh cycle in the scheduler thread"""
+    scheduler.enabled = True
+    scheduler.interval = 0.1
+    thread = threading.Thread(target=scheduler._run, daemon=True)
+    thread.start()
+    time.sleep(0.3)
+    scheduler.stop()
+    thread.join(1)
+
+def test_one_notification_per_league_and_cycle():
+    scheduler = RefreshScheduler(FakeAPI())
+    scheduler.leagues = [39, 140]
+    notifications = []
+    scheduler.subscribe(lambda league_id, data: notifications.append((league_id, data)), ("standings", "form"), 39)
+    
+    run_cycle(scheduler)
+    
+    assert notifications[0] == (39, {"standings": {"league": 39}, "form": [{"league_id": 39}]})
+    assert all(league_id == 39 for league_id, data in notifications)
+
+def test_all_leagues_subscriber_is_notified_once_per_cycle():
+    api = FakeAPI()
+    scheduler = RefreshScheduler(api)
+    notifications = []
+    scheduler.subscribe(lambda league_id, data: notifications.append((league_id, data)), ("fixtures",), ALL_LEAGUES)
+    
+    assert len(scheduler.get_leagues()) > 1
+    assert ALL_LEAGUES not in scheduler.get_leagues()
+    
+    jobs = scheduler.plan_cycle()
+    assert len(jobs) == len(scheduler.get_leagues()) * len(REFRESH_TOPICS)
+    
+    refreshed = {}
+    for topic, league_id in jobs:
+        scheduler._run_job(topic, league_id, refreshed.setdefault(league_id, {}))
+    scheduler._publish_all_leagues(refreshed)
+    
+    assert len(notifications) == 1
+    league_id, data = notifications[0]
+    assert league_id == ALL_LEAGUES
+    assert set(data) == set(scheduler.get_leagues())
+    assert all(set(topics) == {"fixtures"} for topics in data.values())
+    assert ALL_LEAGUES in api.expired
@@ -0,0 +1,21 @@
+from shared_cache import SharedCache
+
+def test_lock_is_held_by_one_owner(tmp_path):
+    cache = SharedCache(str(tmp_path / "shared_cache.db"))
+    
+    assert cache.acquire_lock("job", "1", 60)
+    assert cache.acquire_lock("job", "1", 60)
+    assert not cache.acquire_lock("job", "2", 60)
+    
+    cache.release_lock("job", "2")
+    assert not cache.acquire_lock("job", "2", 60)
+    
+    cache.release_lock("job", "1")
+    assert cache.acquire_lock("job", "2", 60)
+
+def test_expired_lock_is_taken_over(tmp_path):
+    cache = SharedCache(str(tmp_path / "shared_cache.db"))
+    
+    assert cache.acquire_lock("job", "1", -1)
+    assert cache.acquire_lock("job", "2", 60)
+    assert not cache.acquire_lock("job", "1", 60)